@@ -10,6 +10,9 @@ class ApiConfig(AppConfig):
     def ready(self):
         from django.conf import settings
 
+        # register signal handlers (cache invalidation, ...)
+        from . import signals  # noqa: F401
+
         if settings.DEBUG:
             self.list_api_urls()
 
@@ -1,9 +1,10 @@
 from .exceptions import InvalidCredentialsError, AccountInactiveError, UserExistsError
-from .permissions import IsAdminOrSelf, IsActiveUser
+from .permissions import IsAdminOrSelf, IsActiveUser, IsSessionAuthenticated
 
 __all__ = [
     "InvalidCredentialsError",
     "AccountInactiveError",
     "IsAdminOrSelf",
     "IsActiveUser",
+    "IsSessionAuthenticated",
 ]
@@ -0,0 +1,79 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import authentication, exceptions
+
+from .backends import CachedModelBackend
+
+
+class ApiKeyAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticate integrations with an ApiCredential key
+
+    Clients send "Authorization: Api-Key pk_<prefix>.<secret>". The key is
+    found by its indexed prefix and checked with a constant-time HMAC
+    comparison, so no password hashing happens per request.
+    """
+
+    keyword = "Api-Key"
+
+    def authenticate(self, request):
+        from api.models import ApiCredential
+
+        auth = authentication.get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid API key header")
+
+        try:
+            raw_key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Invalid API key header")
+
+        credential = ApiCredential.verify(raw_key)
+        if credential is None:
+            raise exceptions.AuthenticationFailed("Invalid or revoked API key")
+        if not credential.user.is_active:
+            raise exceptions.AuthenticationFailed("User inactive or deleted")
+
+        credential.touch()
+        return credential.user, credential
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class CachedBasicAuthentication(authentication.BasicAuthentication):
+    """
+    BasicAuthentication that remembers verified credentials briefly
+
+    Basic auth runs a full password hash on every request. After a
+    successful check the (username, password) pair is remembered, under a
+    keyed digest, for BASIC_AUTH_CACHE_TIMEOUT seconds. A hit is only
+    accepted while the user's stored password hash is unchanged, so a
+    password change takes effect immediately.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = self._cache_key(userid, password)
+        cached = cache.get(key)
+        if cached is not None:
+            user_id, password_hash = cached
+            user = CachedModelBackend().get_user(user_id)
+            if user is not None and user.password == password_hash:
+                return user, None
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        cache.set(key, (user.pk, user.password), settings.BASIC_AUTH_CACHE_TIMEOUT)
+        return user, auth
+
+    def _cache_key(self, userid, password):
+        digest = hmac.new(
+            settings.SECRET_KEY.encode(),
+            f"{userid}:{password}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        return f"auth:basic:{digest}"
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    """Drop a user's cached principal so the next request reloads it"""
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend that serves session users from the cache
+
+    Session authentication calls get_user on every request. The loaded user
+    is cached together with its active UnitApprover roles (and their units),
+    so role and approver checks on request.user cost no queries. Entries are
+    dropped by signals when the user, one of its approver roles or one of
+    those units changes, and expire after USER_CACHE_TIMEOUT regardless.
+
+    The signals can only clear the cache they run against, so caching is
+    off unless USER_CACHE_ENABLED (a cache shared by all workers); users
+    are then loaded like ModelBackend does.
+    """
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_ENABLED:
+            return super().get_user(user_id)
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+
+            # preload so the cached copy carries its approver roles
+            user.get_approver_roles()
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,116 @@
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# True once the current request (or command) must read from the primary
+_use_primary = contextvars.ContextVar("use_primary", default=False)
+# True once the current request has written to the primary
+_wrote = contextvars.ContextVar("wrote", default=False)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def pin_to_primary():
+    """Send every remaining read in the current context to the primary"""
+    _use_primary.set(True)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads to the configured replicas and everything else to the primary
+
+    Reads stay on the primary when no replicas are configured, inside a
+    transaction, or once the current context has been pinned. A context is
+    pinned by ReplicaPinningMiddleware for unsafe requests and for clients
+    that wrote recently, and by any write routed through this class, so a
+    request never reads back stale copies of rows it just changed.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, "REPLICA_DATABASES", [])
+        if (
+            not replicas
+            or _use_primary.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        # sessions are re-saved on every request just to extend their expiry,
+        # the writes that create them (login) come from unsafe requests
+        if model._meta.app_label != "sessions":
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas are copies of the primary so any two rows may relate
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas receive schema changes through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keep a client's reads on the primary while its writes replicate
+
+    Unsafe requests start pinned to the primary. Any unsafe request, or one
+    that wrote, sets a short-lived cookie so the same client's next requests
+    also read from the primary for REPLICA_PIN_SECONDS, which covers the
+    usual "save then reload the list" flow. Must be listed first in
+    MIDDLEWARE so session and user lookups follow the pin too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        tokens = self._start(request)
+        try:
+            return self._finish(self.get_response(request))
+        finally:
+            self._reset(tokens)
+
+    async def __acall__(self, request):
+        tokens = self._start(request)
+        try:
+            return self._finish(await self.get_response(request))
+        finally:
+            self._reset(tokens)
+
+    def _start(self, request):
+        unsafe = request.method not in SAFE_METHODS
+        pinned = unsafe or settings.REPLICA_PIN_COOKIE in request.COOKIES
+        return _use_primary.set(pinned), _wrote.set(unsafe)
+
+    def _reset(self, tokens):
+        use_primary_token, wrote_token = tokens
+        _use_primary.reset(use_primary_token)
+        _wrote.reset(wrote_token)
+
+    def _finish(self, response):
+        # only writes refresh the cookie, so a pinned client drifts back to
+        # the replicas once it stops writing
+        if settings.REPLICA_DATABASES and _wrote.get():
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
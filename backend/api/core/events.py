@@ -0,0 +1,182 @@
+"""
+In-process event bus feeding the server-sent events stream
+
+Workflow signals publish small events ("approval_assigned",
+"submission_status") addressed to user ids. Connected clients subscribe
+with an asyncio queue per stream and only re-fetch when something for them
+happened, instead of polling the pending approvals endpoint.
+
+With EVENT_BUS_BACKEND = "local" events are handed to subscribers of the
+same process once the publishing transaction commits, which is enough for a
+single ASGI worker. With "postgres" they are sent with pg_notify, which
+Postgres delivers on commit to every process LISTENing on EVENT_BUS_CHANNEL,
+so streams on any worker see events published by any other.
+"""
+
+import asyncio
+import itertools
+import json
+import select
+import threading
+import time
+
+import psycopg2
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from utils.prettyPrint import pretty_print
+
+
+class Subscription:
+    """
+    One client stream's view of the bus
+
+    Events are put on an asyncio queue from whatever thread publishes them.
+    When a slow client lets the queue fill up, further events are dropped
+    and the stream is told to resync instead.
+    """
+
+    def __init__(self, user_id, loop, max_queued):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queued)
+        self.overflowed = False
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, event):
+        """Queue an event, safe to call from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # the stream's loop has shut down, it unsubscribes on its way out
+            pass
+
+    async def get(self, timeout):
+        """
+        Next event, or None when nothing arrived within timeout seconds
+
+        Returns {"event": "resync"} once after events were dropped.
+        """
+        if self.overflowed and self.queue.empty():
+            self.overflowed = False
+            return {"event": "resync", "data": {}}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Subscriber registry of this process and the optional pg listener"""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._listener = None
+
+    def subscribe(self, user_id):
+        """
+        Start receiving events addressed to user_id
+
+        Must be called from the event loop the stream runs on.
+        """
+        subscription = Subscription(
+            user_id, asyncio.get_running_loop(), settings.EVENT_STREAM_MAX_QUEUED
+        )
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        if settings.EVENT_BUS_BACKEND == "postgres":
+            self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscribers.pop(subscription.user_id, None)
+
+    def publish(self, event, user_ids, data):
+        """
+        Send an event to the streams of the given users
+
+        Delivered only if the current transaction commits, right away
+        outside of one.
+
+        Args:
+            event: Event name, becomes the SSE "event:" field
+            user_ids: Ids of the users to notify
+            data: JSON serializable payload, keep it small (pg_notify
+                payloads are limited to 8000 bytes)
+        """
+        user_ids = sorted({user_id for user_id in user_ids if user_id})
+        if not user_ids:
+            return
+        payload = {"event": event, "users": user_ids, "data": data}
+
+        if settings.EVENT_BUS_BACKEND == "postgres":
+            # NOTIFY is transactional, Postgres holds it back until commit
+            with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    [settings.EVENT_BUS_CHANNEL, json.dumps(payload)],
+                )
+        else:
+            transaction.on_commit(lambda: self.deliver(payload))
+
+    def deliver(self, payload):
+        """Hand a published event to this process' subscribers"""
+        event = {
+            "id": next(self._ids),
+            "event": payload["event"],
+            "data": payload["data"],
+        }
+        with self._lock:
+            subscriptions = [
+                subscription
+                for user_id in payload["users"]
+                for subscription in self._subscribers.get(user_id, ())
+            ]
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="event-bus-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        """LISTEN on the channel on a dedicated connection, reconnecting on errors"""
+        params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        while True:
+            connection = None
+            try:
+                connection = psycopg2.connect(**params)
+                connection.set_isolation_level(
+                    psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+                )
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{settings.EVENT_BUS_CHANNEL}"')
+                while True:
+                    if select.select([connection], [], [], 30) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        self.deliver(json.loads(notify.payload))
+            except Exception as e:
+                pretty_print(f"Event bus listener failed, reconnecting: {e}", "ERROR")
+                if connection is not None:
+                    connection.close()
+                time.sleep(5)
+
+
+bus = EventBus()
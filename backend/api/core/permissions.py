@@ -1,4 +1,4 @@
-from rest_framework import permissions
+from rest_framework import authentication, permissions
 
 
 class IsAdminOrSelf(permissions.BasePermission):
@@ -27,3 +27,19 @@ class IsActiveUser(permissions.BasePermission):
 
     def has_permission(self, request, view):
         return request.user and request.user.is_active
+
+
+class IsSessionAuthenticated(permissions.BasePermission):
+    """
+    Only allow requests authenticated by a login session
+
+    Used where a credential must not be able to act on other credentials,
+    e.g. an API key or Basic auth password issuing or revoking API keys.
+    """
+
+    message = "This action requires a login session"
+
+    def has_permission(self, request, view):
+        return isinstance(
+            request.successful_authenticator, authentication.SessionAuthentication
+        )
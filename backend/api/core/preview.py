@@ -0,0 +1,62 @@
+"""
+Coalescing of rapid preview requests
+
+Every preview request takes a ticket from a per-user counter in the
+cache, and a compile that is already running is stopped as soon as a
+newer ticket makes it stale. The async view also waits
+PREVIEW_DEBOUNCE_SECONDS before compiling and gives up if a newer ticket
+was taken meanwhile, so only the latest of a burst of previews reaches
+pdflatex. The sync view does not wait, sleeping would hold a worker
+thread idle; it relies on the cancellation and on unchanged previews
+being served from the draft. With a shared cache (Redis) this holds
+across workers, with the local memory cache only per process.
+"""
+
+import asyncio
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class PreviewSuperseded(Exception):
+    """A newer preview request from the same user took over"""
+
+
+class PreviewCoalescer:
+    """Per-user "latest preview" tickets kept in the default cache"""
+
+    KEY = "preview:latest:{user_id}"
+    # tickets outlive any compile by far
+    TIMEOUT = 10 * 60
+
+    def __init__(self, user_id):
+        self.key = self.KEY.format(user_id=user_id)
+
+    def claim(self):
+        """Take a new ticket, making every earlier one stale"""
+        cache.add(self.key, 0, self.TIMEOUT)
+        try:
+            return cache.incr(self.key)
+        except ValueError:
+            # expired between add and incr
+            cache.set(self.key, 1, self.TIMEOUT)
+            return 1
+
+    def is_stale(self, ticket):
+        """True once a newer ticket was claimed"""
+        return cache.get(self.key) != ticket
+
+    async def ais_stale(self, ticket):
+        return await cache.aget(self.key) != ticket
+
+    async def adebounce(self, ticket):
+        """
+        Wait out the debounce period without blocking the event loop
+
+        Raises:
+            PreviewSuperseded: A newer request arrived meanwhile
+        """
+        if settings.PREVIEW_DEBOUNCE_SECONDS > 0:
+            await asyncio.sleep(settings.PREVIEW_DEBOUNCE_SECONDS)
+        if await self.ais_stale(ticket):
+            raise PreviewSuperseded()
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+# session key holding the unix time the session expiry was last pushed back
+RENEWED_AT_KEY = "_renewed_at"
+
+
+class SessionRenewalMiddleware(MiddlewareMixin):
+    """
+    Extend session expiry on activity without saving on every request
+
+    Replaces SESSION_SAVE_EVERY_REQUEST, which issued an UPDATE on the
+    session row for every API call. The session is only re-saved (with a
+    fresh expiry and cookie) once SESSION_RENEWAL_FRACTION of
+    SESSION_COOKIE_AGE has passed since its last renewal, so an active
+    session still never expires while polling endpoints stay read-only.
+    Must come after SessionMiddleware in MIDDLEWARE.
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, "session", None)
+        if session is None or session.is_empty():
+            return response
+
+        now = int(time.time())
+        renew_every = settings.SESSION_COOKIE_AGE * settings.SESSION_RENEWAL_FRACTION
+        # sessions being saved anyway (e.g. at login) get stamped for free
+        if session.modified or now - session.get(RENEWED_AT_KEY, 0) >= renew_every:
+            # marks the session modified so SessionMiddleware saves it
+            session[RENEWED_AT_KEY] = now
+
+        return response
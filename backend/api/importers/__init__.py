@@ -0,0 +1,7 @@
+from .organization import (
+    OrganizationImporter,
+    OrganizationImportError,
+    OrganizationPlan,
+    load_org_chart,
+)
+from .users import UserImporter, detect_format, iter_rows
@@ -0,0 +1,466 @@
+import csv
+import json
+import os
+
+from django.db import transaction
+from django.utils import timezone
+from utils import pretty_print
+
+from api.core.backends import invalidate_cached_user
+from api.models import OrganizationalUnit, UnitApprover, User
+
+UNIT_FIELDS = ("name", "description", "parent_id", "level", "is_active")
+
+
+class OrganizationImportError(Exception):
+    """Raised when an org chart file cannot be read or is inconsistent"""
+
+
+def _as_bool(value, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def load_org_chart(path, file_format=None):
+    """
+    Read an org chart file into {"units": [...], "approvers": [...]}
+
+    YAML and JSON files hold those two lists directly:
+
+        units:
+          - {code: UH, name: University of Houston}
+          - {code: NSM, name: College of NSM, parent: UH}
+        approvers:
+          - {unit: NSM, username: nsm_dean, role: Associate Dean}
+
+    CSV files hold both in one table told apart by a "type" column
+    ("unit" rows use code, name, parent, description, is_active;
+    "approver" rows use unit, username, role, is_organization_wide).
+
+    Args:
+        path: Path of the file
+        file_format: "yaml", "json" or "csv", taken from the extension if
+            not given
+
+    Returns:
+        Dictionary with "units" and "approvers" lists of dicts
+    """
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        file_format = "yaml" if extension == "yml" else extension
+
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            if file_format == "csv":
+                chart = {"units": [], "approvers": []}
+                for row in csv.DictReader(f):
+                    kind = (row.get("type") or "").strip().lower()
+                    if kind not in ("unit", "approver"):
+                        raise OrganizationImportError(
+                            f"Line with unknown type {kind!r}, expected unit or approver"
+                        )
+                    chart[f"{kind}s"].append(row)
+            elif file_format == "json":
+                chart = json.load(f)
+            elif file_format == "yaml":
+                try:
+                    import yaml
+                except ImportError:
+                    raise OrganizationImportError(
+                        "PyYAML is required to read YAML files (pip install pyyaml)"
+                    )
+                try:
+                    chart = yaml.safe_load(f)
+                except yaml.YAMLError as e:
+                    raise OrganizationImportError(f"Could not parse {path}: {e}")
+            else:
+                raise OrganizationImportError(
+                    f"Unsupported format {file_format!r}, use yaml, json or csv"
+                )
+    except OSError as e:
+        raise OrganizationImportError(f"Could not read {path}: {e}")
+    except ValueError as e:
+        raise OrganizationImportError(f"Could not parse {path}: {e}")
+
+    if not isinstance(chart, dict) or not isinstance(chart.get("units"), list):
+        raise OrganizationImportError("The file must contain a list of units")
+    chart.setdefault("approvers", [])
+    if not isinstance(chart["approvers"], list):
+        raise OrganizationImportError("approvers must be a list")
+    return chart
+
+
+class OrganizationPlan:
+    """
+    Changes needed to bring the database in line with an org chart
+
+    Built in memory by OrganizationImporter.plan from two queries (units and
+    approver assignments) plus one for the referenced users, so a dry run
+    never writes anything.
+    """
+
+    def __init__(self):
+        # OrganizationalUnit instances (parent set later, see apply)
+        self.units_to_create = []
+        # (OrganizationalUnit, {field: (old, new)})
+        self.units_to_update = []
+        self.units_to_deactivate = []
+        self.approvers_to_create = []
+        # (UnitApprover, {field: (old, new)})
+        self.approvers_to_update = []
+        self.approvers_to_deactivate = []
+        # unit code -> parent code for units being created or re-parented
+        self.parent_codes = {}
+
+    def has_changes(self):
+        return any(
+            [
+                self.units_to_create,
+                self.units_to_update,
+                self.units_to_deactivate,
+                self.approvers_to_create,
+                self.approvers_to_update,
+                self.approvers_to_deactivate,
+            ]
+        )
+
+    def summary(self):
+        return {
+            "units_created": len(self.units_to_create),
+            "units_updated": len(self.units_to_update),
+            "units_deactivated": len(self.units_to_deactivate),
+            "approvers_created": len(self.approvers_to_create),
+            "approvers_updated": len(self.approvers_to_update),
+            "approvers_deactivated": len(self.approvers_to_deactivate),
+        }
+
+    def report(self):
+        """Human readable list of the planned changes"""
+
+        def describe(changes):
+            return ", ".join(
+                f"{field}: {old!r} -> {new!r}" for field, (old, new) in changes.items()
+            )
+
+        lines = []
+        for unit in self.units_to_create:
+            parent = self.parent_codes.get(unit.code)
+            lines.append(
+                f"+ unit {unit.code} ({unit.name})"
+                + (f" under {parent}" if parent else "")
+            )
+        for unit, changes in self.units_to_update:
+            lines.append(f"~ unit {unit.code}: {describe(changes)}")
+        for unit in self.units_to_deactivate:
+            lines.append(f"- unit {unit.code} ({unit.name}) deactivated")
+        for approver in self.approvers_to_create:
+            lines.append(
+                f"+ approver {approver.user.username} as {approver.role} "
+                f"in {approver.unit.code}"
+            )
+        for approver, changes in self.approvers_to_update:
+            lines.append(
+                f"~ approver {approver.user.username} as {approver.role} "
+                f"in {approver.unit.code}: {describe(changes)}"
+            )
+        for approver in self.approvers_to_deactivate:
+            lines.append(
+                f"- approver {approver.user.username} as {approver.role} "
+                f"in {approver.unit.code} deactivated"
+            )
+        return lines
+
+
+class OrganizationImporter:
+    """
+    Declarative import of the organizational hierarchy
+
+    The file describes the whole chart: every unit (by code) with its
+    parent, and every approver assignment (unit, username, role). Units
+    and active assignments found in the database but not in the file are
+    deactivated, never deleted, so submissions and history keep their
+    references. Levels are derived from the parent chain.
+
+    Approvers refer to existing users, create them first (e.g. with the
+    admin user import).
+    """
+
+    def __init__(self, chart, deactivate_missing=True):
+        self.chart = chart
+        self.deactivate_missing = deactivate_missing
+
+    def plan(self):
+        """
+        Diff the chart against the database
+
+        Returns:
+            OrganizationPlan
+
+        Raises:
+            OrganizationImportError: The chart has duplicate codes, unknown
+                parents or users, or a parent cycle
+        """
+        plan = OrganizationPlan()
+        wanted_units = self._read_units()
+        levels = self._levels(wanted_units)
+
+        existing_units = {unit.code: unit for unit in OrganizationalUnit.objects.all()}
+        codes_by_pk = {unit.pk: code for code, unit in existing_units.items()}
+        units_by_code = {}
+
+        # level order so report and creation see parents before children
+        for code in sorted(wanted_units, key=lambda code: (levels[code], code)):
+            wanted = wanted_units[code]
+            unit = existing_units.get(code)
+
+            if unit is None:
+                unit = OrganizationalUnit(
+                    code=code,
+                    name=wanted["name"],
+                    description=wanted["description"],
+                    level=levels[code],
+                    is_active=wanted["is_active"],
+                )
+                plan.units_to_create.append(unit)
+                if wanted["parent"]:
+                    plan.parent_codes[code] = wanted["parent"]
+            else:
+                current_parent = codes_by_pk.get(unit.parent_id)
+                changes = {}
+                for field in ("name", "description", "is_active"):
+                    if getattr(unit, field) != wanted[field]:
+                        changes[field] = (getattr(unit, field), wanted[field])
+                if unit.level != levels[code]:
+                    changes["level"] = (unit.level, levels[code])
+                if current_parent != wanted["parent"]:
+                    changes["parent"] = (current_parent, wanted["parent"])
+                    plan.parent_codes[code] = wanted["parent"]
+                if changes:
+                    plan.units_to_update.append((unit, changes))
+
+            units_by_code[code] = unit
+
+        if self.deactivate_missing:
+            plan.units_to_deactivate = [
+                unit
+                for code, unit in existing_units.items()
+                if code not in wanted_units and unit.is_active
+            ]
+
+        self._plan_approvers(plan, units_by_code)
+        return plan
+
+    @transaction.atomic
+    def apply(self, plan):
+        """
+        Write a plan in one transaction
+
+        New units are inserted one hierarchy level per bulk_create, so every
+        parent has a primary key before its children go in. Updates and
+        deactivations are one bulk_update per model. bulk operations skip
+        model signals and auto_now, so updated_at is set here and the org
+        tree and affected session users are invalidated once the transaction
+        commits.
+        """
+        now = timezone.now()
+        units_by_code = {
+            unit.code: unit
+            for unit in OrganizationalUnit.objects.filter(
+                code__in=set(plan.parent_codes.values())
+            )
+        }
+        units_by_code.update({unit.code: unit for unit in plan.units_to_create})
+
+        def resolve_parent(unit):
+            parent_code = plan.parent_codes.get(unit.code)
+            unit.parent = units_by_code[parent_code] if parent_code else None
+
+        levels = sorted({unit.level for unit in plan.units_to_create})
+        for level in levels:
+            batch = [unit for unit in plan.units_to_create if unit.level == level]
+            for unit in batch:
+                resolve_parent(unit)
+            OrganizationalUnit.objects.bulk_create(batch)
+
+        updated_units = []
+        for unit, changes in plan.units_to_update:
+            for field, (_, new) in changes.items():
+                if field == "parent":
+                    resolve_parent(unit)
+                else:
+                    setattr(unit, field, new)
+            updated_units.append(unit)
+        for unit in plan.units_to_deactivate:
+            unit.is_active = False
+            updated_units.append(unit)
+        for unit in updated_units:
+            unit.updated_at = now
+        if updated_units:
+            OrganizationalUnit.objects.bulk_update(
+                updated_units, UNIT_FIELDS + ("updated_at",)
+            )
+
+        UnitApprover.objects.bulk_create(plan.approvers_to_create)
+
+        updated_approvers = []
+        for approver, changes in plan.approvers_to_update:
+            for field, (_, new) in changes.items():
+                setattr(approver, field, new)
+            updated_approvers.append(approver)
+        for approver in plan.approvers_to_deactivate:
+            approver.is_active = False
+            updated_approvers.append(approver)
+        for approver in updated_approvers:
+            approver.updated_at = now
+        if updated_approvers:
+            UnitApprover.objects.bulk_update(
+                updated_approvers, ["is_organization_wide", "is_active", "updated_at"]
+            )
+
+        # cached session users carry their approver roles and units
+        affected_users = {
+            approver.user_id
+            for approver in plan.approvers_to_create + updated_approvers
+        }
+        affected_users.update(
+            UnitApprover.objects.filter(unit__in=updated_units).values_list(
+                "user_id", flat=True
+            )
+        )
+
+        def invalidate():
+            OrganizationalUnit.invalidate_tree_cache()
+            for user_id in affected_users:
+                invalidate_cached_user(user_id)
+
+        transaction.on_commit(invalidate)
+        pretty_print(f"Organization import applied: {plan.summary()}", "INFO")
+
+    def _read_units(self):
+        """Validate the unit entries, keyed by code"""
+        units = {}
+        for index, entry in enumerate(self.chart["units"], start=1):
+            if not isinstance(entry, dict):
+                raise OrganizationImportError(f"Unit #{index} must be a mapping")
+            code = str(entry.get("code") or "").strip()
+            name = str(entry.get("name") or "").strip()
+            if not code or not name:
+                raise OrganizationImportError(f"Unit #{index} needs a code and a name")
+            if code in units:
+                raise OrganizationImportError(f"Unit {code} is listed twice")
+            if len(code) > 20 or len(name) > 100:
+                raise OrganizationImportError(
+                    f"Unit {code} has a code or name too long"
+                )
+
+            units[code] = {
+                "name": name,
+                "description": str(entry.get("description") or "").strip(),
+                "parent": str(entry.get("parent") or "").strip() or None,
+                "is_active": _as_bool(entry.get("is_active"), True),
+            }
+
+        for code, unit in units.items():
+            if unit["parent"] and unit["parent"] not in units:
+                raise OrganizationImportError(
+                    f"Unit {code} has unknown parent {unit['parent']}"
+                )
+        return units
+
+    def _levels(self, units):
+        """Depth of every unit in the chart, 0 for roots"""
+        levels = {}
+        for code in units:
+            path = []
+            current = code
+            while current is not None and current not in levels:
+                if current in path:
+                    cycle = " -> ".join(path[path.index(current) :] + [current])
+                    raise OrganizationImportError(f"Parent cycle: {cycle}")
+                path.append(current)
+                current = units[current]["parent"]
+            depth = -1 if current is None else levels[current]
+            for walked in reversed(path):
+                depth += 1
+                levels[walked] = depth
+        return levels
+
+    def _plan_approvers(self, plan, units_by_code):
+        entries = []
+        for index, entry in enumerate(self.chart["approvers"], start=1):
+            if not isinstance(entry, dict):
+                raise OrganizationImportError(f"Approver #{index} must be a mapping")
+            unit_code = str(entry.get("unit") or "").strip()
+            username = str(entry.get("username") or "").strip()
+            role = str(entry.get("role") or "").strip()
+            if not unit_code or not username or not role:
+                raise OrganizationImportError(
+                    f"Approver #{index} needs a unit, a username and a role"
+                )
+            if unit_code not in units_by_code:
+                raise OrganizationImportError(
+                    f"Approver #{index} refers to unit {unit_code} not in the file"
+                )
+            entries.append(
+                (
+                    unit_code,
+                    username,
+                    role,
+                    _as_bool(entry.get("is_organization_wide"), False),
+                )
+            )
+
+        usernames = {username for _, username, _, _ in entries}
+        users = {
+            user.username: user for user in User.objects.filter(username__in=usernames)
+        }
+        missing_users = sorted(usernames - users.keys())
+        if missing_users:
+            raise OrganizationImportError(f"Unknown users: {', '.join(missing_users)}")
+
+        existing = {
+            (approver.unit.code, approver.user.username, approver.role): approver
+            for approver in UnitApprover.objects.select_related("unit", "user")
+        }
+
+        wanted_keys = set()
+        for unit_code, username, role, is_organization_wide in entries:
+            key = (unit_code, username, role)
+            if key in wanted_keys:
+                raise OrganizationImportError(
+                    f"Approver {username} as {role} in {unit_code} is listed twice"
+                )
+            wanted_keys.add(key)
+
+            approver = existing.get(key)
+            if approver is None:
+                plan.approvers_to_create.append(
+                    UnitApprover(
+                        unit=units_by_code[unit_code],
+                        user=users[username],
+                        role=role,
+                        is_organization_wide=is_organization_wide,
+                    )
+                )
+                continue
+
+            changes = {}
+            if approver.is_organization_wide != is_organization_wide:
+                changes["is_organization_wide"] = (
+                    approver.is_organization_wide,
+                    is_organization_wide,
+                )
+            if not approver.is_active:
+                changes["is_active"] = (False, True)
+            if changes:
+                plan.approvers_to_update.append((approver, changes))
+
+        if self.deactivate_missing:
+            plan.approvers_to_deactivate = [
+                approver
+                for key, approver in existing.items()
+                if key not in wanted_keys and approver.is_active
+            ]
@@ -0,0 +1,285 @@
+import codecs
+import csv
+import json
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from utils import pretty_print
+
+from api.models import User
+from api.models.ModelConstants import RoleChoices
+
+REQUIRED_FIELDS = ("username", "email", "role", "first_name", "last_name")
+OPTIONAL_FIELDS = ("password", "phone_number")
+
+# file extensions and content types accepted for each import format
+FORMATS = {
+    "csv": ((".csv",), ("text/csv",)),
+    "ndjson": ((".ndjson", ".jsonl"), ("application/x-ndjson", "application/jsonl")),
+}
+
+
+def detect_format(uploaded_file, requested=None):
+    """
+    Work out the format of an uploaded import file
+
+    Args:
+        uploaded_file: Django UploadedFile
+        requested: Optional explicit format ("csv" or "ndjson")
+
+    Returns:
+        "csv", "ndjson" or None if the format is not recognised
+    """
+    if requested:
+        return requested.lower() if requested.lower() in FORMATS else None
+
+    name = (uploaded_file.name or "").lower()
+    content_type = (uploaded_file.content_type or "").lower()
+    for file_format, (extensions, content_types) in FORMATS.items():
+        if name.endswith(extensions) or content_type in content_types:
+            return file_format
+    return None
+
+
+def iter_rows(uploaded_file, file_format):
+    """
+    Stream rows out of an uploaded CSV or NDJSON file
+
+    The file is decoded line by line so large imports are never held in
+    memory as a whole.
+
+    Yields:
+        Tuples of (line number, row dict or None, error message or None)
+    """
+    lines = codecs.iterdecode(uploaded_file, "utf-8-sig")
+
+    if file_format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, None, "Row has more columns than the header"
+                continue
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def _unusable_password():
+    # same shape as make_password(None) without its per-character random.choice
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(30)
+
+
+class UserImporter:
+    """
+    Bulk user creation for admin imports
+
+    Rows are validated and checked for duplicates a batch at a time with one
+    query per batch for emails and usernames, personal IDs are reserved in
+    bulk and users are inserted with bulk_create. Passwords, the only
+    expensive part, are hashed by a small thread pool that is only started
+    if a row actually carries one: PBKDF2 runs in OpenSSL without the GIL,
+    so threads hash in parallel without forking processes off the web
+    worker handling the request. Rows without a password get an unusable
+    one, as expected for users signing in through Azure.
+
+    Role flags follow AdminDashboardViewSet.create: admins are superusers
+    and staff, staff are staff.
+    """
+
+    def __init__(self, batch_size=None, workers=None):
+        self.batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        self.workers = workers or settings.USER_IMPORT_HASH_WORKERS
+        self._executor = None
+
+    def run(self, rows):
+        """
+        Import users from parsed rows
+
+        Args:
+            rows: Iterable of (line number, row dict, parse error) as produced
+                by iter_rows
+
+        Returns:
+            Dictionary with "created", "failed" and "errors", a list of
+            {"row": line number, "error": message} for every rejected row
+        """
+        self.created = 0
+        self.errors = []
+        self._seen_emails = set()
+        self._seen_usernames = set()
+
+        try:
+            batch = []
+            for line_number, row, parse_error in rows:
+                if parse_error:
+                    self._reject(line_number, parse_error)
+                    continue
+                cleaned = self._clean(line_number, row)
+                if cleaned is not None:
+                    batch.append((line_number, cleaned))
+                if len(batch) >= self.batch_size:
+                    self._import_batch(batch)
+                    batch = []
+            if batch:
+                self._import_batch(batch)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+        return {
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+        }
+
+    def _reject(self, line_number, error):
+        self.errors.append({"row": line_number, "error": error})
+
+    def _clean(self, line_number, row):
+        """Validate a single row, returning normalised values or None"""
+        data = {}
+        for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+            value = row.get(field)
+            data[field] = "" if value is None else str(value).strip()
+
+        missing_fields = [field for field in REQUIRED_FIELDS if not data[field]]
+        if missing_fields:
+            self._reject(
+                line_number, f"Missing required fields: {', '.join(missing_fields)}"
+            )
+            return None
+
+        if data["role"] not in RoleChoices.values:
+            self._reject(line_number, f"Invalid role: {data['role']}")
+            return None
+
+        try:
+            validate_email(data["email"])
+        except ValidationError:
+            self._reject(line_number, f"Invalid email: {data['email']}")
+            return None
+
+        for field in REQUIRED_FIELDS + ("phone_number",):
+            max_length = User._meta.get_field(field).max_length
+            if len(data[field]) > max_length:
+                self._reject(
+                    line_number, f"{field} is longer than {max_length} characters"
+                )
+                return None
+
+        # duplicates inside the file itself
+        if data["email"] in self._seen_emails:
+            self._reject(line_number, "Email appears more than once in the file")
+            return None
+        if data["username"] in self._seen_usernames:
+            self._reject(line_number, "Username appears more than once in the file")
+            return None
+        self._seen_emails.add(data["email"])
+        self._seen_usernames.add(data["username"])
+
+        return data
+
+    def _import_batch(self, batch):
+        # duplicates against existing users, one query per field per batch
+        existing_emails = set(
+            User.objects.filter(
+                email__in=[data["email"] for _, data in batch]
+            ).values_list("email", flat=True)
+        )
+        existing_usernames = set(
+            User.objects.filter(
+                username__in=[data["username"] for _, data in batch]
+            ).values_list("username", flat=True)
+        )
+
+        accepted = []
+        for line_number, data in batch:
+            if data["email"] in existing_emails:
+                self._reject(line_number, "User with this email already exists")
+            elif data["username"] in existing_usernames:
+                self._reject(line_number, "User with this username already exists")
+            else:
+                accepted.append((line_number, data))
+        if not accepted:
+            return
+
+        passwords = self._hash_passwords([data["password"] for _, data in accepted])
+        personal_ids = User.allocate_personal_ids(len(accepted))
+
+        users = []
+        for (line_number, data), password, personal_id in zip(
+            accepted, passwords, personal_ids
+        ):
+            role = data["role"]
+            users.append(
+                (
+                    line_number,
+                    User(
+                        username=data["username"],
+                        email=data["email"],
+                        first_name=data["first_name"],
+                        last_name=data["last_name"],
+                        phone_number=data["phone_number"],
+                        role=role,
+                        password=password,
+                        personal_id=personal_id,
+                        is_active=True,
+                        is_superuser=role == RoleChoices.ADMIN,
+                        is_staff=role in (RoleChoices.ADMIN, RoleChoices.STAFF),
+                    ),
+                )
+            )
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([user for _, user in users])
+            self.created += len(users)
+        except IntegrityError:
+            # something was inserted concurrently, find the offending rows
+            pretty_print(
+                "Bulk user insert conflicted, retrying rows one by one", "WARNING"
+            )
+            for line_number, user in users:
+                try:
+                    with transaction.atomic():
+                        user.save()
+                    self.created += 1
+                except IntegrityError as e:
+                    self._reject(line_number, f"Could not create user: {e}")
+
+    def _hash_passwords(self, passwords):
+        """Hash the given raw passwords, unusable ones for blank entries"""
+        to_hash = [password for password in passwords if password]
+        if not to_hash:
+            return [_unusable_password() for _ in passwords]
+
+        if self.workers > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="user-import-hash"
+                )
+            hashed = iter(self._executor.map(make_password, to_hash))
+        else:
+            hashed = iter([make_password(password) for password in to_hash])
+
+        return [
+            next(hashed) if password else _unusable_password() for password in passwords
+        ]
@@ -0,0 +1,58 @@
+import base64
+import secrets
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.test import APIRequestFactory
+
+from api.core.authentication import ApiKeyAuthentication, CachedBasicAuthentication
+from api.models import ApiCredential, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request authentication cost of Basic auth, cached Basic "
+        "auth and API keys using a throwaway user"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=20, help="Requests per scheme (default 20)"
+        )
+
+    def handle(self, *args, **options):
+        password = secrets.token_urlsafe(16)
+        user = User.objects.create_user(
+            username=f"benchmark_{secrets.token_hex(4)}",
+            email=f"benchmark_{secrets.token_hex(4)}@example.invalid",
+            password=password,
+        )
+        try:
+            _, raw_key = ApiCredential.issue(user, "benchmark")
+            basic = base64.b64encode(f"{user.username}:{password}".encode()).decode()
+
+            factory = APIRequestFactory()
+            schemes = [
+                ("basic", BasicAuthentication(), f"Basic {basic}"),
+                ("basic (cached)", CachedBasicAuthentication(), f"Basic {basic}"),
+                ("api key", ApiKeyAuthentication(), f"Api-Key {raw_key}"),
+            ]
+
+            for label, authenticator, header in schemes:
+                timings = []
+                for _ in range(options["runs"]):
+                    request = factory.get("/", HTTP_AUTHORIZATION=header)
+                    start = time.perf_counter()
+                    authenticated_user, _ = authenticator.authenticate(request)
+                    timings.append(time.perf_counter() - start)
+                    assert authenticated_user.pk == user.pk
+
+                timings.sort()
+                self.stdout.write(
+                    f"{label:>15}: median {timings[len(timings) // 2] * 1000:8.3f} ms | "
+                    f"min {timings[0] * 1000:8.3f} ms | "
+                    f"max {timings[-1] * 1000:8.3f} ms"
+                )
+        finally:
+            user.delete()
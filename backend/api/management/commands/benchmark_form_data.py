@@ -0,0 +1,108 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import FormSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare filtering submissions on form_data fields in Python against "
+        "the indexed SQL filters used by the submission list"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Runs per query (default 5)"
+        )
+        parser.add_argument(
+            "--skip-python",
+            action="store_true",
+            help="Skip the (slow) load-everything-and-filter baseline",
+        )
+
+    def handle(self, *args, **options):
+        sample = (
+            FormSubmission.objects.exclude(form_data={})
+            .order_by("-id")
+            .values_list("form_data", flat=True)
+            .first()
+        )
+        if not sample or not sample.get("student_id"):
+            raise CommandError("No submission with a student_id in form_data")
+
+        student_id = sample["student_id"]
+        cases = [
+            ("student_id", {"student_id": student_id}),
+            (
+                "season + year",
+                {"season": sample.get("season", ""), "year": sample.get("year", "")},
+            ),
+            (
+                "program_plan in",
+                {"program_plan__in": [sample.get("program_plan", ""), "-"]},
+            ),
+            ("student_id prefix", {"student_id__startswith": student_id[:5]}),
+        ]
+
+        total = FormSubmission.objects.count()
+        self.stdout.write(f"{total} submissions")
+
+        for label, filters in cases:
+            queryset = FormSubmission.objects.filter(
+                FormSubmission.form_data_filter(filters)
+            ).values_list("id", flat=True)
+
+            sql_time, ids = self._time(options["runs"], lambda: list(queryset.all()))
+            plan = queryset.explain().splitlines()
+            self.stdout.write(
+                f"{label:>18}: {len(ids):6} rows | sql {sql_time * 1000:9.2f} ms"
+            )
+            self.stdout.write(f"{'':>20}{plan[0].strip()[:100]}")
+            if len(plan) > 1:
+                self.stdout.write(f"{'':>20}{plan[1].strip()[:100]}")
+
+            if not options["skip_python"]:
+                python_time, python_ids = self._time(
+                    1, lambda: self._python_filter(filters)
+                )
+                assert sorted(python_ids) == sorted(ids)
+                self.stdout.write(
+                    f"{'':>20}python {python_time * 1000:9.2f} ms "
+                    f"({python_time / sql_time:.0f}x slower)"
+                )
+
+    def _time(self, runs, function):
+        """Median wall time of running function, with its last result"""
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = function()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2], result
+
+    def _python_filter(self, filters):
+        """The previous approach, load every row and filter in Python"""
+
+        def matches(form_data):
+            for name, value in filters.items():
+                key, _, lookup = name.partition("__")
+                field = form_data.get(key)
+                if lookup == "in":
+                    if field not in value:
+                        return False
+                elif lookup == "startswith":
+                    if not str(field or "").startswith(value):
+                        return False
+                elif field != value:
+                    return False
+            return True
+
+        return [
+            pk
+            for pk, form_data in FormSubmission.objects.values_list(
+                "id", "form_data"
+            ).iterator(chunk_size=5000)
+            if isinstance(form_data, dict) and matches(form_data)
+        ]
@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from utils import FormPDFGenerator
+from utils.form_validator import example_form_data
+from utils.render_backends import RENDER_BACKENDS, get_render_backend
+
+from api.models import FormSubmission, FormTemplate, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every form template with each PDF render backend and compare "
+        "render time and PDF size side by side"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            action="append",
+            choices=sorted(RENDER_BACKENDS),
+            help="Backend to measure, repeatable (default all)",
+        )
+        parser.add_argument(
+            "--runs", type=int, default=10, help="Renders per backend (default 10)"
+        )
+
+    def handle(self, *args, **options):
+        templates = [
+            template
+            for template in FormTemplate.objects.order_by("id")
+            if isinstance(template.field_schema, dict)
+            and template.field_schema.get("fields")
+            and template.latex_template_path
+        ]
+        if not templates:
+            raise CommandError(
+                "No form template with a field schema, run create_form_templates"
+            )
+        backends = [
+            get_render_backend(name)
+            for name in options["backend"] or sorted(RENDER_BACKENDS)
+        ]
+        generator = FormPDFGenerator()
+
+        for template in templates:
+            submission = (
+                FormSubmission.objects.filter(form_template=template)
+                .select_related("submitter")
+                .order_by("-id")
+                .first()
+            )
+            if submission and isinstance(submission.form_data, dict):
+                user, form_data = submission.submitter, submission.form_data
+            else:
+                user = User.objects.filter(role="student").first()
+                form_data = example_form_data(template.field_schema)
+            if user is None:
+                raise CommandError("No student to render the forms for")
+
+            start = time.perf_counter()
+            document = generator._render_document(template, user, form_data)
+            fill = time.perf_counter() - start
+            self.stdout.write(
+                f"{template.name}: {len(document.placeholders())} placeholders, "
+                f"filled in {fill * 1000:.2f} ms"
+            )
+
+            baseline = None
+            for backend in backends:
+                timings, pdf_file = [], None
+                for _ in range(options["runs"]):
+                    start = time.perf_counter()
+                    pdf_file = backend.render(document)
+                    timings.append(time.perf_counter() - start)
+                    if pdf_file is None:
+                        break
+                if pdf_file is None:
+                    self.stdout.write(f"{backend.name:>10}: render failed")
+                    continue
+
+                average = sum(timings) / len(timings)
+                baseline = baseline or average
+                self.stdout.write(
+                    f"{backend.name:>10}: avg {average * 1000:9.2f} ms | "
+                    f"min {min(timings) * 1000:9.2f} ms | "
+                    f"pdf {pdf_file.size:>8} bytes | "
+                    f"{baseline / average:8.1f}x"
+                )
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from utils import normalize_signature
+from utils.render_backends import LatexBackend
+
+DOCUMENT = r"""\documentclass{article}
+\usepackage{graphicx}
+\begin{document}
+Signature: \includegraphics[width=2in]{%s}
+\end{document}
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare PDF size and pdflatex compile time for an original signature "
+        "image and its print-ready derivative"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("image", help="Path to a signature image")
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Compiles per variant (default 5)"
+        )
+
+    def handle(self, *args, **options):
+        image_path = options["image"]
+        if not os.path.exists(image_path):
+            raise CommandError(f"Image not found: {image_path}")
+
+        latex = LatexBackend()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(image_path, "rb") as f:
+                derivative = normalize_signature(f)
+            derivative_path = os.path.join(temp_dir, "signature_print.png")
+            with open(derivative_path, "wb") as f:
+                f.write(derivative.read())
+
+            for label, path in [
+                ("original", os.path.abspath(image_path)),
+                ("normalized", derivative_path),
+            ]:
+                timings = []
+                pdf_size = 0
+                for _ in range(options["runs"]):
+                    start = time.perf_counter()
+                    pdf_file = latex.compile(DOCUMENT % path)
+                    timings.append(time.perf_counter() - start)
+                    if pdf_file is None:
+                        raise CommandError(f"pdflatex failed for the {label} image")
+                    pdf_size = pdf_file.size
+
+                self.stdout.write(
+                    f"{label:>10}: image {os.path.getsize(path):>8} bytes | "
+                    f"pdf {pdf_size:>8} bytes | "
+                    f"compile avg {sum(timings) / len(timings) * 1000:.1f} ms "
+                    f"(min {min(timings) * 1000:.1f} ms)"
+                )
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from utils.form_validator import (
+    FormDataValidator,
+    example_form_data,
+    get_form_validator,
+)
+
+from api.models import FormSubmission, FormTemplate
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure form_data validation throughput: the compiled, cached "
+        "validator against compiling the schema on every call"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20000,
+            help="Validations per template and mode (default 20000)",
+        )
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=200,
+            help="Stored submissions per template to validate (default 200)",
+        )
+
+    def handle(self, *args, **options):
+        templates = [
+            template
+            for template in FormTemplate.objects.order_by("id")
+            if isinstance(template.field_schema, dict)
+            and template.field_schema.get("fields")
+        ]
+        if not templates:
+            raise CommandError(
+                "No form template with a field schema, run create_form_templates"
+            )
+
+        iterations = options["iterations"]
+        for template in templates:
+            samples = [
+                form_data
+                for form_data in FormSubmission.objects.filter(form_template=template)
+                .order_by("-id")
+                .values_list("form_data", flat=True)[: options["sample"]]
+                if isinstance(form_data, dict)
+            ] or [example_form_data(template.field_schema)]
+            batch = [samples[i % len(samples)] for i in range(iterations)]
+
+            validator = get_form_validator(template)
+            invalid = sum(1 for form_data in samples if validator.validate(form_data))
+
+            cached = self._rate(
+                batch,
+                lambda form_data: get_form_validator(template).validate(form_data),
+            )
+            uncached = self._rate(
+                batch,
+                lambda form_data: FormDataValidator(template.field_schema).validate(
+                    form_data
+                ),
+            )
+            self.stdout.write(
+                f"{template.name}: {len(template.field_schema['fields'])} fields, "
+                f"{len(samples)} samples ({invalid} invalid)"
+            )
+            self.stdout.write(
+                f"{'cached':>22} {cached:10,.0f} validations/s "
+                f"({1e6 / cached:6.1f} us each)"
+            )
+            self.stdout.write(
+                f"{'compiled per call':>22} {uncached:10,.0f} validations/s "
+                f"({cached / uncached:.1f}x slower)"
+            )
+
+    def _rate(self, batch, validate):
+        """Validations per second over the batch"""
+        start = time.perf_counter()
+        for form_data in batch:
+            validate(form_data)
+        return len(batch) / (time.perf_counter() - start)
@@ -14,42 +14,53 @@ class Command(BaseCommand):
                     "type": "text",
                     "required": True,
                     "label": "First Name",
+                    "latex_placeholder": "FIRST_NAME",
+                    "fallback": "first_name",
                 },
                 {
                     "name": "middle_name",
                     "type": "text",
                     "required": False,
                     "label": "Middle Name",
+                    "latex_placeholder": "MIDDLE_NAME",
                 },
                 {
                     "name": "last_name",
                     "type": "text",
                     "required": True,
                     "label": "Last Name",
+                    "latex_placeholder": "LAST_NAME",
+                    "fallback": "last_name",
                 },
                 {
                     "name": "student_id",
                     "type": "text",
                     "required": True,
                     "label": "MyUH ID",
+                    "latex_placeholder": "STUDENT_ID",
                 },
                 {
                     "name": "phone_number",
                     "type": "text",
                     "required": True,
                     "label": "Phone Number",
+                    "latex_placeholder": "PHONE_NUMBER",
+                    "format": "phone",
+                    "fallback": "phone_number",
                 },
                 {
                     "name": "email_address",
                     "type": "email",
                     "required": True,
                     "label": "School Email",
+                    "latex_placeholder": "EMAIL_ADDRESS",
                 },
                 {
                     "name": "program_plan",
                     "type": "text",
                     "required": True,
                     "label": "Program Plan",
+                    "latex_placeholder": "PROGRAM_PLAN",
                 },
                 {
                     "name": "academic_career",
@@ -57,14 +68,24 @@ class Command(BaseCommand):
                     "required": True,
                     "label": "Academic Career",
                     "options": ["undergraduate", "graduate", "law"],
+                    "latex_placeholder": "ACADEMIC_CAREER",
+                },
+                {
+                    "name": "year",
+                    "type": "text",
+                    "required": True,
+                    "label": "Year",
+                    "pattern": r"\d{4}",
+                    "latex_placeholder": "YEAR",
+                    "format": "year",
                 },
-                {"name": "year", "type": "text", "required": True, "label": "Year"},
                 {
                     "name": "season",
                     "type": "radio",
                     "required": True,
                     "label": "Term",
                     "options": ["Fall", "Spring", "Summer"],
+                    "latex_placeholder": "SEASON",
                 },
                 {
                     "name": "petition_purpose",
@@ -84,12 +105,28 @@ class Command(BaseCommand):
                         "early_submission",
                         "other",
                     ],
+                    "latex_placeholders": {
+                        "update_program_status": "PURPOSE_UPDATE_PROGRAM_STATUS",
+                        "admission_status_change": "PURPOSE_ADMISSION_STATUS_CHANGE",
+                        "add_concurrent_degree": "PURPOSE_ADD_CONCURRENT",
+                        "change_degree_objective": "PURPOSE_CHANGE_DEGREE_OBJECTIVE",
+                        "degree_requirements_exception": "PURPOSE_DEGREE_REQUIREMENTS_EXCEPTION",
+                        "leave_of_absence": "PURPOSE_LEAVE_OF_ABSENCE",
+                        "reinstate_discontinued": "PURPOSE_REINSTATE_DISCONTINUED",
+                        "request_to_graduate": "PURPOSE_REQUEST_TO_GRADUATE",
+                        "change_admin_term": "PURPOSE_CHANGE_ADMIN_TERM",
+                        "early_submission": "PURPOSE_EARLY_SUBMISSION",
+                        "other": "PURPOSE_OTHER",
+                    },
                 },
                 {
                     "name": "petition_explanation",
                     "type": "textarea",
                     "required": False,
                     "label": "Explanation of Request",
+                    "max_length": 5000,
+                    "required_if": {"field": "petition_purpose", "equals": "other"},
+                    "latex_placeholder": "PETITION_EXPLANATION",
                 },
                 {
                     "name": "supporting_document",
@@ -108,42 +145,53 @@ class Command(BaseCommand):
                     "type": "text",
                     "required": True,
                     "label": "First Name",
+                    "latex_placeholder": "FIRST_NAME",
+                    "fallback": "first_name",
                 },
                 {
                     "name": "middle_name",
                     "type": "text",
                     "required": False,
                     "label": "Middle Name",
+                    "latex_placeholder": "MIDDLE_NAME",
                 },
                 {
                     "name": "last_name",
                     "type": "text",
                     "required": True,
                     "label": "Last Name",
+                    "latex_placeholder": "LAST_NAME",
+                    "fallback": "last_name",
                 },
                 {
                     "name": "student_id",
                     "type": "text",
                     "required": True,
                     "label": "MyUH ID",
+                    "latex_placeholder": "STUDENT_ID",
                 },
                 {
                     "name": "phone_number",
                     "type": "text",
                     "required": True,
                     "label": "Phone Number",
+                    "latex_placeholder": "PHONE_NUMBER",
+                    "format": "phone",
+                    "fallback": "phone_number",
                 },
                 {
                     "name": "email_address",
                     "type": "email",
                     "required": True,
                     "label": "School Email",
+                    "latex_placeholder": "EMAIL_ADDRESS",
                 },
                 {
                     "name": "program_plan",
                     "type": "text",
                     "required": True,
                     "label": "Program Plan",
+                    "latex_placeholder": "PROGRAM_PLAN",
                 },
                 {
                     "name": "academic_career",
@@ -151,12 +199,16 @@ class Command(BaseCommand):
                     "required": True,
                     "label": "Academic Career",
                     "options": ["undergraduate", "graduate"],
+                    "latex_placeholder": "ACADEMIC_CAREER",
                 },
                 {
                     "name": "withdrawal_year",
                     "type": "text",
                     "required": True,
                     "label": "Withdrawal Year",
+                    "pattern": r"\d{4}",
+                    "latex_placeholder": "WITHDRAWAL_YEAR",
+                    "format": "year",
                 },
                 {
                     "name": "season",
@@ -164,12 +216,15 @@ class Command(BaseCommand):
                     "required": True,
                     "label": "Withdrawal Term",
                     "options": ["Fall", "Spring", "Summer"],
+                    "latex_placeholder": "SEASON",
                 },
                 {
                     "name": "initials",
                     "type": "checkboxGroup",
                     "required": False,
                     "label": "Initial all that apply",
+                    # initials typed next to each checked box
+                    "text_field": "initialsText",
                     "subfields": [
                         {
                             "name": "financial_aid",
@@ -193,6 +248,17 @@ class Command(BaseCommand):
                             "label": "Parking and Transportation",
                         },
                     ],
+                    "latex_placeholders": {
+                        "financial_aid": "INITIALS_FINANCIAL_AID",
+                        "international_student": "INITIALS_INTERNATIONAL_STUDENT",
+                        "student_athlete": "INITIALS_STUDENT_ATHLETE",
+                        "veterans": "INITIALS_VETERANS",
+                        "graduate_professional": "INITIALS_GRADUATE_PROFESSIONAL",
+                        "doctoral_student": "INITIALS_DOCTORAL_STUDENT",
+                        "student_housing": "INITIALS_STUDENT_HOUSING",
+                        "dining_services": "INITIALS_DINING_SERVICES",
+                        "parking_transportation": "INITIALS_PARKING_TRANSPORTATION",
+                    },
                 },
                 {"name": "initialsText", "type": "hidden", "required": False},
             ]
@@ -206,42 +272,53 @@ class Command(BaseCommand):
                     "type": "text",
                     "required": True,
                     "label": "First Name",
+                    "latex_placeholder": "FIRST_NAME",
+                    "fallback": "first_name",
                 },
                 {
                     "name": "middle_name",
                     "type": "text",
                     "required": False,
                     "label": "Middle Name",
+                    "latex_placeholder": "MIDDLE_NAME",
                 },
                 {
                     "name": "last_name",
                     "type": "text",
                     "required": True,
                     "label": "Last Name",
+                    "latex_placeholder": "LAST_NAME",
+                    "fallback": "last_name",
                 },
                 {
                     "name": "student_id",
                     "type": "text",
                     "required": True,
                     "label": "MyUH ID",
+                    "latex_placeholder": "STUDENT_ID",
                 },
                 {
                     "name": "phone_number",
                     "type": "text",
                     "required": True,
                     "label": "Phone Number",
+                    "latex_placeholder": "PHONE_NUMBER",
+                    "format": "phone",
+                    "fallback": "phone_number",
                 },
                 {
                     "name": "email_address",
                     "type": "email",
                     "required": True,
                     "label": "School Email",
+                    "latex_placeholder": "EMAIL_ADDRESS",
                 },
                 {
                     "name": "program_plan",
                     "type": "text",
                     "required": True,
                     "label": "Program Plan",
+                    "latex_placeholder": "PROGRAM_PLAN",
                 },
                 {
                     "name": "academic_career",
@@ -249,12 +326,16 @@ class Command(BaseCommand):
                     "required": True,
                     "label": "Academic Career",
                     "options": ["graduate"],
+                    "latex_placeholder": "ACADEMIC_CAREER",
                 },
                 {
                     "name": "year",
                     "type": "text",
                     "required": True,
                     "label": "Year",
+                    "pattern": r"\d{4}",
+                    "latex_placeholder": "YEAR",
+                    "format": "year",
                 },
                 {
                     "name": "season",
@@ -262,6 +343,7 @@ class Command(BaseCommand):
                     "required": True,
                     "label": "Term",
                     "options": ["Fall", "Spring", "Summer"],
+                    "latex_placeholder": "SEASON",
                 },
                 {
                     "name": "petition_purpose",
@@ -269,12 +351,17 @@ class Command(BaseCommand):
                     "required": True,
                     "label": "Purpose of Petition",
                     "options": ["posthumous_degree"],
+                    "latex_placeholders": {
+                        "posthumous_degree": "PURPOSE_POSTHUMOUS_DEGREE",
+                    },
                 },
                 {
                     "name": "petition_explanation",
                     "type": "textarea",
                     "required": True,
                     "label": "Explanation of Request",
+                    "max_length": 5000,
+                    "latex_placeholder": "PETITION_EXPLANATION",
                 },
                 {
                     "name": "supporting_document",
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.models import Notification
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued notifications, batched per recipient and following "
+        "their digest preferences. Runs until interrupted unless --once"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the due queue and exit"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10,
+            help="Seconds to wait when nothing is due (default 10)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Recipients per round (default NOTIFICATION_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    sent, failed = Notification.dispatch(options["batch_size"])
+                except Exception as e:
+                    # backend unreachable, nothing was marked, retry later
+                    self.stderr.write(f"Dispatch failed: {e}")
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+                    continue
+
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f"sent {sent}, failed {failed}")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Sent {total_sent} messages, {total_failed} failed")
+        )
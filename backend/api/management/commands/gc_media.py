@@ -0,0 +1,110 @@
+import posixpath
+from datetime import timedelta
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.core.db_router import pin_to_primary
+from api.models import FormApproval, FormSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete generated PDFs under forms/ that no submission or approval "
+        "references any more (replaced previews, superseded drafts). Walks "
+        "the storage one directory at a time and checks each batch of files "
+        "against the database, so memory stays flat however many are stored"
+    )
+
+    ROOT = "forms"
+    # file fields whose stored names keep a file alive
+    REFERENCES = ((FormSubmission, "current_pdf"), (FormApproval, "signed_pdf"))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be deleted",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Files checked and deleted per batch (default 500)",
+        )
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=24,
+            help=(
+                "Keep files younger than this, a PDF is stored just before the "
+                "row referencing it is saved (default 24)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        # a lagging replica must never make a live file look unreferenced
+        pin_to_primary()
+
+        storage = FormSubmission._meta.get_field("current_pdf").storage
+        cutoff = timezone.now() - timedelta(hours=options["min_age_hours"])
+        dry_run = options["dry_run"]
+
+        scanned = orphaned = freed = 0
+        if storage.exists(self.ROOT):
+            files = self._walk(storage, self.ROOT)
+            while batch := list(islice(files, options["batch_size"])):
+                scanned += len(batch)
+                referenced = self._referenced(batch)
+                orphans = [
+                    name
+                    for name in batch
+                    if name not in referenced
+                    and self._older_than(storage, name, cutoff)
+                ]
+                for name in orphans:
+                    freed += storage.size(name)
+                    if dry_run:
+                        self.stdout.write(f"would delete {name}")
+                    else:
+                        storage.delete(name)
+                orphaned += len(orphans)
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"checked {scanned} files, {orphaned} unreferenced"
+                    )
+
+        verb = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {orphaned} of {scanned} files under {self.ROOT}/ "
+                f"({freed / 1024 / 1024:.1f} MB)"
+            )
+        )
+
+    def _walk(self, storage, path):
+        """Yield the names of all files under path, a directory at a time"""
+        directories, files = storage.listdir(path)
+        for name in sorted(files):
+            yield posixpath.join(path, name)
+        for directory in sorted(directories):
+            yield from self._walk(storage, posixpath.join(path, directory))
+
+    def _referenced(self, names):
+        """The subset of names stored in any referencing file field"""
+        referenced = set()
+        for model, field in self.REFERENCES:
+            referenced.update(
+                model.objects.filter(**{f"{field}__in": names}).values_list(
+                    field, flat=True
+                )
+            )
+        return referenced
+
+    def _older_than(self, storage, name, cutoff):
+        try:
+            return storage.get_modified_time(name) < cutoff
+        except NotImplementedError:
+            # the storage cannot tell, rely on the references alone
+            return True
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.importers import OrganizationImporter, OrganizationImportError, load_org_chart
+
+
+class Command(BaseCommand):
+    help = (
+        "Import the organizational hierarchy (units, parents and approver "
+        "assignments) from a YAML, JSON or CSV org chart"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Org chart file")
+        parser.add_argument(
+            "--format",
+            choices=["yaml", "json", "csv"],
+            help="File format (default: from the file extension)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the planned changes",
+        )
+        parser.add_argument(
+            "--keep-missing",
+            action="store_true",
+            help="Do not deactivate units and approvers missing from the file",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            chart = load_org_chart(options["path"], options["format"])
+            importer = OrganizationImporter(
+                chart, deactivate_missing=not options["keep_missing"]
+            )
+            plan = importer.plan()
+        except OrganizationImportError as e:
+            raise CommandError(str(e))
+
+        for line in plan.report():
+            self.stdout.write(line)
+
+        summary = ", ".join(
+            f"{count} {label.replace('_', ' ')}"
+            for label, count in plan.summary().items()
+        )
+        if not plan.has_changes():
+            self.stdout.write(self.style.SUCCESS("Organization is up to date"))
+        elif options["dry_run"]:
+            self.stdout.write(
+                self.style.WARNING(f"Dry run, nothing written: {summary}")
+            )
+        else:
+            importer.apply(plan)
+            self.stdout.write(self.style.SUCCESS(f"Organization imported: {summary}"))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from api.models import User
+from utils import normalize_signature
+
+
+class Command(BaseCommand):
+    help = "Generate print-ready signature derivatives for existing signatures"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives even if one already exists",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(signature="").exclude(signature__isnull=True)
+        if not options["force"]:
+            users = users.filter(signature_print__in=["", None])
+
+        count = users.count()
+        self.stdout.write(f"Found {count} signatures to normalize")
+
+        normalized = 0
+        for user in users.iterator():
+            try:
+                with user.signature.open("rb") as signature_file:
+                    signature_print = normalize_signature(signature_file)
+            except (OSError, ValueError) as e:
+                self.stdout.write(
+                    self.style.WARNING(f"Skipping {user.username}: {str(e)}")
+                )
+                continue
+
+            user.set_signature_print(signature_print)
+            user.save(
+                update_fields=[
+                    "signature_print",
+                    "signature_print_digest",
+                    "signature_version",
+                ]
+            )
+            normalized += 1
+            self.stdout.write(
+                f"Normalized signature for {user.username} "
+                f"({user.signature.size} -> {user.signature_print.size} bytes)"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully normalized {normalized} signatures")
+        )
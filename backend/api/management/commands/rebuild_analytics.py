@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.models import (
+    ApprovalDecisionRollup,
+    ApprovalStepFact,
+    SubmissionStatusRollup,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the workflow analytics rollups and approval step facts from the "
+        "submission and approval tables (first deploy, or after bulk changes "
+        "that skip signals)"
+    )
+
+    def handle(self, *args, **options):
+        for model in (SubmissionStatusRollup, ApprovalDecisionRollup, ApprovalStepFact):
+            start = time.perf_counter()
+            rows = model.rebuild()
+            self.stdout.write(
+                f"{model.__name__}: {rows} rows in {time.perf_counter() - start:.1f}s"
+            )
+        self.stdout.write(self.style.SUCCESS("Analytics rollups rebuilt"))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.models import FormSubmission
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the full-text search document of form submissions, e.g. "
+        "after deploying search or renaming a form template"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only submissions that were never indexed",
+        )
+        parser.add_argument(
+            "--template",
+            type=int,
+            help="Only submissions of this form template id",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Submissions written per query (default 500)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = FormSubmission.objects.all()
+        if options["missing"]:
+            queryset = queryset.filter(search_vector__isnull=True)
+        if options["template"]:
+            queryset = queryset.filter(form_template_id=options["template"])
+
+        start = time.perf_counter()
+        refreshed = FormSubmission.refresh_search_vectors(
+            queryset, batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {refreshed} submissions in {time.perf_counter() - start:.1f}s"
+            )
+        )
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from utils import FormPDFGenerator, RenderUnavailable
+
+from api.core.db_router import pin_to_primary
+from api.models import FormSubmission, FormSubmissionIdentifier
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the PDF of submitted forms that have none, left by submit "
+        "while PDF rendering failed or its circuit breaker was open. Forms "
+        "that fail again are retried with backoff and given up on after "
+        "PDF_RENDER_MAX_ATTEMPTS. Stops early when the breaker is (still) "
+        "open, run it again later. Forms already decided on get the "
+        "signatures of those decisions, as on the approve path"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Submissions rendered per run (default 100)",
+        )
+        parser.add_argument(
+            "--retry-failed",
+            action="store_true",
+            help="Also try forms that are backing off or were given up on, "
+            "e.g. after fixing their template",
+        )
+
+    def handle(self, *args, **options):
+        # a lagging replica would hand out forms that already got their PDF
+        pin_to_primary()
+
+        missing = FormSubmission.missing_pdf()
+        if options["retry_failed"]:
+            due = missing.order_by("pdf_render_attempts", "id")
+        else:
+            due = FormSubmission.pdf_render_due()
+        submissions = due.select_related(
+            "form_template", "submitter", "submission_identifier"
+        )[: options["limit"]]
+        generator = FormPDFGenerator()
+
+        rendered = failed = 0
+        for submission in submissions:
+            try:
+                pdf_file = generator.generate_signed_form(submission)
+            except RenderUnavailable as e:
+                # the breaker is no verdict on this form, not counted
+                self.stderr.write(f"Stopped, {str(e)}")
+                break
+
+            if pdf_file is None:
+                failed += 1
+                submission.record_pdf_render_failure()
+                self.stderr.write(
+                    f"submission {submission.id}: render failed "
+                    f"({submission.pdf_render_attempts} attempts)"
+                )
+                continue
+
+            try:
+                identifier = submission.submission_identifier.identifier
+            except FormSubmissionIdentifier.DoesNotExist:
+                identifier = submission.generate_submission_identifier()
+            submission.attach_pdf(pdf_file, identifier)
+            submission.save(
+                update_fields=[
+                    "current_pdf",
+                    "pdf_url",
+                    "pdf_render_attempts",
+                    "pdf_render_failed_at",
+                    "updated_at",
+                ]
+            )
+            rendered += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"submission {submission.id}: {submission.pdf_url}")
+
+        given_up = missing.filter(
+            pdf_render_attempts__gte=settings.PDF_RENDER_MAX_ATTEMPTS
+        ).count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} PDFs, {failed} failed, "
+                f"{missing.count()} submissions still without one "
+                f"({given_up} given up on)"
+            )
+        )
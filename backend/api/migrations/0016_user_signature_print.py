@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 06:47
+
+import utils.hash
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_formapproval_workflow_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='signature_print',
+            field=models.ImageField(blank=True, null=True, upload_to=utils.hash.signature_print_upload_path),
+        ),
+    ]
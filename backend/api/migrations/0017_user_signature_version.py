@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_user_signature_print'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='signature_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
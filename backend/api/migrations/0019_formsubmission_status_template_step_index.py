@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_apicredential'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formsubmission',
+            index=models.Index(fields=['status', 'form_template', 'current_step'], name='formsub_status_tpl_step_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:15
+
+import django.contrib.postgres.indexes
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_formsubmission_status_template_step_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formsubmission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['form_data'], name='formsub_form_data_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='formsubmission',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.fields.json.KeyTextTransform('student_id', 'form_data'), name='text_pattern_ops'), name='formsub_student_id_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_formsubmission_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApprovalDecisionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('decision', models.CharField(max_length=20)),
+                ('duration_bucket', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_seconds', models.BigIntegerField(default=0)),
+                ('approver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('form_template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.formtemplate')),
+                ('unit', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.organizationalunit')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SubmissionStatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('left', models.PositiveIntegerField(default=0)),
+                ('form_template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.formtemplate')),
+                ('unit', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.organizationalunit')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='approvaldecisionrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'unit', 'form_template', 'approver', 'decision', 'duration_bucket'), name='decision_rollup_bucket_uniq', nulls_distinct=False),
+        ),
+        migrations.AddConstraint(
+            model_name='submissionstatusrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'unit', 'form_template', 'status'), name='status_rollup_bucket_uniq', nulls_distinct=False),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_workflow_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApprovalStepFact',
+            fields=[
+                ('approval', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='api.formapproval')),
+                ('position', models.CharField(blank=True, max_length=100)),
+                ('step_number', models.PositiveIntegerField()),
+                ('decision', models.CharField(max_length=20)),
+                ('decided_at', models.DateTimeField()),
+                ('duration_seconds', models.PositiveIntegerField()),
+                ('sla_seconds', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='formapproval',
+            index=models.Index(condition=models.Q(('decision', '')), fields=['received_at'], name='formapproval_open_received_idx'),
+        ),
+        migrations.AddField(
+            model_name='approvalstepfact',
+            name='approver',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='approvalstepfact',
+            name='form_template',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.formtemplate'),
+        ),
+        migrations.AddField(
+            model_name='approvalstepfact',
+            name='unit',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.organizationalunit'),
+        ),
+        migrations.AddIndex(
+            model_name='approvalstepfact',
+            index=models.Index(fields=['decided_at'], include=('position', 'unit', 'form_template', 'duration_seconds', 'sla_seconds'), name='stepfact_decided_covering_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 07:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='formsubmission',
+            name='previous_version',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='revisions', to='api.formsubmission'),
+        ),
+        migrations.AddIndex(
+            model_name='formsubmission',
+            index=models.Index(condition=models.Q(('previous_version__isnull', False)), fields=['previous_version'], include=('id',), name='formsub_revisions_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_revision_chain_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formsubmission',
+            name='preview_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:15
+
+import utils.hash
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0026_preview_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='formapproval',
+            name='signed_pdf',
+            field=models.FileField(blank=True, null=True, upload_to=utils.hash.signed_pdf_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='formsubmission',
+            name='current_pdf',
+            field=models.FileField(blank=True, null=True, upload_to=utils.hash.form_pdf_upload_path),
+        ),
+        migrations.AddIndex(
+            model_name='formapproval',
+            index=models.Index(fields=['signed_pdf'], name='formapproval_pdf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='formsubmission',
+            index=models.Index(fields=['current_pdf'], name='formsub_pdf_idx'),
+        ),
+    ]
@@ -0,0 +1,206 @@
+# Moves the LaTeX placeholder mapping of the default form templates into
+# field_schema under latex_ keys. Templates created before the mapping fall
+# back to name matching otherwise, which misses checkbox options, phone
+# formatting, user fallbacks and the default year. Rows that already got the
+# mapping under the old placeholder/placeholders keys are renamed, the
+# frontend shows "placeholder" as the input hint.
+
+import re
+
+from django.db import migrations
+
+
+# as create_form_templates declares them, by template and field name
+MAPPINGS = {
+    'Graduate Petition Form': {
+        'first_name': {
+            'latex_placeholder': 'FIRST_NAME',
+            'fallback': 'first_name',
+        },
+        'middle_name': {
+            'latex_placeholder': 'MIDDLE_NAME',
+        },
+        'last_name': {
+            'latex_placeholder': 'LAST_NAME',
+            'fallback': 'last_name',
+        },
+        'student_id': {
+            'latex_placeholder': 'STUDENT_ID',
+        },
+        'phone_number': {
+            'latex_placeholder': 'PHONE_NUMBER',
+            'format': 'phone',
+            'fallback': 'phone_number',
+        },
+        'email_address': {
+            'latex_placeholder': 'EMAIL_ADDRESS',
+        },
+        'program_plan': {
+            'latex_placeholder': 'PROGRAM_PLAN',
+        },
+        'academic_career': {
+            'latex_placeholder': 'ACADEMIC_CAREER',
+        },
+        'year': {
+            'latex_placeholder': 'YEAR',
+            'format': 'year',
+        },
+        'season': {
+            'latex_placeholder': 'SEASON',
+        },
+        'petition_purpose': {
+            'latex_placeholders': {
+                'update_program_status': 'PURPOSE_UPDATE_PROGRAM_STATUS',
+                'admission_status_change': 'PURPOSE_ADMISSION_STATUS_CHANGE',
+                'add_concurrent_degree': 'PURPOSE_ADD_CONCURRENT',
+                'change_degree_objective': 'PURPOSE_CHANGE_DEGREE_OBJECTIVE',
+                'degree_requirements_exception': 'PURPOSE_DEGREE_REQUIREMENTS_EXCEPTION',
+                'leave_of_absence': 'PURPOSE_LEAVE_OF_ABSENCE',
+                'reinstate_discontinued': 'PURPOSE_REINSTATE_DISCONTINUED',
+                'request_to_graduate': 'PURPOSE_REQUEST_TO_GRADUATE',
+                'change_admin_term': 'PURPOSE_CHANGE_ADMIN_TERM',
+                'early_submission': 'PURPOSE_EARLY_SUBMISSION',
+                'other': 'PURPOSE_OTHER',
+            },
+        },
+        'petition_explanation': {
+            'latex_placeholder': 'PETITION_EXPLANATION',
+        },
+    },
+    'Term Withdrawal Form': {
+        'first_name': {
+            'latex_placeholder': 'FIRST_NAME',
+            'fallback': 'first_name',
+        },
+        'middle_name': {
+            'latex_placeholder': 'MIDDLE_NAME',
+        },
+        'last_name': {
+            'latex_placeholder': 'LAST_NAME',
+            'fallback': 'last_name',
+        },
+        'student_id': {
+            'latex_placeholder': 'STUDENT_ID',
+        },
+        'phone_number': {
+            'latex_placeholder': 'PHONE_NUMBER',
+            'format': 'phone',
+            'fallback': 'phone_number',
+        },
+        'email_address': {
+            'latex_placeholder': 'EMAIL_ADDRESS',
+        },
+        'program_plan': {
+            'latex_placeholder': 'PROGRAM_PLAN',
+        },
+        'academic_career': {
+            'latex_placeholder': 'ACADEMIC_CAREER',
+        },
+        'withdrawal_year': {
+            'latex_placeholder': 'WITHDRAWAL_YEAR',
+            'format': 'year',
+        },
+        'season': {
+            'latex_placeholder': 'SEASON',
+        },
+        'initials': {
+            'latex_placeholders': {
+                'financial_aid': 'INITIALS_FINANCIAL_AID',
+                'international_student': 'INITIALS_INTERNATIONAL_STUDENT',
+                'student_athlete': 'INITIALS_STUDENT_ATHLETE',
+                'veterans': 'INITIALS_VETERANS',
+                'graduate_professional': 'INITIALS_GRADUATE_PROFESSIONAL',
+                'doctoral_student': 'INITIALS_DOCTORAL_STUDENT',
+                'student_housing': 'INITIALS_STUDENT_HOUSING',
+                'dining_services': 'INITIALS_DINING_SERVICES',
+                'parking_transportation': 'INITIALS_PARKING_TRANSPORTATION',
+            },
+            'text_field': 'initialsText',
+        },
+    },
+    'Graduate Posthumous Degree Petition': {
+        'first_name': {
+            'latex_placeholder': 'FIRST_NAME',
+            'fallback': 'first_name',
+        },
+        'middle_name': {
+            'latex_placeholder': 'MIDDLE_NAME',
+        },
+        'last_name': {
+            'latex_placeholder': 'LAST_NAME',
+            'fallback': 'last_name',
+        },
+        'student_id': {
+            'latex_placeholder': 'STUDENT_ID',
+        },
+        'phone_number': {
+            'latex_placeholder': 'PHONE_NUMBER',
+            'format': 'phone',
+            'fallback': 'phone_number',
+        },
+        'email_address': {
+            'latex_placeholder': 'EMAIL_ADDRESS',
+        },
+        'program_plan': {
+            'latex_placeholder': 'PROGRAM_PLAN',
+        },
+        'academic_career': {
+            'latex_placeholder': 'ACADEMIC_CAREER',
+        },
+        'year': {
+            'latex_placeholder': 'YEAR',
+            'format': 'year',
+        },
+        'season': {
+            'latex_placeholder': 'SEASON',
+        },
+        'petition_purpose': {
+            'latex_placeholders': {
+                'posthumous_degree': 'PURPOSE_POSTHUMOUS_DEGREE',
+            },
+        },
+        'petition_explanation': {
+            'latex_placeholder': 'PETITION_EXPLANATION',
+        },
+    },
+}
+
+RENAMED = (('placeholder', 'latex_placeholder'), ('placeholders', 'latex_placeholders'))
+LATEX_NAME = re.compile(r'^[A-Z][A-Z0-9_]*$')
+
+
+def add_latex_placeholders(apps, schema_editor):
+    FormTemplate = apps.get_model('api', 'FormTemplate')
+    for template in FormTemplate.objects.all():
+        schema = template.field_schema
+        if not isinstance(schema, dict) or not isinstance(schema.get('fields'), list):
+            continue
+        mapping = MAPPINGS.get(template.name, {})
+        changed = False
+        for field in schema['fields']:
+            if not isinstance(field, dict):
+                continue
+            for old, new in RENAMED:
+                value = field.get(old)
+                if new in field or value is None:
+                    continue
+                if isinstance(value, dict) or (isinstance(value, str) and LATEX_NAME.match(value)):
+                    field[new] = field.pop(old)
+                    changed = True
+            for key, value in mapping.get(field.get('name'), {}).items():
+                if key not in field:
+                    field[key] = value
+                    changed = True
+        if changed:
+            template.save(update_fields=['field_schema', 'updated_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0027_sharded_pdf_paths'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_latex_placeholders, migrations.RunPython.noop),
+    ]
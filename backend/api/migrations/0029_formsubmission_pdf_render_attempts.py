@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0028_form_template_latex_placeholders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formsubmission',
+            name='pdf_render_attempts',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='formsubmission',
+            name='pdf_render_failed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:45
+
+# Rollup buckets were unique with nulls_distinct=False, which Django leaves
+# out entirely before PostgreSQL 15, so servers older than that may hold
+# several rows for one bucket. Those are merged before the bucket key moves
+# to COALESCE(unit_id, 0), which every version enforces.
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+ROLLUPS = {
+    'SubmissionStatusRollup': (
+        ('day', 'unit', 'form_template', 'status'),
+        ('entered', 'left'),
+    ),
+    'ApprovalDecisionRollup': (
+        ('day', 'unit', 'form_template', 'approver', 'decision', 'duration_bucket'),
+        ('count', 'total_seconds'),
+    ),
+}
+
+
+def merge_duplicate_buckets(apps, schema_editor):
+    for model_name, (keys, counters) in ROLLUPS.items():
+        model = apps.get_model('api', model_name)
+        duplicates = (
+            model.objects.values(*keys)
+            .annotate(
+                rows=Count('id'),
+                keep=Min('id'),
+                **{f'total_{counter}': Sum(counter) for counter in counters},
+            )
+            .filter(rows__gt=1)
+            .order_by()
+        )
+        for bucket in duplicates:
+            rows = model.objects.filter(**{key: bucket[key] for key in keys})
+            rows.filter(pk=bucket['keep']).update(
+                **{counter: bucket[f'total_{counter}'] for counter in counters}
+            )
+            rows.exclude(pk=bucket['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0029_formsubmission_pdf_render_attempts'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_buckets, migrations.RunPython.noop),
+        # the old constraints only exist if 0022 ran on PostgreSQL 15 or later
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE api_approvaldecisionrollup '
+                    'DROP CONSTRAINT IF EXISTS decision_rollup_bucket_uniq',
+                    migrations.RunSQL.noop,
+                ),
+                migrations.RunSQL(
+                    'ALTER TABLE api_submissionstatusrollup '
+                    'DROP CONSTRAINT IF EXISTS status_rollup_bucket_uniq',
+                    migrations.RunSQL.noop,
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name='approvaldecisionrollup',
+                    name='decision_rollup_bucket_uniq',
+                ),
+                migrations.RemoveConstraint(
+                    model_name='submissionstatusrollup',
+                    name='status_rollup_bucket_uniq',
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='approvaldecisionrollup',
+            constraint=models.UniqueConstraint(models.F('day'), django.db.models.functions.comparison.Coalesce(models.F('unit'), models.Value(0)), models.F('form_template'), models.F('approver'), models.F('decision'), models.F('duration_bucket'), name='decision_rollup_bucket_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='submissionstatusrollup',
+            constraint=models.UniqueConstraint(models.F('day'), django.db.models.functions.comparison.Coalesce(models.F('unit'), models.Value(0)), models.F('form_template'), models.F('status'), name='status_rollup_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-19 08:57
+
+# Cached signature files are named after the digest of signature_print,
+# existing derivatives get theirs here. Files that cannot be read are left
+# without one, the cache then hashes them as it downloads them.
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def digest_signature_prints(apps, schema_editor):
+    User = apps.get_model('api', 'User')
+    users = User.objects.exclude(signature_print='').exclude(
+        signature_print__isnull=True
+    )
+    for user in users.iterator():
+        try:
+            with user.signature_print.open('rb') as signature_print:
+                digest = hashlib.sha256(signature_print.read()).hexdigest()
+        except OSError:
+            continue
+        User.objects.filter(pk=user.pk).update(signature_print_digest=digest)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0030_rollup_bucket_unit_coalesce'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='signature_print_digest',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(digest_signature_prints, migrations.RunPython.noop),
+    ]
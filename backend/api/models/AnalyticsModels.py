@@ -0,0 +1,585 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Extract, Greatest, TruncDate
+from django.utils import timezone
+
+from .FormModels import (
+    FormApproval,
+    FormApprovalWorkflow,
+    FormSubmission,
+    FormTemplate,
+)
+from .OrganizationalModels import OrganizationalUnit
+from .UserModel import User
+
+
+def _bump(model, keys, **increments):
+    """
+    Add to the counters of the rollup row identified by keys
+
+    Increments are applied with F() so concurrent writers do not lose
+    updates; the row is created on first use.
+    """
+    increments = {field: value for field, value in increments.items() if value}
+    if not increments:
+        return
+
+    rows = model.objects.filter(**keys)
+    expressions = {field: F(field) + value for field, value in increments.items()}
+    if rows.update(**expressions):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **increments)
+    except IntegrityError:
+        # created concurrently since the update above
+        rows.update(**expressions)
+
+
+def _unit_key():
+    """
+    The unit column of a rollup's unique bucket key
+
+    unit is NULL for forms outside the hierarchy and unique constraints
+    treat NULLs as distinct. NULLS NOT DISTINCT needs PostgreSQL 15 (Django
+    leaves the constraint out on older servers), so the key uses
+    COALESCE(unit_id, 0) instead, 0 never being a unit id.
+    """
+    return Coalesce(F("unit"), Value(0))
+
+
+class _PercentileDisc(Aggregate):
+    """percentile_disc(ARRAY[...]) WITHIN GROUP (ORDER BY expression)"""
+
+    function = "PERCENTILE_DISC"
+    template = "%(function)s(%(fractions)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = ArrayField(IntegerField())
+
+    def __init__(self, expression, fractions, **extra):
+        fractions = ", ".join(str(float(fraction)) for fraction in fractions)
+        super().__init__(expression, fractions=f"ARRAY[{fractions}]", **extra)
+
+
+class SubmissionStatusRollup(models.Model):
+    """
+    Daily submission status transitions per unit and template
+
+    Every status change adds one to "entered" of the new status and one to
+    "left" of the old status on the day it happens, so per-day throughput
+    is read from "entered" and the number of submissions currently in a
+    status is the sum of entered - left over all days. Maintained by
+    signals on FormSubmission (see api.signals), rebuilt by the
+    rebuild_analytics command.
+    """
+
+    day = models.DateField()
+    unit = models.ForeignKey(
+        OrganizationalUnit,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    form_template = models.ForeignKey(
+        FormTemplate, on_delete=models.CASCADE, related_name="+"
+    )
+    status = models.CharField(max_length=20)
+
+    entered = models.PositiveIntegerField(default=0)
+    left = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                F("day"),
+                _unit_key(),
+                F("form_template"),
+                F("status"),
+                name="status_rollup_bucket_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}: +{self.entered} -{self.left}"
+
+    @classmethod
+    def record_transition(cls, previous, current, day=None):
+        """
+        Count a submission moving from one state to another
+
+        States are (status, unit_id, form_template_id) tuples.
+
+        Args:
+            previous: State before the change, None for new submissions
+            current: State after the change, None for deleted submissions
+            day: Day to book the transition on, today by default
+        """
+        if previous == current:
+            return
+        day = day or timezone.localdate()
+        for state, counter in ((previous, "left"), (current, "entered")):
+            if state is None:
+                continue
+            status, unit_id, form_template_id = state
+            _bump(
+                cls,
+                {
+                    "day": day,
+                    "unit_id": unit_id,
+                    "form_template_id": form_template_id,
+                    "status": status,
+                },
+                **{counter: 1},
+            )
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recreate the rollup from the submissions table
+
+        Submissions keep no status history, so each one is booked as
+        entering its current status on the day it was last updated. Current
+        counts are exact, earlier daily transitions are not recoverable.
+
+        Returns:
+            Number of rollup rows written
+        """
+        rows = (
+            FormSubmission.objects.annotate(day=TruncDate("updated_at"))
+            .values("day", "unit_id", "form_template_id", "status")
+            .annotate(entered=Count("id"))
+            .order_by()
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            created = cls.objects.bulk_create(
+                [cls(left=0, **row) for row in rows], batch_size=1000
+            )
+        return len(created)
+
+
+class ApprovalDecisionRollup(models.Model):
+    """
+    Daily approval decisions per approver, unit and template
+
+    Decisions are bucketed by time-to-decision (received_at to decided_at)
+    so medians and percentiles can be read from the bucket counts, and
+    total_seconds gives the exact average.
+    """
+
+    # upper bounds of the time-to-decision buckets, the last bucket is open
+    DURATION_BUCKETS = [
+        timedelta(hours=1),
+        timedelta(hours=4),
+        timedelta(hours=8),
+        timedelta(days=1),
+        timedelta(days=2),
+        timedelta(days=3),
+        timedelta(weeks=1),
+        timedelta(weeks=2),
+    ]
+    DECISIONS = ("approved", "rejected", "returned")
+
+    day = models.DateField()
+    unit = models.ForeignKey(
+        OrganizationalUnit,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    form_template = models.ForeignKey(
+        FormTemplate, on_delete=models.CASCADE, related_name="+"
+    )
+    approver = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    decision = models.CharField(max_length=20)
+    # index into DURATION_BUCKETS, len(DURATION_BUCKETS) for the open bucket
+    duration_bucket = models.PositiveSmallIntegerField()
+
+    count = models.PositiveIntegerField(default=0)
+    total_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                F("day"),
+                _unit_key(),
+                F("form_template"),
+                F("approver"),
+                F("decision"),
+                F("duration_bucket"),
+                name="decision_rollup_bucket_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.decision} x{self.count}"
+
+    @classmethod
+    def bucket_for(cls, duration):
+        """Index of the DURATION_BUCKETS bucket a duration falls in"""
+        for index, upper_bound in enumerate(cls.DURATION_BUCKETS):
+            if duration < upper_bound:
+                return index
+        return len(cls.DURATION_BUCKETS)
+
+    @classmethod
+    def bucket_label(cls, index):
+        """Human readable range of a bucket ("< 4h", "< 2d", "> 14d")"""
+
+        def short(delta):
+            hours = delta.total_seconds() / 3600
+            return f"{hours:g}h" if hours < 24 else f"{hours / 24:g}d"
+
+        if index >= len(cls.DURATION_BUCKETS):
+            return f"> {short(cls.DURATION_BUCKETS[-1])}"
+        return f"< {short(cls.DURATION_BUCKETS[index])}"
+
+    @classmethod
+    def summarize(cls, rows):
+        """
+        Time-to-decision summary from rollup rows
+
+        Args:
+            rows: Queryset of rollup rows to summarize
+
+        Returns:
+            Dictionary with the number of decisions, the average in hours,
+            the bucket holding the median and the count per bucket
+        """
+        buckets = dict(
+            rows.values_list("duration_bucket")
+            .annotate(count=Sum("count"))
+            .order_by("duration_bucket")
+        )
+        totals = rows.aggregate(decisions=Sum("count"), seconds=Sum("total_seconds"))
+        decisions = totals["decisions"] or 0
+
+        median = None
+        seen = 0
+        for index in sorted(buckets):
+            seen += buckets[index]
+            if seen * 2 >= decisions:
+                median = cls.bucket_label(index)
+                break
+
+        return {
+            "decisions": decisions,
+            "average_hours": (
+                round(totals["seconds"] / decisions / 3600, 2) if decisions else None
+            ),
+            "median": median,
+            "buckets": [
+                {"range": cls.bucket_label(index), "count": buckets.get(index, 0)}
+                for index in range(len(cls.DURATION_BUCKETS) + 1)
+            ],
+        }
+
+    @classmethod
+    def record_decision(cls, approval, unit_id, form_template_id):
+        """
+        Count a decided FormApproval
+
+        Args:
+            approval: FormApproval with decision and decided_at set
+            unit_id: Unit of the approval's submission
+            form_template_id: Template of the approval's submission
+        """
+        decided_at = approval.decided_at or timezone.now()
+        duration = max(decided_at - approval.received_at, timedelta(0))
+        _bump(
+            cls,
+            {
+                "day": timezone.localdate(decided_at),
+                "unit_id": unit_id,
+                "form_template_id": form_template_id,
+                "approver_id": approval.approver_id,
+                "decision": approval.decision,
+                "duration_bucket": cls.bucket_for(duration),
+            },
+            count=1,
+            total_seconds=int(duration.total_seconds()),
+        )
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recreate the rollup from decided FormApproval rows
+
+        Returns:
+            Number of rollup rows written
+        """
+        duration = F("decided_at") - F("received_at")
+        bucket = Case(
+            *[
+                When(duration_value__lt=upper_bound, then=index)
+                for index, upper_bound in enumerate(cls.DURATION_BUCKETS)
+            ],
+            default=len(cls.DURATION_BUCKETS),
+            output_field=IntegerField(),
+        )
+        rows = (
+            FormApproval.objects.filter(
+                decision__in=cls.DECISIONS, decided_at__isnull=False
+            )
+            .annotate(duration_value=duration)
+            .annotate(
+                day=TruncDate("decided_at"),
+                duration_bucket=bucket,
+                seconds=Extract("duration_value", "epoch"),
+                unit_id=F("form_submission__unit_id"),
+                form_template_id=F("form_submission__form_template_id"),
+            )
+            .values(
+                "day",
+                "unit_id",
+                "form_template_id",
+                "approver_id",
+                "decision",
+                "duration_bucket",
+            )
+            .annotate(count=Count("id"), total_seconds=Sum("seconds"))
+            .order_by()
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            created = cls.objects.bulk_create(
+                [
+                    cls(**{**row, "total_seconds": max(int(row["total_seconds"]), 0)})
+                    for row in rows
+                ],
+                batch_size=1000,
+            )
+        return len(created)
+
+
+class ApprovalStepFact(models.Model):
+    """
+    One row per decided approval step with its turnaround
+
+    Written when an approval is decided (see api.signals) with the position,
+    unit and template denormalized, so turnaround percentiles per position,
+    unit or template over a period read one covering index instead of
+    joining approvals, workflows and submissions.
+    """
+
+    PERCENTILES = (0.5, 0.9, 0.95)
+    GROUPS = {
+        "position": ["position"],
+        "unit": ["unit_id", "unit__name"],
+        "template": ["form_template_id", "form_template__name"],
+    }
+
+    approval = models.OneToOneField(
+        FormApproval, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    form_template = models.ForeignKey(
+        FormTemplate, on_delete=models.CASCADE, related_name="+"
+    )
+    unit = models.ForeignKey(
+        OrganizationalUnit,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    # approval position of the step, "" when the template has no such step
+    position = models.CharField(max_length=100, blank=True)
+    step_number = models.PositiveIntegerField()
+    approver = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    decision = models.CharField(max_length=20)
+    decided_at = models.DateTimeField()
+
+    # received_at to decided_at, and the SLA that applied when decided
+    duration_seconds = models.PositiveIntegerField()
+    sla_seconds = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            # turnaround queries filter on the period and read only these
+            # columns, so they are answered by an index-only scan
+            models.Index(
+                fields=["decided_at"],
+                include=[
+                    "position",
+                    "unit",
+                    "form_template",
+                    "duration_seconds",
+                    "sla_seconds",
+                ],
+                name="stepfact_decided_covering_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.approval_id} {self.position}: {self.duration_seconds}s"
+
+    @classmethod
+    def record(cls, approval, submission):
+        """
+        Store the turnaround of a decided approval
+
+        Args:
+            approval: FormApproval with its decision set
+            submission: The approval's FormSubmission
+        """
+        if approval.workflow_id:
+            position = approval.workflow.approval_position
+        else:
+            position = (
+                FormApprovalWorkflow.objects.filter(
+                    form_template_id=submission.form_template_id,
+                    order=approval.step_number,
+                )
+                .values_list("approval_position", flat=True)
+                .first()
+                or ""
+            )
+        decided_at = approval.decided_at or timezone.now()
+        duration = max(decided_at - approval.received_at, timedelta(0))
+        cls.objects.update_or_create(
+            approval=approval,
+            defaults={
+                "form_template_id": submission.form_template_id,
+                "unit_id": submission.unit_id,
+                "position": position,
+                "step_number": approval.step_number,
+                "approver_id": approval.approver_id,
+                "decision": approval.decision,
+                "decided_at": decided_at,
+                "duration_seconds": int(duration.total_seconds()),
+                "sla_seconds": int(FormApproval.sla_for(position).total_seconds()),
+            },
+        )
+
+    @classmethod
+    def turnaround(cls, group_by, facts=None):
+        """
+        Turnaround percentiles per position, unit or template
+
+        Args:
+            group_by: One of GROUPS
+            facts: Queryset of facts to aggregate, all by default
+
+        Returns:
+            List of dictionaries with the group, number of decisions, average
+            and percentile hours and how many steps exceeded their SLA
+        """
+        fields = cls.GROUPS[group_by]
+        facts = cls.objects.all() if facts is None else facts
+        rows = (
+            facts.values(*fields)
+            .annotate(
+                decisions=Count("pk"),
+                average=Avg("duration_seconds"),
+                percentiles=_PercentileDisc("duration_seconds", cls.PERCENTILES),
+                over_sla=Count("pk", filter=Q(duration_seconds__gt=F("sla_seconds"))),
+            )
+            .order_by(*fields)
+        )
+
+        def hours(seconds):
+            return round(seconds / 3600, 2)
+
+        results = []
+        for row in rows:
+            percentiles = row.pop("percentiles")
+            row["average_hours"] = hours(row.pop("average"))
+            for fraction, seconds in zip(cls.PERCENTILES, percentiles):
+                row[f"p{round(fraction * 100)}_hours"] = hours(seconds)
+            row["over_sla_ratio"] = round(row["over_sla"] / row["decisions"], 3)
+            results.append(row)
+        return results
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recreate the facts from decided FormApproval rows
+
+        Written as one INSERT ... SELECT, building hundreds of thousands of
+        model instances for bulk_create took minutes.
+
+        Returns:
+            Number of facts written
+        """
+        step_position = FormApprovalWorkflow.objects.filter(
+            form_template_id=OuterRef("form_submission__form_template_id"),
+            order=OuterRef("step_number"),
+        ).values("approval_position")[:1]
+        positions = settings.APPROVAL_SLA_HOURS_BY_POSITION
+
+        def sla_seconds(position):
+            return Value(int(FormApproval.sla_for(position).total_seconds()))
+
+        # (column, expression) in the order of the INSERT column list
+        columns = {
+            "form_template_id": F("form_submission__form_template_id"),
+            "unit_id": F("form_submission__unit_id"),
+            "position": Coalesce(
+                "workflow__approval_position", Subquery(step_position), Value("")
+            ),
+            "step_number": F("step_number"),
+            "approver_id": F("approver_id"),
+            "decision": F("decision"),
+            "decided_at": Coalesce("decided_at", "updated_at"),
+            "duration_seconds": Greatest(
+                Cast(
+                    Extract(
+                        ExpressionWrapper(
+                            Coalesce("decided_at", "updated_at") - F("received_at"),
+                            output_field=models.DurationField(),
+                        ),
+                        "epoch",
+                    ),
+                    IntegerField(),
+                ),
+                Value(0),
+            ),
+            "sla_seconds": Case(
+                *[
+                    When(fact_position=position, then=sla_seconds(position))
+                    for position in positions
+                ],
+                default=sla_seconds(""),
+            ),
+        }
+        rows = (
+            FormApproval.objects.filter(decision__in=ApprovalDecisionRollup.DECISIONS)
+            .annotate(
+                **{
+                    f"fact_{column}": expression
+                    for column, expression in columns.items()
+                }
+            )
+            .values_list("id", *[f"fact_{column}" for column in columns])
+            .order_by()
+        )
+        sql, params = rows.query.sql_with_params()
+        column_list = ", ".join(["approval_id", *columns])
+
+        connection = connections[router.db_for_write(cls)]
+        with transaction.atomic(using=connection.alias):
+            cls.objects.all().delete()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {cls._meta.db_table} ({column_list}) {sql}", params
+                )
+                return cursor.rowcount
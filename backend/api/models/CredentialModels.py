@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from .ModelConstants import BaseModel
+from .UserModel import User
+
+
+class ApiCredential(BaseModel, models.Model):
+    """
+    API key for integrations calling the API without a session
+
+    Keys look like "pk_<prefix>.<secret>". The prefix is stored in clear and
+    indexed so a key is found with one lookup, the secret only as an
+    HMAC-SHA256 digest. Secrets are 256 random bits so, unlike passwords,
+    they need no slow hash and verify in microseconds.
+    """
+
+    # who the integration acts as
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="api_credentials"
+    )
+
+    # label to tell keys apart ("registrar sync", "reporting")
+    name = models.CharField(max_length=100)
+
+    # public part of the key used to look it up
+    prefix = models.CharField(max_length=16, unique=True)
+
+    # hex HMAC-SHA256 of the secret part of the key
+    key_hash = models.CharField(max_length=64)
+
+    # optional expiry, null keys never expire
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    # set when the key is revoked, revoked keys are kept for auditing
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    # updated at most every API_KEY_LAST_USED_INTERVAL seconds
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    KEY_PREFIX = "pk_"
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.name} ({self.KEY_PREFIX}{self.prefix}) - {self.user.username}"
+
+    @staticmethod
+    def hash_secret(secret):
+        """Keyed digest of a key's secret part"""
+        return hmac.new(
+            settings.SECRET_KEY.encode(), secret.encode(), hashlib.sha256
+        ).hexdigest()
+
+    @classmethod
+    def issue(cls, user, name, expires_at=None):
+        """
+        Create a new key for a user
+
+        Args:
+            user: The User the key authenticates as
+            name: Label for the key
+            expires_at: Optional datetime after which the key stops working
+
+        Returns:
+            Tuple of (ApiCredential, raw key string). The raw key is not
+            stored and cannot be recovered later.
+        """
+        prefix = secrets.token_hex(6)
+        secret = secrets.token_urlsafe(32)
+        credential = cls.objects.create(
+            user=user,
+            name=name,
+            prefix=prefix,
+            key_hash=cls.hash_secret(secret),
+            expires_at=expires_at,
+        )
+        return credential, f"{cls.KEY_PREFIX}{prefix}.{secret}"
+
+    @classmethod
+    def verify(cls, raw_key):
+        """
+        Find the usable credential matching a raw key
+
+        Returns:
+            ApiCredential (with its user loaded) or None if the key is
+            malformed, unknown, revoked, expired or does not match
+        """
+        if not raw_key.startswith(cls.KEY_PREFIX):
+            return None
+        prefix, _, secret = raw_key[len(cls.KEY_PREFIX) :].partition(".")
+        if not prefix or not secret:
+            return None
+
+        credential = cls.objects.select_related("user").filter(prefix=prefix).first()
+        if credential is None or not credential.is_usable():
+            return None
+        if not hmac.compare_digest(credential.key_hash, cls.hash_secret(secret)):
+            return None
+        return credential
+
+    def is_usable(self):
+        """Whether the key is neither revoked nor expired"""
+        if self.revoked_at is not None:
+            return False
+        return self.expires_at is None or self.expires_at > timezone.now()
+
+    def revoke(self):
+        self.revoked_at = timezone.now()
+        self.save(update_fields=["revoked_at", "updated_at"])
+
+    def touch(self):
+        """Record use of the key, writing at most once per interval"""
+        now = timezone.now()
+        interval = timedelta(seconds=settings.API_KEY_LAST_USED_INTERVAL)
+        if self.last_used_at is None or now - self.last_used_at >= interval:
+            type(self).objects.filter(pk=self.pk).update(last_used_at=now)
+            self.last_used_at = now
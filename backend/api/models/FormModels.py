@@ -1,4 +1,19 @@
-from django.db import models
+import hashlib
+import json
+import re
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, router
+from django.db.models import Q
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.lookups import StartsWith
+from django.utils import timezone
+from utils import form_pdf_upload_path, signed_pdf_upload_path
 from utils.prettyPrint import pretty_print
 
 from .ModelConstants import BaseModel, FormStatusChoices, RoleChoices
@@ -140,8 +155,11 @@ class FormSubmission(BaseModel, models.Model):
     # the form data submitted by the frontend form held as JSON
     form_data = models.JSONField(help_text="JSON data containing form field values")
 
-    # The Updated PDF created from the users input
-    current_pdf = models.FileField(upload_to="forms/form_pdfs/", null=True, blank=True)
+    # The Updated PDF created from the users input, stored under
+    # forms/form_pdfs/xx/yy/ by the hash of the submission identifier
+    current_pdf = models.FileField(
+        upload_to=form_pdf_upload_path, null=True, blank=True
+    )
 
     # To be able to retrieve back should be created from
     # form_pdfs/{user_id}_{form_template_name}_{form_submission_id}
@@ -159,12 +177,14 @@ class FormSubmission(BaseModel, models.Model):
     version = models.PositiveIntegerField(default=1)
 
     # FK linking to itself so that you can sort of get like a timeline view?
+    # indexed by formsub_revisions_idx, see revision_history
     previous_version = models.ForeignKey(
         "self",
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
         related_name="revisions",
+        db_index=False,
     )
 
     # FK linking the orgnizational unit the form is for
@@ -176,13 +196,304 @@ class FormSubmission(BaseModel, models.Model):
         blank=True,
     )
 
+    # full-text document (names, identifier, template, free text), kept up
+    # to date by signals, see refresh_search_vectors
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # what the current_pdf of a draft was rendered from, see preview_fingerprint_for
+    preview_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+
+    # failed render_missing_pdfs attempts and when the last one failed, the
+    # command backs off between them, see pdf_render_due
+    pdf_render_attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+    pdf_render_failed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     class Meta:
         verbose_name = "Form Submission"
         verbose_name_plural = "Form Submissions"
+        indexes = [
+            # approver visibility and pending lookups filter on all three
+            models.Index(
+                fields=["status", "form_template", "current_step"],
+                name="formsub_status_tpl_step_idx",
+            ),
+            # containment (form_data @> {...}) on any key, see form_data_filter
+            GinIndex(
+                fields=["form_data"],
+                name="formsub_form_data_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+            # form_data->>'student_id', exact and prefix matches
+            models.Index(
+                OpClass(
+                    KeyTextTransform("student_id", "form_data"),
+                    name="text_pattern_ops",
+                ),
+                name="formsub_student_id_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="formsub_search_gin"),
+            # revisions of a version, only the few revised rows are indexed
+            # and id is included so revision_history walks the index only
+            models.Index(
+                fields=["previous_version"],
+                name="formsub_revisions_idx",
+                include=["id"],
+                condition=Q(previous_version__isnull=False),
+            ),
+            # stored file name lookups, see gc_media
+            models.Index(fields=["current_pdf"], name="formsub_pdf_idx"),
+        ]
+
+    # text search configuration for search_vector and search queries
+    SEARCH_CONFIG = "english"
+    # form_data fields indexed as free text even without a textarea schema
+    SEARCH_TEXT_FIELDS = ("petition_explanation",)
+    # form_data fields that identify the student, ranked like names
+    SEARCH_PERSON_FIELDS = ("student_id", "first_name", "last_name", "email_address")
+
+    # lookups accepted by form_data_filter
+    FORM_DATA_LOOKUPS = ("exact", "in", "startswith")
+    FORM_DATA_KEY_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+    # guards revision_history against a corrupted, cyclic chain
+    MAX_REVISION_DEPTH = 1000
+
+    # form_data keys the frontend adds for its own bookkeeping, they do not
+    # change the rendered preview
+    PREVIEW_IGNORED_KEYS = ("draft_id",)
 
     def __str__(self):
         return f"{self.form_template.name} - {self.submitter.username} ({self.status})"
 
+    @classmethod
+    def form_data_filter(cls, filters):
+        """
+        Build a filter on fields inside form_data that runs in SQL
+
+        Exact matches are merged into a single containment test
+        (form_data @> {...}) served by the GIN index, "in" becomes one
+        containment per value, and "startswith" compares the key as text
+        (indexed for student_id). Values are compared as the strings the
+        forms submit.
+
+        Args:
+            filters: Dictionary of "<key>" or "<key>__<lookup>" to value,
+                lookup being exact (default), in (list of values) or startswith
+
+        Returns:
+            Q to pass to FormSubmission.objects.filter
+
+        Raises:
+            ValueError: A key or lookup is not supported
+        """
+        contains = {}
+        condition = Q()
+        for name, value in filters.items():
+            key, _, lookup = name.partition("__")
+            lookup = lookup or "exact"
+            if not cls.FORM_DATA_KEY_PATTERN.match(key):
+                raise ValueError(f"Invalid form_data field: {key}")
+            if lookup not in cls.FORM_DATA_LOOKUPS:
+                raise ValueError(
+                    f"Unsupported lookup '{lookup}' for form_data field {key}, "
+                    f"use one of {', '.join(cls.FORM_DATA_LOOKUPS)}"
+                )
+
+            if lookup == "exact":
+                contains[key] = value
+            elif lookup == "in":
+                if not value:
+                    raise ValueError(f"No values given for form_data field {key}")
+                condition &= reduce(
+                    or_, (Q(form_data__contains={key: item}) for item in value)
+                )
+            else:
+                condition &= Q(StartsWith(KeyTextTransform(key, "form_data"), value))
+
+        if contains:
+            condition &= Q(form_data__contains=contains)
+        return condition
+
+    def search_document(self):
+        """
+        Text of this submission to index, by full-text weight
+
+        A: the submitter, the student fields of the form and the identifier
+        B: the template name
+        C: free-text (textarea) answers
+        D: every other text answer
+
+        Expects submitter, form_template and submission_identifier to be
+        loaded (see refresh_search_vectors) to avoid extra queries.
+
+        Returns:
+            Dictionary of weight letter to text
+        """
+        form_data = self.form_data if isinstance(self.form_data, dict) else {}
+        schema = self.form_template.field_schema
+        fields = schema.get("fields", []) if isinstance(schema, dict) else []
+        free_text_fields = set(self.SEARCH_TEXT_FIELDS) | {
+            field.get("name")
+            for field in fields
+            if isinstance(field, dict) and field.get("type") == "textarea"
+        }
+
+        # reverse one-to-one, drafts have no identifier yet
+        identifier = getattr(self, "submission_identifier", None)
+        people = [
+            self.submitter.first_name,
+            self.submitter.last_name,
+            self.submitter.username,
+            identifier.identifier if identifier else "",
+        ] + [str(form_data.get(name) or "") for name in self.SEARCH_PERSON_FIELDS]
+        free_text = [
+            value
+            for name, value in form_data.items()
+            if name in free_text_fields and isinstance(value, str)
+        ]
+        other_text = [
+            value
+            for name, value in form_data.items()
+            if name not in free_text_fields
+            and name not in self.SEARCH_PERSON_FIELDS
+            and isinstance(value, str)
+        ]
+
+        def join(parts):
+            return " ".join(part for part in parts if part)
+
+        return {
+            "A": join(people),
+            "B": self.form_template.name,
+            "C": join(free_text),
+            "D": join(other_text),
+        }
+
+    @classmethod
+    def refresh_search_vectors(cls, queryset=None, batch_size=500):
+        """
+        Recompute search_vector for submissions
+
+        Loads submissions with their submitter, template and identifier and
+        writes the vectors back with one UPDATE per batch, so it serves both
+        the per-save signal (a single row) and full rebuilds.
+
+        Args:
+            queryset: Submissions to refresh, all of them if None
+            batch_size: Rows loaded and written per round trip
+
+        Returns:
+            Number of submissions refreshed
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        queryset = (
+            queryset.select_related(
+                "submitter", "form_template", "submission_identifier"
+            )
+            .defer("search_vector")
+            .order_by("pk")
+        )
+
+        refreshed = 0
+        batch = []
+        for submission in queryset.iterator(chunk_size=batch_size):
+            batch.append((submission.pk, submission.search_document()))
+            if len(batch) >= batch_size:
+                cls._write_search_vectors(batch)
+                refreshed += len(batch)
+                batch = []
+        if batch:
+            cls._write_search_vectors(batch)
+            refreshed += len(batch)
+        return refreshed
+
+    @classmethod
+    def _write_search_vectors(cls, documents):
+        """
+        Store search vectors for (pk, search_document) pairs in one UPDATE
+
+        Written as UPDATE ... FROM (VALUES ...) rather than bulk_update: the
+        CASE expressions bulk_update builds cost milliseconds per row to
+        compile, which dominated full rebuilds.
+        """
+        weights = ("A", "B", "C", "D")
+        vector = " || ".join(
+            f"setweight(to_tsvector(%s::regconfig, v.{weight.lower()}), '{weight}')"
+            for weight in weights
+        )
+        rows = ", ".join(["(%s, %s, %s, %s, %s)"] * len(documents))
+        params = [cls.SEARCH_CONFIG] * len(weights)
+        for pk, document in documents:
+            params.append(pk)
+            params.extend(document[weight] for weight in weights)
+
+        connection = connections[router.db_for_write(cls)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {cls._meta.db_table} AS s SET search_vector = {vector} "
+                f"FROM (VALUES {rows}) AS v(id, a, b, c, d) WHERE s.id = v.id",
+                params,
+            )
+
+    def revision_history(self):
+        """
+        Every version in this submission's revision chain with its approvals
+
+        One recursive query walks previous_version up to the first version,
+        then revisions down from it, and aggregates each version's approvals
+        as JSON, instead of one query per version and per approval list.
+        Versions come root first; a version revised more than once lists
+        each branch at its depth.
+
+        Returns:
+            List of dictionaries, one per version, with an "approvals" list
+        """
+        submissions = self._meta.db_table
+        approvals = self.approvals.model._meta.db_table
+        users = User._meta.db_table
+        sql = f"""
+            WITH RECURSIVE ancestors AS (
+                SELECT id, previous_version_id, 0 AS hops
+                FROM {submissions} WHERE id = %(id)s
+                UNION ALL
+                SELECT s.id, s.previous_version_id, a.hops + 1
+                FROM {submissions} s JOIN ancestors a ON s.id = a.previous_version_id
+                WHERE a.hops < %(max_depth)s
+            ),
+            chain AS (
+                (SELECT id, 0 AS depth FROM ancestors ORDER BY hops DESC LIMIT 1)
+                UNION ALL
+                SELECT s.id, c.depth + 1
+                FROM {submissions} s JOIN chain c ON s.previous_version_id = c.id
+                WHERE c.depth < %(max_depth)s
+            )
+            SELECT s.id, s.version, s.previous_version_id, s.status,
+                s.current_step, s.form_data::json, s.created_at, s.updated_at,
+                COALESCE((
+                    SELECT json_agg(json_build_object(
+                        'id', a.id,
+                        'step_number', a.step_number,
+                        'approver', a.approver_id,
+                        'approver_name', u.first_name || ' ' || u.last_name,
+                        'decision', a.decision,
+                        'comments', a.comments,
+                        'received_at', a.received_at,
+                        'decided_at', a.decided_at
+                    ) ORDER BY a.step_number, a.id)
+                    FROM {approvals} a JOIN {users} u ON u.id = a.approver_id
+                    WHERE a.form_submission_id = s.id
+                ), '[]'::json) AS approvals
+            FROM chain c JOIN {submissions} s ON s.id = c.id
+            ORDER BY c.depth, s.id
+        """
+        connection = connections[router.db_for_read(type(self))]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"id": self.pk, "max_depth": self.MAX_REVISION_DEPTH})
+            # form_data is read as json, Django leaves jsonb columns unparsed
+            columns = [column.name for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
     def generate_submission_identifier(self):
         """
         Generate a unique identifier for this submission
@@ -245,6 +556,202 @@ class FormSubmission(BaseModel, models.Model):
 
         self.save()
 
+    @classmethod
+    def preview_fingerprint_for(cls, submitter, form_template, form_data):
+        """
+        Hash of everything a preview PDF is rendered from
+
+        Covers the form data, the template version, the submitter's
+        signature version, the date printed on the form and the preview
+        render backend, so an equal fingerprint means the stored preview can
+        be served as is.
+
+        Returns:
+            Hex digest string
+        """
+        data = {
+            key: value
+            for key, value in form_data.items()
+            if key not in cls.PREVIEW_IGNORED_KEYS
+        }
+        source = json.dumps(
+            [
+                data,
+                form_template.pk,
+                form_template.updated_at.isoformat(),
+                submitter.signature_version,
+                timezone.localdate().isoformat(),
+                settings.PREVIEW_RENDER_BACKEND,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    @classmethod
+    def stored_preview(cls, submitter, form_template, form_data):
+        """
+        The submitter's draft if its stored preview matches form_data
+
+        Args:
+            submitter: The User previewing the form
+            form_template: FormTemplate of the preview
+            form_data: Dictionary of form field values
+
+        Returns:
+            Tuple of (draft FormSubmission, list of changed form_data keys);
+            the draft is None when there is none or its PDF is out of date
+        """
+        draft = (
+            cls.objects.filter(
+                form_template=form_template, submitter=submitter, status="draft"
+            )
+            .select_related("submission_identifier")
+            .first()
+        )
+        if draft is None:
+            return None, sorted(form_data)
+
+        previous = draft.form_data if isinstance(draft.form_data, dict) else {}
+        changed = sorted(
+            key
+            for key in previous.keys() | form_data.keys()
+            if key not in cls.PREVIEW_IGNORED_KEYS
+            and previous.get(key) != form_data.get(key)
+        )
+        fingerprint = cls.preview_fingerprint_for(submitter, form_template, form_data)
+        if (
+            draft.preview_fingerprint != fingerprint
+            or not draft.current_pdf
+            or not hasattr(draft, "submission_identifier")
+        ):
+            return None, changed
+        return draft, changed
+
+    @classmethod
+    def store_preview(
+        cls, submitter, form_template, form_data, pdf_file, fingerprint=""
+    ):
+        """
+        Save a preview PDF onto the submitter's draft for a template
+
+        Reuses the existing draft (and its identifier) when there is one so
+        repeated previews keep pointing at the same submission.
+
+        Args:
+            submitter: The User previewing the form
+            form_template: FormTemplate the preview was generated from
+            form_data: Dictionary of form field values
+            pdf_file: ContentFile containing the rendered preview
+            fingerprint: preview_fingerprint_for of the rendered data
+
+        Returns:
+            Tuple of (draft FormSubmission, identifier string)
+        """
+        draft_submission, created = cls.objects.get_or_create(
+            form_template=form_template,
+            submitter=submitter,
+            status="draft",
+            defaults={"form_data": form_data},
+        )
+
+        if not created:
+            if isinstance(form_data, dict):
+                draft_submission.form_data = form_data
+                draft_submission.save()
+            else:
+                pretty_print(
+                    f"form_data is not a dict before saving: {type(form_data)}",
+                    "ERROR",
+                )
+
+        # Generate identifier for the preview/draft if it doesnt have one
+        # Store the identifier in the database
+        identifier_obj, created = FormSubmissionIdentifier.objects.get_or_create(
+            form_submission=draft_submission,
+            defaults={
+                "identifier": draft_submission.generate_submission_identifier(),
+                "form_type": form_template.name,
+                "student_id": form_data.get("student_id", ""),
+            },
+        )
+        identifier = identifier_obj.identifier
+
+        draft_submission.attach_pdf(pdf_file, identifier)
+        draft_submission.preview_fingerprint = fingerprint
+        draft_submission.save()
+
+        return draft_submission, identifier
+
+    def attach_pdf(self, pdf_file, identifier):
+        """
+        Store a rendered PDF as the current_pdf, without saving the row
+
+        Args:
+            pdf_file: ContentFile containing the PDF
+            identifier: Submission identifier the file is named after
+        """
+        template_code = (
+            "withdrawal"
+            if self.form_template.name == "Term Withdrawal Form"
+            else "petition"
+        )
+        pdf_filename = f"forms/{identifier}_{template_code}.pdf"
+
+        self.current_pdf.save(pdf_filename, pdf_file, save=False)
+        self.pdf_url = self.current_pdf.name
+        self.pdf_render_attempts = 0
+        self.pdf_render_failed_at = None
+
+    def record_pdf_render_failure(self):
+        """Count a failed render_missing_pdfs attempt, see pdf_render_due"""
+        self.pdf_render_attempts += 1
+        self.pdf_render_failed_at = timezone.now()
+        self.save(update_fields=["pdf_render_attempts", "pdf_render_failed_at"])
+
+    @classmethod
+    def missing_pdf(cls):
+        """
+        Submitted forms that have no stored PDF
+
+        Submit leaves them when the PDF could not be rendered (e.g. while
+        the LaTeX circuit breaker was open), render_missing_pdfs renders
+        them later. Forms auto-approved without a workflow never got one
+        and are included as well.
+
+        Returns:
+            QuerySet of FormSubmission
+        """
+        return cls.objects.exclude(status="draft").filter(
+            Q(current_pdf="") | Q(current_pdf__isnull=True)
+        )
+
+    @classmethod
+    def pdf_render_due(cls, now=None):
+        """
+        Submissions without a PDF that render_missing_pdfs should try now
+
+        Each failed attempt doubles the wait before the next one, starting
+        at PDF_RENDER_RETRY_MINUTES. After PDF_RENDER_MAX_ATTEMPTS failures
+        a submission is left alone, so forms that can never render (e.g. a
+        broken template) do not hold up the rest on every run.
+
+        Args:
+            now: Reference time, the current time by default
+
+        Returns:
+            QuerySet of FormSubmission, never tried first
+        """
+        now = now or timezone.now()
+        retry = timedelta(minutes=settings.PDF_RENDER_RETRY_MINUTES)
+        due = Q(pdf_render_attempts=0)
+        for attempts in range(1, settings.PDF_RENDER_MAX_ATTEMPTS):
+            due |= Q(
+                pdf_render_attempts=attempts,
+                pdf_render_failed_at__lte=now - retry * 2 ** (attempts - 1),
+            )
+        return cls.missing_pdf().filter(due).order_by("pdf_render_attempts", "id")
+
 
 class FormApproval(BaseModel, models.Model):
     """Individual approval records for form submissions"""
@@ -283,7 +790,9 @@ class FormApproval(BaseModel, models.Model):
     decided_at = models.DateTimeField(null=True, blank=True)
 
     # Fk linking to staff signature
-    signed_pdf = models.FileField(upload_to="forms/signed_pdfs/", null=True, blank=True)
+    signed_pdf = models.FileField(
+        upload_to=signed_pdf_upload_path, null=True, blank=True
+    )
 
     # to quickly locate should be similiar to
     # {approver_id}_{form_type}_{approval_id}
@@ -300,6 +809,16 @@ class FormApproval(BaseModel, models.Model):
 
     class Meta:
         unique_together = ["form_submission", "approver", "step_number"]
+        indexes = [
+            # undecided approvals by age, see overdue
+            models.Index(
+                fields=["received_at"],
+                name="formapproval_open_received_idx",
+                condition=Q(decision=""),
+            ),
+            # stored file name lookups, see gc_media
+            models.Index(fields=["signed_pdf"], name="formapproval_pdf_idx"),
+        ]
 
     def __str__(self):
         return f"{self.form_submission} - {self.approver.username} ({self.decision})"
@@ -312,6 +831,50 @@ class FormApproval(BaseModel, models.Model):
         if self.decision in FormStatusChoices.choices:
             self.form_submission.update_approval_status()
 
+    @classmethod
+    def sla_for(cls, position):
+        """
+        Turnaround target for an approval position
+
+        Args:
+            position: Approval position title, "" when unknown
+
+        Returns:
+            timedelta from APPROVAL_SLA_HOURS_BY_POSITION or APPROVAL_SLA_HOURS
+        """
+        hours = settings.APPROVAL_SLA_HOURS_BY_POSITION.get(
+            position, settings.APPROVAL_SLA_HOURS
+        )
+        return timedelta(hours=hours)
+
+    @classmethod
+    def overdue(cls, now=None):
+        """
+        Undecided approvals of pending submissions waiting longer than their SLA
+
+        Reads formapproval_open_received_idx, one received_at range per
+        position with its own SLA plus one for the default.
+
+        Args:
+            now: Reference time, the current time by default
+
+        Returns:
+            Queryset of FormApproval, oldest first
+        """
+        now = now or timezone.now()
+        positions = settings.APPROVAL_SLA_HOURS_BY_POSITION
+        late = Q(received_at__lt=now - cls.sla_for(""))
+        if positions:
+            late &= ~Q(workflow__approval_position__in=list(positions))
+        for position in positions:
+            late |= Q(
+                workflow__approval_position=position,
+                received_at__lt=now - cls.sla_for(position),
+            )
+        return cls.objects.filter(
+            late, decision="", form_submission__status="pending"
+        ).order_by("received_at")
+
     @classmethod
     def create_or_reassign(cls, form_submission, approver, step_number):
         """
@@ -0,0 +1,360 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, models, router, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+from utils.prettyPrint import pretty_print
+
+from .FormModels import FormSubmission
+from .UserModel import User
+
+
+class Notification(models.Model):
+    """
+    Outbox of notifications waiting to be delivered
+
+    Rows are written by the workflow signals in the same transaction as the
+    change they describe, so a rolled back decision never notifies anyone
+    and a committed one is never lost. The dispatch_notifications command
+    delivers them in the background, one message per recipient.
+
+    Delivery follows the recipient's notification_preferences:
+        {
+            "email": true,                # false turns notifications off
+            "digest": "immediate",        # or "hourly", "daily"
+            "muted": ["approval_requested"]
+        }
+    """
+
+    class Event(models.TextChoices):
+        APPROVAL_REQUESTED = "approval_requested", "Approval requested"
+        SUBMISSION_APPROVED = "submission_approved", "Submission approved"
+        SUBMISSION_REJECTED = "submission_rejected", "Submission rejected"
+        SUBMISSION_RETURNED = "submission_returned", "Submission returned"
+
+    DIGESTS = ("immediate", "hourly", "daily")
+    # first key of the pg advisory locks claiming a recipient's queue
+    ADVISORY_LOCK_CLASS = 4101
+
+    recipient = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="notifications"
+    )
+    event = models.CharField(max_length=30, choices=Event.choices)
+    form_submission = models.ForeignKey(
+        FormSubmission,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # not delivered before this time, the next digest or a retry backoff
+    available_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # the dispatcher's queue
+            models.Index(
+                fields=["available_at"],
+                name="notification_unsent_idx",
+                condition=Q(sent_at__isnull=True),
+            ),
+            models.Index(
+                fields=["recipient"],
+                name="notification_unsent_rcpt_idx",
+                condition=Q(sent_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event} -> {self.recipient_id} ({'sent' if self.sent_at else 'queued'})"
+
+    @classmethod
+    def preferences_for(cls, user):
+        """
+        A user's notification preferences with defaults filled in
+
+        Args:
+            user: The User to read notification_preferences from
+
+        Returns:
+            Dictionary with "email", "digest" and "muted" keys
+        """
+        preferences = user.notification_preferences
+        if not isinstance(preferences, dict):
+            preferences = {}
+        digest = preferences.get("digest")
+        muted = preferences.get("muted")
+        return {
+            "email": preferences.get("email", True) is not False,
+            "digest": digest if digest in cls.DIGESTS else "immediate",
+            "muted": muted if isinstance(muted, list) else [],
+        }
+
+    @classmethod
+    def next_delivery(cls, digest, now=None):
+        """
+        When a notification queued now should go out
+
+        Hourly digests go out at the top of the next hour, daily digests at
+        NOTIFICATION_DIGEST_HOUR local time.
+        """
+        now = now or timezone.now()
+        if digest == "hourly":
+            return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        if digest == "daily":
+            local = timezone.localtime(now)
+            send_at = timezone.make_aware(
+                datetime.combine(
+                    local.date(), time(hour=settings.NOTIFICATION_DIGEST_HOUR)
+                )
+            )
+            return send_at if send_at > now else send_at + timedelta(days=1)
+        return now
+
+    @classmethod
+    def enqueue(cls, recipient, event, subject, body, form_submission=None):
+        """
+        Queue a notification for the recipient unless they opted out
+
+        Meant to be called inside the transaction making the change, the
+        row is committed or rolled back together with it.
+
+        Args:
+            recipient: User to notify
+            event: One of Notification.Event
+            subject: Subject line, used as is for single notifications
+            body: Message text
+            form_submission: Optional FormSubmission the event is about
+
+        Returns:
+            The Notification, or None when the recipient opted out
+        """
+        preferences = cls.preferences_for(recipient)
+        if not preferences["email"] or event in preferences["muted"]:
+            return None
+        return cls.objects.create(
+            recipient=recipient,
+            event=event,
+            form_submission=form_submission,
+            subject=subject[:200],
+            body=body,
+            available_at=cls.next_delivery(preferences["digest"]),
+        )
+
+    @classmethod
+    def describe(cls, submission):
+        """Short human readable reference to a submission"""
+        identifier = getattr(submission, "submission_identifier", None)
+        reference = identifier.identifier if identifier else f"#{submission.pk}"
+        return f"{submission.form_template.name} ({reference})"
+
+    @classmethod
+    def approval_requested(cls, approval):
+        """Tell an approver a submission is waiting for them"""
+        submission = approval.form_submission
+        submitter = submission.submitter
+        name = f"{submitter.first_name} {submitter.last_name}".strip()
+        return cls.enqueue(
+            approval.approver,
+            cls.Event.APPROVAL_REQUESTED,
+            f"Approval requested: {submission.form_template.name}",
+            f"{name or submitter.username} submitted {cls.describe(submission)}, "
+            f"it is waiting for your approval at step {approval.step_number}.",
+            form_submission=submission,
+        )
+
+    @classmethod
+    def submission_decided(cls, submission):
+        """Tell a submitter their submission was approved, rejected or returned"""
+        event = {
+            "approved": cls.Event.SUBMISSION_APPROVED,
+            "rejected": cls.Event.SUBMISSION_REJECTED,
+            "returned": cls.Event.SUBMISSION_RETURNED,
+        }.get(submission.status)
+        if event is None:
+            return None
+
+        body = f"Your {cls.describe(submission)} was {submission.status}."
+        comments = (
+            submission.approvals.filter(decision=submission.status)
+            .exclude(comments="")
+            .order_by("-decided_at")
+            .values_list("comments", flat=True)
+            .first()
+        )
+        if comments:
+            body += f"\n\nComments: {comments}"
+        return cls.enqueue(
+            submission.submitter,
+            event,
+            f"{submission.form_template.name} {submission.status}",
+            body,
+            form_submission=submission,
+        )
+
+    @classmethod
+    def render_message(cls, recipient, notifications):
+        """
+        One email for all of a recipient's queued notifications
+
+        Args:
+            recipient: The User receiving the email
+            notifications: Their queued notifications, oldest first
+
+        Returns:
+            EmailMessage
+        """
+        if len(notifications) == 1:
+            subject = notifications[0].subject
+            body = notifications[0].body
+        else:
+            subject = f"{len(notifications)} form updates"
+            body = "\n\n".join(
+                f"{notification.subject}\n{notification.body}"
+                for notification in notifications
+            )
+        greeting = recipient.first_name or recipient.username
+        return EmailMessage(
+            subject=subject,
+            body=f"Hello {greeting},\n\n{body}\n",
+            from_email=settings.NOTIFICATION_FROM_EMAIL,
+            to=[recipient.email],
+        )
+
+    @classmethod
+    def dispatch(cls, batch_size=None, now=None):
+        """
+        Deliver queued notifications for recipients that have one due
+
+        Recipients are claimed first (see _claim) in a short transaction of
+        its own, so no transaction or advisory lock is held while talking
+        to the mail server. Each claimed recipient's due notifications are
+        sent as one message over a single backend connection and marked
+        sent, or failed, right after. Failed recipients are retried with
+        exponential backoff up to NOTIFICATION_MAX_ATTEMPTS.
+
+        Args:
+            batch_size: Recipients handled per call, NOTIFICATION_BATCH_SIZE
+                by default
+            now: Reference time, the current time by default
+
+        Returns:
+            Tuple of (messages sent, messages failed)
+        """
+        batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+        now = now or timezone.now()
+        by_recipient = cls._claim(batch_size, now)
+        if not by_recipient:
+            return 0, 0
+
+        connection = get_connection(settings.NOTIFICATION_EMAIL_BACKEND)
+        try:
+            connection.open()
+        except Exception:
+            # nothing was sent, hand the claimed rows back as they were
+            cls.objects.bulk_update(
+                [n for notifications in by_recipient.values() for n in notifications],
+                ["available_at"],
+            )
+            raise
+
+        sent = failed = 0
+        try:
+            for notifications in by_recipient.values():
+                message = cls.render_message(notifications[0].recipient, notifications)
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    pretty_print(
+                        f"Notification delivery to {message.to} failed: {e}",
+                        "ERROR",
+                    )
+                    for notification in notifications:
+                        notification.attempts += 1
+                        notification.last_error = str(e)
+                        notification.available_at = now + timedelta(
+                            minutes=2**notification.attempts
+                        )
+                    cls.objects.bulk_update(
+                        notifications, ["attempts", "last_error", "available_at"]
+                    )
+                    failed += 1
+                    continue
+
+                cls.objects.filter(pk__in=[n.pk for n in notifications]).update(
+                    sent_at=timezone.now()
+                )
+                sent += 1
+        finally:
+            connection.close()
+
+        return sent, failed
+
+    @classmethod
+    def _claim(cls, batch_size, now):
+        """
+        Claim up to batch_size recipients and their due notifications
+
+        Recipients are locked with transaction scoped advisory locks, so
+        several dispatchers can run side by side and each recipient's rows
+        are only ever handled by one of them (row locks with SKIP LOCKED
+        could split one recipient's rows across two dispatchers). The claimed
+        rows' available_at is moved NOTIFICATION_CLAIM_SECONDS ahead before
+        the transaction commits, which keeps other dispatchers off them once
+        the locks are gone. Should this dispatcher die before marking them,
+        they come due again when the claim runs out.
+
+        Returns:
+            Dictionary of recipient id to their due notifications (with
+            available_at as it was before the claim), oldest first
+        """
+        due = cls.objects.filter(
+            sent_at__isnull=True,
+            attempts__lt=settings.NOTIFICATION_MAX_ATTEMPTS,
+            available_at__lte=now,
+        )
+        db = connections[router.db_for_write(cls)]
+
+        with transaction.atomic(using=db.alias):
+            # more candidates than needed, other dispatchers hold some
+            candidates = list(
+                due.values_list("recipient_id", flat=True)
+                .annotate(first_due=Min("available_at"))
+                .order_by("first_due")[: batch_size * 4]
+            )
+            if not candidates:
+                return {}
+            with db.cursor() as cursor:
+                cursor.execute(
+                    "SELECT r FROM unnest(%s::bigint[]) AS r "
+                    "WHERE pg_try_advisory_xact_lock(%s, r::int) LIMIT %s",
+                    [candidates, cls.ADVISORY_LOCK_CLASS, batch_size],
+                )
+                recipient_ids = [row[0] for row in cursor.fetchall()]
+
+            # read after taking the locks, rows another dispatcher claimed or
+            # delivered in the meantime are no longer due
+            notifications = list(
+                due.filter(recipient_id__in=recipient_ids)
+                .select_related("recipient")
+                .order_by("created_at", "id")
+            )
+            cls.objects.filter(pk__in=[n.pk for n in notifications]).update(
+                available_at=now
+                + timedelta(seconds=settings.NOTIFICATION_CLAIM_SECONDS)
+            )
+
+        by_recipient = {}
+        for notification in notifications:
+            by_recipient.setdefault(notification.recipient_id, []).append(notification)
+        return by_recipient
@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Count
 
 from .ModelConstants import BaseModel
 from .UserModel import User
@@ -34,12 +37,99 @@ class OrganizationalUnit(BaseModel, models.Model):
     # activate/deactivate without deleting data
     is_active = models.BooleanField(default=True)
 
+    # cache keys for the assembled hierarchy (see get_tree)
+    TREE_CACHE_KEY = "org_units:tree"
+    TREE_WITH_COUNTS_CACHE_KEY = "org_units:tree:approver_counts"
+
     class Meta:
         ordering = ["level", "name"]
 
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    @classmethod
+    def build_tree(cls, include_approver_counts=False):
+        """
+        Build the nested hierarchy of all active units
+
+        Loads every active unit in a single query and links each unit to its
+        parent in memory. Units are read in level order so a parent is always
+        seen before its children; units below an inactive parent are left out.
+
+        Args:
+            include_approver_counts: Also attach the number of active approvers
+                per unit (computed with one aggregate query)
+
+        Returns:
+            List[dict]: Root units, each with a nested "children" list
+        """
+
+        units = (
+            cls.objects.filter(is_active=True)
+            .order_by("level", "name")
+            .values("id", "name", "code", "description", "parent_id", "level")
+        )
+
+        approver_counts = {}
+        if include_approver_counts:
+            approver_counts = dict(
+                UnitApprover.objects.filter(is_active=True)
+                .values("unit")
+                .annotate(total=Count("id"))
+                .values_list("unit", "total")
+            )
+
+        nodes = {}
+        roots = []
+        for unit in units:
+            parent_id = unit.pop("parent_id")
+            node = {**unit, "parent": parent_id, "children": []}
+            if include_approver_counts:
+                node["approver_count"] = approver_counts.get(unit["id"], 0)
+
+            if parent_id is None:
+                roots.append(node)
+            elif parent_id in nodes:
+                nodes[parent_id]["children"].append(node)
+            else:
+                # parent is inactive so the whole branch is hidden
+                continue
+            nodes[unit["id"]] = node
+
+        return roots
+
+    @classmethod
+    def get_tree(cls, include_approver_counts=False):
+        """
+        Cached version of build_tree
+
+        The cached trees are dropped by invalidate_tree_cache whenever a unit
+        (or, for the approver count variant, a unit approver) changes. That
+        only reaches the cache it runs against, so the tree is built on every
+        call unless ORG_TREE_CACHE_ENABLED (a cache shared by all workers).
+        """
+        if not settings.ORG_TREE_CACHE_ENABLED:
+            return cls.build_tree(include_approver_counts=include_approver_counts)
+
+        key = (
+            cls.TREE_WITH_COUNTS_CACHE_KEY
+            if include_approver_counts
+            else cls.TREE_CACHE_KEY
+        )
+        tree = cache.get(key)
+        if tree is None:
+            tree = cls.build_tree(include_approver_counts=include_approver_counts)
+            cache.set(key, tree, settings.ORG_TREE_CACHE_TIMEOUT)
+        return tree
+
+    @classmethod
+    def invalidate_tree_cache(cls, approver_counts_only=False):
+        """Drop the cached hierarchy so the next request rebuilds it"""
+        if approver_counts_only:
+            cache.delete(cls.TREE_WITH_COUNTS_CACHE_KEY)
+        else:
+            cache.delete_many([cls.TREE_CACHE_KEY, cls.TREE_WITH_COUNTS_CACHE_KEY])
+
     def get_hierarchy_path(self):
         """
         Returns the full path of units from root to this unit
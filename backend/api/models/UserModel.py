@@ -1,10 +1,12 @@
+import hashlib
+
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin,
 )
 from django.db import models
-from utils import signature_upload_path
+from utils import signature_print_upload_path, signature_upload_path
 
 from .ModelConstants import BaseModel, RoleChoices
 
@@ -92,6 +94,18 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     )
     has_signature = models.BooleanField(default=False)
 
+    # print-ready (cropped, 2in wide, 1-bit PNG) copy of the signature
+    # this is what gets embedded into generated PDFs
+    signature_print = models.ImageField(
+        upload_to=signature_print_upload_path, null=True, blank=True
+    )
+
+    # bumped on every signature upload
+    signature_version = models.PositiveIntegerField(default=0)
+
+    # sha256 of signature_print, names its local copies (SignatureFileCache)
+    signature_print_digest = models.CharField(max_length=64, blank=True, default="")
+
     objects = CustomUserManager()
 
     # required fields for Django auth to work
@@ -110,6 +124,42 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
             self.personal_id = self._generate_unique_personal_id()
         super().save(*args, **kwargs)
 
+    def set_signature_print(self, content):
+        """
+        Store a new print-ready signature, without saving the row
+
+        Replaces the previous derivative instead of piling up suffixed
+        copies, records its digest and bumps signature_version.
+
+        Args:
+            content: ContentFile with the PNG built by normalize_signature
+        """
+        content.seek(0)
+        self.signature_print_digest = hashlib.sha256(content.read()).hexdigest()
+        content.seek(0)
+        if self.signature_print:
+            self.signature_print.delete(save=False)
+        self.signature_print.save("signature_print.png", content, save=False)
+        self.signature_version += 1
+
+    def get_approver_roles(self):
+        """
+        Get this user's active approver roles with their units
+
+        Users loaded from the session come with the list preloaded by
+        CachedModelBackend, otherwise it is loaded once per instance.
+
+        Returns:
+            List of active UnitApprover objects, oldest first
+        """
+        if not hasattr(self, "approver_roles"):
+            self.approver_roles = list(
+                self.unit_approver_roles.filter(is_active=True)
+                .select_related("unit")
+                .order_by("id")
+            )
+        return self.approver_roles
+
     def _generate_unique_personal_id(self):
         """
         Generate a unique 7-digit personal ID
@@ -125,5 +175,37 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
             if not User.objects.filter(personal_id=personal_id).exists():
                 return personal_id
 
+    @classmethod
+    def allocate_personal_ids(cls, count):
+        """
+        Reserve unused 7-digit personal IDs for users created in bulk
+
+        bulk_create skips save(), so bulk inserts take their IDs from here.
+        Candidates are drawn in one set and checked against the table with a
+        single query per round instead of one exists() per ID.
+
+        Args:
+            count: Number of IDs needed
+
+        Returns:
+            List of distinct personal ID strings not used by any user
+        """
+        import random
+
+        allocated = set()
+        while len(allocated) < count:
+            candidates = set()
+            while len(candidates) < count - len(allocated):
+                candidate = str(random.randint(1000000, 9999999))
+                if candidate not in allocated:
+                    candidates.add(candidate)
+            taken = set(
+                cls.objects.filter(personal_id__in=candidates).values_list(
+                    "personal_id", flat=True
+                )
+            )
+            allocated |= candidates - taken
+        return list(allocated)
+
     def __str__(self):
         return self.username
@@ -5,6 +5,13 @@ from .FormModels import (
     FormSubmissionIdentifier,
     FormTemplate,
 )
+from .AnalyticsModels import (
+    ApprovalDecisionRollup,
+    ApprovalStepFact,
+    SubmissionStatusRollup,
+)
+from .CredentialModels import ApiCredential
+from .NotificationModels import Notification
 from .ModelConstants import RoleChoices, FormStatusChoices, BaseModel
 from .OrganizationalModels import ApprovalDelegation, OrganizationalUnit, UnitApprover
 from .UserModel import CustomUserManager, User
@@ -20,6 +27,11 @@ __all__ = [
     "OrganizationalUnit",
     "UnitApprover",
     "ApprovalDelegation",
+    "ApiCredential",
+    "Notification",
+    "ApprovalDecisionRollup",
+    "ApprovalStepFact",
+    "SubmissionStatusRollup",
     "RoleChoices",
     "FormStatusChoices",
     "BaseModel",
@@ -1,4 +1,4 @@
-from .authSerializer import LoginSerializer, RegisterSerializer
+from .authSerializer import LoginSerializer, RegisterSerializer, ApiCredentialSerializer
 from .userSerializer import UserSerializer, UserDetailSerializer
 from .adminSerializer import AdminUserSerializer
 from .formSerializer import (
@@ -15,6 +15,7 @@ from .formSerializer import (
 __all__ = [
     "LoginSerializer",
     "RegisterSerializer",
+    "ApiCredentialSerializer",
     "UserSerializer",
     "UserDetailSerializer",
     "AdminUserSerializer",
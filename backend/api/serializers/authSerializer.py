@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from ..models import ApiCredential
+
 
 class LoginSerializer(serializers.Serializer):
     """
@@ -22,3 +24,20 @@ class RegisterSerializer(serializers.Serializer):
     firstName = serializers.CharField(required=True)
     lastName = serializers.CharField(required=True)
     phone = serializers.CharField(required=True)
+
+
+class ApiCredentialSerializer(serializers.ModelSerializer):
+    """Serializer for API keys, never exposes the key or its hash"""
+
+    class Meta:
+        model = ApiCredential
+        fields = [
+            "id",
+            "name",
+            "prefix",
+            "expires_at",
+            "revoked_at",
+            "last_used_at",
+            "created_at",
+        ]
+        read_only_fields = ["id", "prefix", "revoked_at", "last_used_at", "created_at"]
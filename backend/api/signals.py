@@ -0,0 +1,248 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .core.backends import invalidate_cached_user
+from .core.events import bus
+from .models import (
+    ApprovalDecisionRollup,
+    ApprovalStepFact,
+    FormApproval,
+    FormSubmission,
+    FormSubmissionIdentifier,
+    Notification,
+    OrganizationalUnit,
+    SubmissionStatusRollup,
+    UnitApprover,
+    User,
+)
+
+
+@receiver([post_save, post_delete], sender=OrganizationalUnit)
+def invalidate_unit_tree(sender, instance, **kwargs):
+    """Drop the cached organization tree when a unit changes"""
+    OrganizationalUnit.invalidate_tree_cache()
+
+
+@receiver([post_save, post_delete], sender=UnitApprover)
+def invalidate_unit_tree_approver_counts(sender, instance, **kwargs):
+    """Drop the cached approver counts when an approver assignment changes"""
+    OrganizationalUnit.invalidate_tree_cache(approver_counts_only=True)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Drop the cached session user when the user changes"""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UnitApprover)
+def invalidate_approver_user_cache(sender, instance, **kwargs):
+    """Drop the cached session user whose approver roles changed"""
+    invalidate_cached_user(instance.user_id)
+
+
+@receiver(post_save, sender=OrganizationalUnit)
+def invalidate_unit_approver_user_cache(sender, instance, created, **kwargs):
+    """Cached users carry their approver units, refresh them on unit changes"""
+    if created:
+        return
+    for user_id in instance.approvers.values_list("user_id", flat=True):
+        invalidate_cached_user(user_id)
+
+
+# FormSubmission fields the search document is built from, the identifier
+# and submitter names are refreshed by their own signals
+SEARCH_DOCUMENT_FIELDS = {
+    "form_data",
+    "submitter",
+    "submitter_id",
+    "form_template",
+    "form_template_id",
+}
+
+
+def _search_state(submission):
+    return (submission.form_data, submission.submitter_id, submission.form_template_id)
+
+
+@receiver(post_save, sender=FormSubmission)
+def refresh_submission_search_vector(
+    sender, instance, created, update_fields, **kwargs
+):
+    """
+    Keep the full-text document in step with the submission
+
+    Skipped for saves that leave its fields alone (status changes, step
+    bumps, PDF bookkeeping), judged by update_fields or else by the state
+    remember_submission_state read before the save.
+    """
+    if update_fields is not None and not SEARCH_DOCUMENT_FIELDS.intersection(
+        update_fields
+    ):
+        return
+    previous = getattr(instance, "_search_previous", None)
+    if not created and previous == _search_state(instance):
+        return
+    FormSubmission.refresh_search_vectors(FormSubmission.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=FormSubmissionIdentifier)
+def refresh_identifier_search_vector(sender, instance, **kwargs):
+    """The identifier is created after the submission, index it too"""
+    FormSubmission.refresh_search_vectors(
+        FormSubmission.objects.filter(pk=instance.form_submission_id)
+    )
+
+
+@receiver(post_save, sender=User)
+def refresh_submitter_search_vectors(
+    sender, instance, created, update_fields, **kwargs
+):
+    """Submitter names are part of the search document"""
+    if created:
+        return
+    if update_fields is not None and not {
+        "first_name",
+        "last_name",
+        "username",
+    }.intersection(update_fields):
+        return
+    FormSubmission.refresh_search_vectors(instance.form_submissions.all())
+
+
+def _submission_state(submission):
+    return (submission.status, submission.unit_id, submission.form_template_id)
+
+
+@receiver(pre_save, sender=FormSubmission)
+def remember_submission_state(sender, instance, update_fields=None, **kwargs):
+    """
+    Read the stored state before it is overwritten
+
+    Taken from the database rather than the instance, views often save a
+    copy of the submission that another save has already moved on. The
+    fields of the search document are only read when the save may change
+    them.
+    """
+    instance._rollup_previous = None
+    instance._search_previous = None
+    if instance.pk is None:
+        return
+    fields = ["status", "unit_id", "form_template_id"]
+    if update_fields is None or SEARCH_DOCUMENT_FIELDS.intersection(update_fields):
+        fields += ["form_data", "submitter_id"]
+    stored = FormSubmission.objects.filter(pk=instance.pk).values_list(*fields).first()
+    if stored is None:
+        return
+    instance._rollup_previous = stored[:3]
+    if len(stored) > 3:
+        instance._search_previous = (stored[3], stored[4], stored[2])
+
+
+@receiver(post_save, sender=FormSubmission)
+def roll_up_submission_status(sender, instance, **kwargs):
+    """Count status transitions in SubmissionStatusRollup"""
+    SubmissionStatusRollup.record_transition(
+        getattr(instance, "_rollup_previous", None), _submission_state(instance)
+    )
+
+
+@receiver(post_delete, sender=FormSubmission)
+def roll_up_submission_delete(sender, instance, **kwargs):
+    SubmissionStatusRollup.record_transition(_submission_state(instance), None)
+
+
+@receiver(pre_save, sender=FormApproval)
+def remember_approval_decision(sender, instance, **kwargs):
+    instance._rollup_previous_decision = None
+    instance._previous_approver_id = None
+    if instance.pk is not None:
+        instance._rollup_previous_decision, instance._previous_approver_id = (
+            FormApproval.objects.filter(pk=instance.pk)
+            .values_list("decision", "approver_id")
+            .first()
+        ) or (None, None)
+
+
+def _newly_decided(approval):
+    decisions = ApprovalDecisionRollup.DECISIONS
+    return approval.decision in decisions and (
+        getattr(approval, "_rollup_previous_decision", None) not in decisions
+    )
+
+
+@receiver(post_save, sender=FormApproval)
+def roll_up_approval_decision(sender, instance, **kwargs):
+    """Count an approval in ApprovalDecisionRollup the first time it is decided"""
+    if not _newly_decided(instance):
+        return
+    submission = instance.form_submission
+    ApprovalDecisionRollup.record_decision(
+        instance, submission.unit_id, submission.form_template_id
+    )
+
+
+@receiver(post_save, sender=FormApproval)
+def record_approval_step(sender, instance, **kwargs):
+    """Store the step's turnaround in ApprovalStepFact when it is decided"""
+    if _newly_decided(instance):
+        ApprovalStepFact.record(instance, instance.form_submission)
+
+
+@receiver(post_save, sender=FormApproval)
+def notify_approver(sender, instance, **kwargs):
+    """Queue a notification when an open approval gets a (new) approver"""
+    if instance.decision:
+        return
+    if getattr(instance, "_previous_approver_id", None) == instance.approver_id:
+        return
+    Notification.approval_requested(instance)
+
+
+@receiver(post_save, sender=FormSubmission)
+def notify_submitter(sender, instance, **kwargs):
+    """Queue a notification when a submission is approved, rejected or returned"""
+    previous = getattr(instance, "_rollup_previous", None)
+    if previous and previous[0] == instance.status:
+        return
+    Notification.submission_decided(instance)
+
+
+@receiver(post_save, sender=FormApproval)
+def publish_approval_assignment(sender, instance, **kwargs):
+    """Push inbox changes to the approvers' event streams"""
+    if instance.decision:
+        return
+    previous_approver_id = getattr(instance, "_previous_approver_id", None)
+    if previous_approver_id == instance.approver_id:
+        return
+    data = {
+        "approval_id": instance.pk,
+        "form_submission_id": instance.form_submission_id,
+    }
+    bus.publish("approval_assigned", [instance.approver_id], data)
+    if previous_approver_id:
+        bus.publish("approval_removed", [previous_approver_id], data)
+
+
+@receiver(post_save, sender=FormSubmission)
+def publish_submission_status(sender, instance, created, **kwargs):
+    """Push status changes to the submitter and the submission's approvers"""
+    previous = getattr(instance, "_rollup_previous", None)
+    previous_status = previous[0] if previous else None
+    if previous_status == instance.status:
+        return
+    approver_ids = (
+        []
+        if created
+        else list(instance.approvals.values_list("approver_id", flat=True))
+    )
+    bus.publish(
+        "submission_status",
+        [instance.submitter_id, *approver_ids],
+        {
+            "form_submission_id": instance.pk,
+            "status": instance.status,
+            "previous_status": previous_status,
+        },
+    )
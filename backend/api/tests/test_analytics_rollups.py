@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from api.models import FormTemplate, SubmissionStatusRollup
+
+
+class RollupBucketTests(TestCase):
+    """Rollup buckets without a unit, see _unit_key"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+
+    def test_transitions_without_unit_share_a_bucket(self):
+        day = date(2026, 3, 2)
+        for _ in range(3):
+            SubmissionStatusRollup.record_transition(
+                None, ("pending", None, self.template.pk), day=day
+            )
+
+        bucket = SubmissionStatusRollup.objects.get(day=day, unit=None)
+        self.assertEqual(bucket.entered, 3)
+
+    def test_bucket_without_unit_is_unique(self):
+        bucket = {
+            "day": date(2026, 3, 2),
+            "unit": None,
+            "form_template": self.template,
+            "status": "pending",
+        }
+        SubmissionStatusRollup.objects.create(**bucket)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            SubmissionStatusRollup.objects.create(**bucket)
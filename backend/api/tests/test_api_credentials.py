@@ -0,0 +1,63 @@
+import base64
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import ApiCredential, User
+
+
+class ApiCredentialTests(TestCase):
+    """Issuing and revoking API keys, see ApiCredentialViewSet"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            "integration", "integration@example.edu", password="s3cret-pass"
+        )
+        cls.credential, cls.raw_key = ApiCredential.issue(cls.user, "existing")
+
+    def session_client(self):
+        client = APIClient()
+        client.force_login(self.user)
+        return client
+
+    def api_key_client(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Api-Key {self.raw_key}")
+        return client
+
+    def basic_client(self):
+        client = APIClient()
+        token = base64.b64encode(b"integration:s3cret-pass").decode()
+        client.credentials(HTTP_AUTHORIZATION=f"Basic {token}")
+        return client
+
+    def test_session_creates_and_revokes(self):
+        client = self.session_client()
+        response = client.post("/api/auth/api-keys/", {"name": "new"})
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNotNone(ApiCredential.verify(response.data["key"]))
+
+        response = client.post(f"/api/auth/api-keys/{self.credential.id}/revoke/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(ApiCredential.verify(self.raw_key))
+
+    def test_api_key_cannot_create_or_revoke(self):
+        client = self.api_key_client()
+        response = client.post("/api/auth/api-keys/", {"name": "minted"})
+        self.assertEqual(response.status_code, 403)
+        response = client.post(f"/api/auth/api-keys/{self.credential.id}/revoke/")
+        self.assertEqual(response.status_code, 403)
+
+        self.assertFalse(ApiCredential.objects.filter(name="minted").exists())
+        self.assertIsNotNone(ApiCredential.verify(self.raw_key))
+
+    def test_basic_auth_cannot_create(self):
+        response = self.basic_client().post("/api/auth/api-keys/", {"name": "minted"})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ApiCredential.objects.filter(name="minted").exists())
+
+    def test_api_key_can_list(self):
+        response = self.api_key_client().get("/api/auth/api-keys/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data], [self.credential.id])
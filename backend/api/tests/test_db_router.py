@@ -0,0 +1,150 @@
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.core import db_router
+from api.core.db_router import ReplicaPinningMiddleware
+from api.models import User
+
+
+@skipUnless("replica_1" in settings.DATABASES, "needs DB_REPLICA_HOSTS for a replica_1")
+@override_settings(REPLICA_DATABASES=["replica_1"])
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """
+    Base for the routing tests
+
+    TestCase wraps every test in a transaction, which by itself keeps reads
+    on the primary, so these run as TransactionTestCase. replica_1 is a test
+    mirror of default and sees the committed rows.
+    """
+
+    databases = {"default", "replica_1"}
+
+    def setUp(self):
+        self.user = User.objects.create_user("reader", "reader@example.edu")
+        # the write above pinned this context, start every test unpinned
+        use_primary_token = db_router._use_primary.set(False)
+        wrote_token = db_router._wrote.set(False)
+        self.addCleanup(db_router._wrote.reset, wrote_token)
+        self.addCleanup(db_router._use_primary.reset, use_primary_token)
+
+    def assertReadsFrom(self, alias, read):
+        """Run read() and check it queried alias and only alias"""
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica_1"]) as replica:
+                read()
+        queries = {"default": len(primary), "replica_1": len(replica)}
+        other = "replica_1" if alias == "default" else "default"
+        self.assertGreater(queries[alias], 0, queries)
+        self.assertEqual(queries[other], 0, queries)
+
+
+class PrimaryReplicaRouterTests(ReplicaRoutingTestCase):
+    def test_reads_go_to_replica(self):
+        self.assertReadsFrom("replica_1", lambda: User.objects.get(username="reader"))
+
+    def test_reads_in_atomic_block_go_to_primary(self):
+        with transaction.atomic():
+            self.assertReadsFrom("default", lambda: User.objects.get(username="reader"))
+        # and back to the replica once the block is left
+        self.assertReadsFrom("replica_1", lambda: User.objects.get(username="reader"))
+
+    def test_reads_after_write_go_to_primary(self):
+        User.objects.create_user("writer", "writer@example.edu")
+        self.assertReadsFrom("default", lambda: User.objects.get(username="writer"))
+
+    def test_pin_to_primary(self):
+        db_router.pin_to_primary()
+        self.assertReadsFrom("default", lambda: User.objects.get(username="reader"))
+
+    def test_writes_go_to_primary(self):
+        with CaptureQueriesContext(connections["replica_1"]) as replica:
+            User.objects.filter(pk=self.user.pk).update(first_name="Ana")
+        self.assertEqual(len(replica), 0)
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_reads_stay_on_primary_without_replicas(self):
+        self.assertReadsFrom("default", lambda: User.objects.get(username="reader"))
+
+
+class ReplicaPinningMiddlewareTests(ReplicaRoutingTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.read_from = None
+
+    def view(self, write=False, save_session=False):
+        """A get_response reading the user, optionally writing first"""
+
+        def get_response(request):
+            if write:
+                User.objects.filter(pk=self.user.pk).update(first_name="Ana")
+            if save_session:
+                SessionStore().save()
+            self.read_from = User.objects.filter(pk=self.user.pk).db
+            return HttpResponse()
+
+        return get_response
+
+    def assertPinCookie(self, response, expected):
+        cookie = response.cookies.get(settings.REPLICA_PIN_COOKIE)
+        if not expected:
+            self.assertIsNone(cookie)
+            return
+        self.assertIsNotNone(cookie)
+        self.assertEqual(cookie["max-age"], settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie["httponly"])
+
+    def test_get_reads_from_replica(self):
+        response = ReplicaPinningMiddleware(self.view())(self.factory.get("/"))
+        self.assertEqual(self.read_from, "replica_1")
+        self.assertPinCookie(response, False)
+
+    def test_post_reads_from_primary_and_sets_cookie(self):
+        response = ReplicaPinningMiddleware(self.view())(self.factory.post("/"))
+        self.assertEqual(self.read_from, "default")
+        self.assertPinCookie(response, True)
+
+    def test_cookie_pins_reads_to_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = "1"
+        response = ReplicaPinningMiddleware(self.view())(request)
+        self.assertEqual(self.read_from, "default")
+        # reading does not refresh the pin, the client drifts back
+        self.assertPinCookie(response, False)
+
+    def test_get_that_writes_sets_cookie(self):
+        response = ReplicaPinningMiddleware(self.view(write=True))(
+            self.factory.get("/")
+        )
+        self.assertEqual(self.read_from, "default")
+        self.assertPinCookie(response, True)
+
+    def test_session_save_does_not_set_cookie(self):
+        response = ReplicaPinningMiddleware(self.view(save_session=True))(
+            self.factory.get("/")
+        )
+        self.assertPinCookie(response, False)
+
+    def test_pin_ends_with_the_request(self):
+        ReplicaPinningMiddleware(self.view())(self.factory.post("/"))
+        self.assertReadsFrom("replica_1", lambda: User.objects.get(username="reader"))
+
+    def test_async_request(self):
+        async def get_response(request):
+            self.read_from = User.objects.filter(pk=self.user.pk).db
+            return HttpResponse()
+
+        middleware = ReplicaPinningMiddleware(get_response)
+        response = async_to_sync(middleware)(self.factory.post("/"))
+        self.assertEqual(self.read_from, "default")
+        self.assertPinCookie(response, True)
+
+        async_to_sync(middleware)(self.factory.get("/"))
+        self.assertEqual(self.read_from, "replica_1")
@@ -0,0 +1,98 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import FormApprovalWorkflow, FormSubmission, FormTemplate, User
+
+
+class FormDataFilterTests(TestCase):
+    """form_data filters on the submission list, see FormSubmissionViewSet"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+        FormApprovalWorkflow.objects.create(
+            form_template=cls.template,
+            approver_role="staff",
+            approval_position="Department Chair",
+            order=1,
+        )
+        cls.student = User.objects.create_user("student", "student@example.edu")
+        cls.approver = User.objects.create_user(
+            "approver", "approver@example.edu", role="staff"
+        )
+
+        def submission(status, current_step, student_id):
+            return FormSubmission.objects.create(
+                form_template=cls.template,
+                submitter=cls.student,
+                form_data={"student_id": student_id, "season": "Fall"},
+                status=status,
+                current_step=current_step,
+            )
+
+        cls.awaiting = submission("pending", 1, "1234567")
+        # same student, but nothing an approver has to act on
+        cls.draft = submission("draft", 0, "1234567")
+        cls.other_student = submission("pending", 1, "7654321")
+
+    def list_ids(self, user, **params):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get("/api/forms/submission/", params)
+        self.assertEqual(response.status_code, 200)
+        return {row["id"] for row in response.data}
+
+    def test_approver_finds_submission_awaiting_their_role(self):
+        self.assertEqual(
+            self.list_ids(
+                self.approver, scope="awaiting", form_data__student_id="1234567"
+            ),
+            {self.awaiting.id},
+        )
+        self.assertEqual(
+            self.list_ids(
+                self.approver, scope="awaiting", form_data__season__in="Fall,Spring"
+            ),
+            {self.awaiting.id, self.other_student.id},
+        )
+
+    def test_filters_only_narrow_the_scope(self):
+        for user in (self.approver, self.student):
+            for scope in ({}, {"scope": "mine"}, {"scope": "awaiting"}):
+                with self.subTest(user=user.username, **scope):
+                    unfiltered = self.list_ids(user, **scope)
+                    filtered = self.list_ids(
+                        user, form_data__student_id="1234567", **scope
+                    )
+                    self.assertLessEqual(filtered, unfiltered)
+
+    def test_unfiltered_list_shows_own_submissions_only(self):
+        self.assertEqual(self.list_ids(self.approver), set())
+        self.assertEqual(
+            self.list_ids(self.student),
+            {self.awaiting.id, self.draft.id, self.other_student.id},
+        )
+        self.assertEqual(
+            self.list_ids(self.approver, scope="awaiting"),
+            {self.awaiting.id, self.other_student.id},
+        )
+
+    def test_submitter_filters_own_submissions(self):
+        self.assertEqual(
+            self.list_ids(self.student, form_data__student_id__startswith="123"),
+            {self.awaiting.id, self.draft.id},
+        )
+
+    def test_invalid_filter_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.approver)
+        response = client.get(
+            "/api/forms/submission/", {"form_data__student_id__regex": ".*"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = client.get("/api/forms/submission/", {"scope": "everything"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.models import Notification, User
+
+
+class BouncingBackend(locmem.EmailBackend):
+    """locmem backend failing for addresses starting with "bounce" """
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any(address.startswith("bounce") for address in message.to):
+                raise ConnectionError("550 mailbox unavailable")
+        return super().send_messages(messages)
+
+
+class UnreachableBackend(locmem.EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError("connection refused")
+
+
+class RecordingBackend(locmem.EmailBackend):
+    """locmem backend noting how deep in transactions each send ran"""
+
+    atomic_depths = []
+
+    def send_messages(self, messages):
+        self.atomic_depths.append(len(connections["default"].atomic_blocks))
+        return super().send_messages(messages)
+
+
+@override_settings(
+    NOTIFICATION_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    NOTIFICATION_MAX_ATTEMPTS=3,
+)
+class NotificationDispatchTests(TestCase):
+    """Queueing and delivering notifications, see Notification.dispatch"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user("student", "student@example.edu")
+        cls.chair = User.objects.create_user("chair", "chair@example.edu", role="staff")
+
+    def notify(self, recipient, subject="Graduate Petition Form approved"):
+        return Notification.enqueue(
+            recipient,
+            Notification.Event.SUBMISSION_APPROVED,
+            subject,
+            f"Your {subject}.",
+        )
+
+    def test_recipient_notifications_sent_as_one_message(self):
+        for index in range(3):
+            self.notify(self.student, f"Form {index} approved")
+        self.notify(self.chair)
+
+        self.assertEqual(Notification.dispatch(), (2, 0))
+
+        self.assertEqual(len(mail.outbox), 2)
+        to_student = next(m for m in mail.outbox if m.to == [self.student.email])
+        self.assertEqual(to_student.subject, "3 form updates")
+        for index in range(3):
+            self.assertIn(f"Form {index} approved", to_student.body)
+        self.assertFalse(Notification.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(Notification.dispatch(), (0, 0))
+
+    def test_batch_size_limits_recipients_per_call(self):
+        self.notify(self.student)
+        self.notify(self.chair)
+
+        self.assertEqual(Notification.dispatch(batch_size=1), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Notification.dispatch(batch_size=1), (1, 0))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_only_due_notifications_are_sent(self):
+        self.notify(self.student, "Due now")
+        later = self.notify(self.student, "Due later")
+        later.available_at = timezone.now() + timedelta(hours=1)
+        later.save()
+
+        self.assertEqual(Notification.dispatch(), (1, 0))
+        self.assertEqual(mail.outbox[0].subject, "Due now")
+        later.refresh_from_db()
+        self.assertIsNone(later.sent_at)
+
+        self.assertEqual(Notification.dispatch(now=later.available_at), (1, 0))
+        self.assertEqual(mail.outbox[1].subject, "Due later")
+
+    def test_hourly_digest_waits_for_the_hour(self):
+        self.student.notification_preferences = {"digest": "hourly"}
+        self.student.save()
+        first = self.notify(self.student, "First")
+        self.notify(self.student, "Second")
+
+        top_of_hour = timezone.now().replace(
+            minute=0, second=0, microsecond=0
+        ) + timedelta(hours=1)
+        self.assertEqual(first.available_at, top_of_hour)
+        self.assertEqual(Notification.dispatch(), (0, 0))
+
+        self.assertEqual(Notification.dispatch(now=top_of_hour), (1, 0))
+        self.assertEqual(mail.outbox[0].subject, "2 form updates")
+
+    @override_settings(NOTIFICATION_DIGEST_HOUR=8, TIME_ZONE="UTC")
+    def test_daily_digest_goes_out_at_digest_hour(self):
+        morning = timezone.make_aware(datetime(2026, 3, 2, 7, 30))
+        evening = timezone.make_aware(datetime(2026, 3, 2, 18, 0))
+        self.assertEqual(
+            Notification.next_delivery("daily", morning),
+            timezone.make_aware(datetime(2026, 3, 2, 8, 0)),
+        )
+        self.assertEqual(
+            Notification.next_delivery("daily", evening),
+            timezone.make_aware(datetime(2026, 3, 3, 8, 0)),
+        )
+
+    def test_muted_events_are_not_queued(self):
+        self.student.notification_preferences = {"muted": ["submission_approved"]}
+        self.student.save()
+        self.assertIsNone(self.notify(self.student))
+        self.assertIsNotNone(
+            Notification.enqueue(
+                self.student,
+                Notification.Event.SUBMISSION_RETURNED,
+                "Graduate Petition Form returned",
+                "Your form was returned.",
+            )
+        )
+
+        self.chair.notification_preferences = {"email": False}
+        self.chair.save()
+        self.assertIsNone(self.notify(self.chair))
+
+        self.assertEqual(Notification.dispatch(), (1, 0))
+        self.assertEqual(mail.outbox[0].subject, "Graduate Petition Form returned")
+
+    @override_settings(NOTIFICATION_EMAIL_BACKEND=f"{__name__}.BouncingBackend")
+    def test_failed_delivery_backs_off(self):
+        bouncing = User.objects.create_user("bouncing", "bounce@example.edu")
+        notification = self.notify(bouncing)
+        self.notify(self.student)
+        now = timezone.now()
+
+        self.assertEqual(Notification.dispatch(now=now), (1, 1))
+        notification.refresh_from_db()
+        self.assertEqual(notification.attempts, 1)
+        self.assertIn("550", notification.last_error)
+        self.assertEqual(notification.available_at, now + timedelta(minutes=2))
+
+        # not retried before the backoff runs out, then twice as long
+        self.assertEqual(Notification.dispatch(now=now + timedelta(minutes=1)), (0, 0))
+        retry_at = now + timedelta(minutes=2)
+        self.assertEqual(Notification.dispatch(now=retry_at), (0, 1))
+        notification.refresh_from_db()
+        self.assertEqual(notification.attempts, 2)
+        self.assertEqual(notification.available_at, retry_at + timedelta(minutes=4))
+
+        # given up after NOTIFICATION_MAX_ATTEMPTS
+        retry_at += timedelta(minutes=4)
+        self.assertEqual(Notification.dispatch(now=retry_at), (0, 1))
+        self.assertEqual(
+            Notification.dispatch(now=retry_at + timedelta(days=1)), (0, 0)
+        )
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(NOTIFICATION_EMAIL_BACKEND=f"{__name__}.UnreachableBackend")
+    def test_unreachable_backend_releases_claim(self):
+        notification = self.notify(self.student)
+
+        with self.assertRaises(ConnectionRefusedError):
+            Notification.dispatch()
+
+        claimed = Notification.objects.get(pk=notification.pk)
+        self.assertEqual(claimed.available_at, notification.available_at)
+        self.assertEqual(claimed.attempts, 0)
+
+    @override_settings(NOTIFICATION_EMAIL_BACKEND=f"{__name__}.RecordingBackend")
+    def test_sends_outside_the_claim_transaction(self):
+        self.notify(self.student)
+        self.notify(self.chair)
+        RecordingBackend.atomic_depths = []
+        depth = len(connections["default"].atomic_blocks)
+
+        self.assertEqual(Notification.dispatch(), (2, 0))
+        self.assertEqual(RecordingBackend.atomic_depths, [depth, depth])
+
+    def test_claimed_notifications_come_due_again(self):
+        # a dispatcher that died after claiming never marked the row
+        notification = self.notify(self.student)
+        now = timezone.now()
+        Notification._claim(batch_size=10, now=now)
+
+        self.assertEqual(Notification.dispatch(now=now), (0, 0))
+        claimed = Notification.objects.get(pk=notification.pk)
+        self.assertEqual(
+            claimed.available_at,
+            now + timedelta(seconds=settings.NOTIFICATION_CLAIM_SECONDS),
+        )
+        self.assertEqual(Notification.dispatch(now=claimed.available_at), (1, 0))
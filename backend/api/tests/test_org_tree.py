@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from api.models import OrganizationalUnit
+
+
+class OrganizationTreeCacheTests(TestCase):
+    """OrganizationalUnit.get_tree and its cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.college = OrganizationalUnit.objects.create(
+            name="Natural Sciences", code="NS", level=0
+        )
+        OrganizationalUnit.objects.create(
+            name="Mathematics", code="MATH", level=1, parent=cls.college
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def rename(self, name):
+        # a write whose signal ran in another worker, so it cleared nothing here
+        OrganizationalUnit.objects.filter(pk=self.college.pk).update(name=name)
+
+    @override_settings(ORG_TREE_CACHE_ENABLED=False)
+    def test_not_cached_without_shared_cache(self):
+        self.assertEqual(OrganizationalUnit.get_tree()[0]["name"], "Natural Sciences")
+        self.rename("Science")
+        self.assertEqual(OrganizationalUnit.get_tree()[0]["name"], "Science")
+
+    @override_settings(ORG_TREE_CACHE_ENABLED=True)
+    def test_cached_with_shared_cache_until_a_unit_changes(self):
+        tree = OrganizationalUnit.get_tree()
+        self.assertEqual(tree[0]["children"][0]["code"], "MATH")
+        self.rename("Science")
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                OrganizationalUnit.get_tree()[0]["name"], "Natural Sciences"
+            )
+
+        self.college.name = "Sciences"
+        self.college.save()
+        self.assertEqual(OrganizationalUnit.get_tree()[0]["name"], "Sciences")
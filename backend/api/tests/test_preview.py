@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.core.preview import PreviewCoalescer
+from api.models import FormTemplate, User
+
+
+@override_settings(PREVIEW_RENDER_BACKEND="latex", PREVIEW_DEBOUNCE_SECONDS=30)
+class SyncPreviewTests(TestCase):
+    """FormSubmissionViewSet.preview coalescing without a debounce wait"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+        cls.student = User.objects.create_user("student", "student@example.edu")
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def preview(self, render):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        with mock.patch(
+            "api.views.forms.form_submission.FormPDFGenerator"
+        ) as generator:
+            generator.return_value.generate_template_form.side_effect = render
+            return client.post(
+                "/api/forms/submission/preview/",
+                {
+                    "form_template": {
+                        "form_template": self.template.id,
+                        "form_data": {"student_id": "1234567"},
+                    }
+                },
+                format="json",
+            )
+
+    def test_compiles_without_waiting(self):
+        started = time.monotonic()
+        response = self.preview(lambda *args, **kwargs: ContentFile(b"%PDF-1.4"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_newer_preview_supersedes_running_compile(self):
+        def render(*args, is_stale, **kwargs):
+            # a newer preview of the same user arrives while this compiles
+            PreviewCoalescer(self.student.id).claim()
+            self.assertTrue(is_stale())
+            return ContentFile(b"%PDF-1.4")
+
+        response = self.preview(render)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(response.data["superseded"])
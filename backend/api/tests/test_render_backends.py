@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+from utils import RenderUnavailable
+from utils.render_backends import LatexBackend
+
+
+@override_settings(
+    LATEX_BREAKER_FAILURES=3,
+    LATEX_BREAKER_SLOW_SECONDS=20,
+    LATEX_BREAKER_RESET_SECONDS=60,
+)
+class LatexBreakerTests(SimpleTestCase):
+    """Which failed compiles count against the LaTeX circuit breaker"""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.backend = LatexBackend()
+
+    def compile(self, content, result):
+        with mock.patch.object(LatexBackend, "_compile", return_value=result):
+            return self.backend.compile(content)
+
+    def test_document_failures_are_not_counted(self):
+        for index in range(10):
+            self.compile(f"broken {index}", (None, LatexBackend.DOCUMENT_FAILED))
+        self.assertEqual(self.backend.breaker.stats()["state"], "closed")
+        self.assertEqual(self.backend.breaker.stats()["failures"], 0)
+
+    def test_setup_failures_trip_the_breaker(self):
+        for index in range(3):
+            self.compile(f"form {index}", (None, LatexBackend.UNAVAILABLE))
+        with self.assertRaises(RenderUnavailable):
+            self.compile("form", (ContentFile(b"%PDF-1.4"), None))
+
+    def test_one_document_timing_out_is_counted_once(self):
+        for _ in range(10):
+            self.compile("\\loop", (None, LatexBackend.TIMED_OUT))
+        self.assertEqual(self.backend.breaker.stats()["state"], "closed")
+        self.assertEqual(self.backend.breaker.stats()["failures"], 1)
+
+    def test_many_documents_timing_out_trip_the_breaker(self):
+        for index in range(3):
+            self.compile(f"form {index}", (None, LatexBackend.TIMED_OUT))
+        self.assertEqual(self.backend.breaker.stats()["state"], "open")
+
+    def test_exception_counts_as_setup_failure(self):
+        for _ in range(3):
+            with mock.patch.object(LatexBackend, "_compile", side_effect=OSError):
+                with self.assertRaises(OSError):
+                    self.backend.compile("form")
+        self.assertEqual(self.backend.breaker.stats()["state"], "open")
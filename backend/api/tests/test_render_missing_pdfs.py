@@ -0,0 +1,117 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from utils import RenderUnavailable
+
+from api.models import FormSubmission, FormTemplate, User
+
+
+@override_settings(PDF_RENDER_RETRY_MINUTES=15, PDF_RENDER_MAX_ATTEMPTS=3)
+class RenderMissingPdfsTests(TestCase):
+    """render_missing_pdfs and FormSubmission.pdf_render_due"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+        cls.student = User.objects.create_user("student", "student@example.edu")
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def submission(self, attempts=0, failed_minutes_ago=None):
+        return FormSubmission.objects.create(
+            form_template=self.template,
+            submitter=self.student,
+            form_data={"student_id": "1234567"},
+            status="pending",
+            current_step=1,
+            pdf_render_attempts=attempts,
+            pdf_render_failed_at=(
+                timezone.now() - timedelta(minutes=failed_minutes_ago)
+                if failed_minutes_ago is not None
+                else None
+            ),
+        )
+
+    def render(self, result, *args):
+        """Run the command with generate_signed_form returning result"""
+        with mock.patch(
+            "api.management.commands.render_missing_pdfs.FormPDFGenerator"
+        ) as generator:
+            render = generator.return_value.generate_signed_form
+            if isinstance(result, Exception):
+                render.side_effect = result
+            else:
+                render.return_value = result
+            call_command(
+                "render_missing_pdfs", *args, stdout=StringIO(), stderr=StringIO()
+            )
+        return render
+
+    def test_due_backs_off_and_gives_up(self):
+        fresh = self.submission()
+        waiting = self.submission(attempts=1, failed_minutes_ago=10)
+        retry = self.submission(attempts=1, failed_minutes_ago=20)
+        doubled = self.submission(attempts=2, failed_minutes_ago=20)
+        second_retry = self.submission(attempts=2, failed_minutes_ago=31)
+        given_up = self.submission(attempts=3, failed_minutes_ago=10_000)
+
+        due = list(FormSubmission.pdf_render_due())
+        self.assertEqual(due, [fresh, retry, second_retry])
+        for submission in (waiting, doubled, given_up):
+            self.assertNotIn(submission, due)
+
+    def test_failed_render_is_counted(self):
+        submission = self.submission()
+        self.render(None)
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.pdf_render_attempts, 1)
+        self.assertIsNotNone(submission.pdf_render_failed_at)
+
+        # backing off, the next run leaves it alone
+        render = self.render(None)
+        render.assert_not_called()
+        submission.refresh_from_db()
+        self.assertEqual(submission.pdf_render_attempts, 1)
+
+    def test_open_breaker_is_not_counted(self):
+        submission = self.submission()
+        self.render(RenderUnavailable(30))
+
+        submission.refresh_from_db()
+        self.assertEqual(submission.pdf_render_attempts, 0)
+        self.assertIsNone(submission.pdf_render_failed_at)
+
+    def test_rendered_pdf_resets_attempts(self):
+        submission = self.submission(attempts=1, failed_minutes_ago=20)
+        self.render(ContentFile(b"%PDF-1.4", name="form.pdf"))
+
+        submission.refresh_from_db()
+        self.assertTrue(submission.current_pdf)
+        self.assertEqual(submission.pdf_render_attempts, 0)
+        self.assertIsNone(submission.pdf_render_failed_at)
+        self.assertFalse(FormSubmission.missing_pdf().exists())
+
+    def test_retry_failed_includes_given_up(self):
+        given_up = self.submission(attempts=3, failed_minutes_ago=10)
+        self.render(None).assert_not_called()
+
+        self.render(ContentFile(b"%PDF-1.4", name="form.pdf"), "--retry-failed")
+        given_up.refresh_from_db()
+        self.assertTrue(given_up.current_pdf)
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.contrib.postgres.search import SearchQuery
+from django.test import TestCase
+
+from api.models import FormSubmission, FormTemplate, User
+
+
+class SearchVectorRefreshTests(TestCase):
+    """When saving a submission refreshes its search_vector, see api.signals"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+        cls.student = User.objects.create_user("student", "student@example.edu")
+
+    def setUp(self):
+        self.submission = FormSubmission.objects.create(
+            form_template=self.template,
+            submitter=self.student,
+            form_data={"petition_explanation": "extension for thesis"},
+            status="pending",
+            current_step=1,
+        )
+
+    def matches(self, text):
+        return FormSubmission.objects.filter(
+            pk=self.submission.pk,
+            search_vector=SearchQuery(text, config=FormSubmission.SEARCH_CONFIG),
+        ).exists()
+
+    def refreshes(self, save):
+        with mock.patch.object(
+            FormSubmission,
+            "refresh_search_vectors",
+            wraps=FormSubmission.refresh_search_vectors,
+        ) as refresh:
+            save()
+        return refresh.called
+
+    def test_created_submission_is_indexed(self):
+        self.assertTrue(self.matches("thesis"))
+
+    def test_bookkeeping_saves_skip_the_refresh(self):
+        self.submission.status = "approved"
+        self.assertFalse(
+            self.refreshes(
+                lambda: self.submission.save(update_fields=["status", "updated_at"])
+            )
+        )
+        self.submission.current_step = 2
+        self.assertFalse(self.refreshes(self.submission.save))
+
+    def test_changed_form_data_is_indexed(self):
+        self.submission.form_data = {"petition_explanation": "leave of absence"}
+        self.assertTrue(self.refreshes(self.submission.save))
+        self.assertTrue(self.matches("absence"))
+        self.assertFalse(self.matches("thesis"))
+
+        self.submission.form_data = {"petition_explanation": "course overload"}
+        self.assertTrue(
+            self.refreshes(lambda: self.submission.save(update_fields=["form_data"]))
+        )
+        self.assertTrue(self.matches("overload"))
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from utils.signature_cache import SignatureFileCache
+
+from api.models import User
+
+
+class SignatureFileCacheTests(TestCase):
+    """Local copies of signature images, see SignatureFileCache"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.user = User.objects.create_user("chair", "chair@example.edu")
+        self.user.set_signature_print(ContentFile(b"first signature"))
+        self.user.save()
+
+    def cache(self, **kwargs):
+        return SignatureFileCache(directory=self.directory, **kwargs)
+
+    def age(self, path, seconds):
+        used_at = time.time() - seconds
+        os.utime(path, (used_at, used_at))
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_signature_print_is_read_once(self):
+        cache = self.cache()
+        path = cache.get_path(self.user, self.user.signature_print)
+        self.assertEqual(self.read(path), b"first signature")
+
+        os.remove(self.user.signature_print.path)
+        self.assertEqual(cache.get_path(self.user, self.user.signature_print), path)
+
+    def test_file_replaced_under_the_same_name_is_not_served_stale(self):
+        cache = self.cache()
+        first = cache.get_path(self.user, self.user.signature_print)
+        name = self.user.signature_print.name
+        version = self.user.signature_version
+
+        self.user.set_signature_print(ContentFile(b"second signature"))
+        self.user.signature_version = version
+        self.user.save()
+        self.assertEqual(self.user.signature_print.name, name)
+
+        second = cache.get_path(self.user, self.user.signature_print)
+        self.assertNotEqual(second, first)
+        self.assertEqual(self.read(second), b"second signature")
+
+    def test_recently_used_files_are_kept(self):
+        cache = self.cache(max_bytes=1, min_age_seconds=60)
+        first = cache.get_path(self.user, self.user.signature_print)
+        self.user.set_signature_print(ContentFile(b"second signature"))
+        self.user.save()
+
+        # another worker may still be compiling with the first file
+        cache.get_path(self.user, self.user.signature_print)
+        self.assertTrue(os.path.exists(first))
+
+        self.age(first, 120)
+        self.user.set_signature_print(ContentFile(b"third signature"))
+        self.user.save()
+        cache.get_path(self.user, self.user.signature_print)
+        self.assertFalse(os.path.exists(first))
+
+    def test_evicts_least_recently_used_beyond_min_age(self):
+        other = User.objects.create_user("dean", "dean@example.edu")
+        other.set_signature_print(ContentFile(b"dean signature"))
+        other.save()
+        cache = self.cache(max_bytes=20, min_age_seconds=60)
+
+        old = cache.get_path(other, other.signature_print)
+        self.age(old, 120)
+        cache.get_path(self.user, self.user.signature_print)
+        self.assertFalse(os.path.exists(old))
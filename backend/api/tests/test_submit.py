@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import (
+    FormApproval,
+    FormApprovalWorkflow,
+    FormSubmission,
+    FormSubmissionIdentifier,
+    FormTemplate,
+    Notification,
+    OrganizationalUnit,
+    UnitApprover,
+    User,
+)
+from api.views import FormSubmissionViewSet
+
+
+@mock.patch.object(FormSubmissionViewSet, "_generate_pdf", return_value=None)
+class SubmitTests(TestCase):
+    """Submitting a draft, see FormSubmissionViewSet.submit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+        FormApprovalWorkflow.objects.create(
+            form_template=cls.template,
+            approver_role="staff",
+            approval_position="Department Chair",
+            order=1,
+        )
+        cls.unit = OrganizationalUnit.objects.create(
+            name="Mathematics", code="MATH", level=0
+        )
+        cls.chair = User.objects.create_user("chair", "chair@example.edu", role="staff")
+        UnitApprover.objects.create(
+            unit=cls.unit, user=cls.chair, role="Department Chair"
+        )
+        cls.student = User.objects.create_user("student", "student@example.edu")
+
+    def setUp(self):
+        self.draft = FormSubmission.objects.create(
+            form_template=self.template,
+            submitter=self.student,
+            form_data={"student_id": "1234567"},
+            status="draft",
+            unit=self.unit,
+        )
+
+    def submit(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        return client.post(f"/api/forms/submission/{self.draft.pk}/submit/")
+
+    def test_submit_stores_approval_and_notification(self, generate_pdf):
+        response = self.submit()
+
+        self.assertEqual(response.status_code, 200)
+        self.draft.refresh_from_db()
+        self.assertEqual(self.draft.status, "pending")
+        self.assertTrue(
+            FormSubmissionIdentifier.objects.filter(form_submission=self.draft).exists()
+        )
+        approval = FormApproval.objects.get(form_submission=self.draft)
+        self.assertEqual(approval.approver, self.chair)
+        self.assertTrue(Notification.objects.filter(recipient=self.chair).exists())
+
+    def test_failed_submit_leaves_the_draft_untouched(self, generate_pdf):
+        with mock.patch.object(
+            FormApproval, "create_or_reassign", side_effect=RuntimeError("crash")
+        ):
+            response = self.submit()
+
+        self.assertEqual(response.status_code, 500)
+        self.draft.refresh_from_db()
+        self.assertEqual(self.draft.status, "draft")
+        self.assertFalse(
+            FormSubmissionIdentifier.objects.filter(form_submission=self.draft).exists()
+        )
+        self.assertFalse(Notification.objects.exists())
+
+    def test_submitted_draft_is_not_submitted_again(self, generate_pdf):
+        self.assertEqual(self.submit().status_code, 200)
+        self.assertEqual(self.submit().status_code, 400)
+        self.assertEqual(
+            FormApproval.objects.filter(form_submission=self.draft).count(), 1
+        )
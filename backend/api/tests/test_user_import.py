@@ -0,0 +1,68 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.importers.users import UserImporter
+from api.models import User
+
+CSV = (
+    "username,email,role,first_name,last_name,password\n"
+    "ana,ana@example.edu,student,Ana,Kealoha,correct-horse-1\n"
+    "kai,kai@example.edu,staff,Kai,Mo,correct-horse-2\n"
+    "lee,lee@example.edu,student,Lee,Lee,\n"
+    "ana2,ana@example.edu,student,Ana,Again,correct-horse-3\n"
+)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    USER_IMPORT_HASH_WORKERS=2,
+)
+class UserImportTests(TestCase):
+    """Bulk user import, see UserImporter"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            "admin", "admin@example.edu", "admin-pass"
+        )
+
+    def upload(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        return client.post(
+            "/api/admin/import_users/",
+            {"file": SimpleUploadedFile("users.csv", CSV.encode(), "text/csv")},
+            format="multipart",
+        )
+
+    def test_import_creates_users_with_hashed_passwords(self):
+        response = self.upload()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(
+            response.data["errors"],
+            [{"row": 5, "error": "Email appears more than once in the file"}],
+        )
+        self.assertTrue(
+            User.objects.get(username="ana").check_password("correct-horse-1")
+        )
+        self.assertTrue(
+            User.objects.get(username="kai").check_password("correct-horse-2")
+        )
+        self.assertFalse(User.objects.get(username="lee").has_usable_password())
+
+    def test_hashes_keep_row_order(self):
+        importer = UserImporter(workers=2)
+        passwords = [f"password-{index}" if index % 3 else "" for index in range(20)]
+        hashed = importer._hash_passwords(passwords)
+        importer._executor.shutdown()
+
+        user = User(username="probe")
+        for password, encoded in zip(passwords, hashed):
+            user.password = encoded
+            if password:
+                self.assertTrue(user.check_password(password))
+            else:
+                self.assertFalse(user.has_usable_password())
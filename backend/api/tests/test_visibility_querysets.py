@@ -0,0 +1,193 @@
+from django.db.models import OuterRef, Q
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import (
+    FormApproval,
+    FormApprovalWorkflow,
+    FormSubmission,
+    FormTemplate,
+    User,
+)
+from api.views import FormApprovalViewSet, FormSubmissionViewSet
+
+
+def old_submission_queryset(user):
+    """The submission visibility filter before the EXISTS rewrite"""
+    role_submissions = FormSubmission.objects.filter(
+        status="pending",
+        form_template__approvals_workflows__approver_role=user.role,
+        current_step=FormApprovalWorkflow.objects.filter(
+            form_template=OuterRef("form_template"), approver_role=user.role
+        ).values_list("order", flat=True)[:1],
+    )
+    return (FormSubmission.objects.filter(submitter=user) | role_submissions).distinct()
+
+
+def old_approval_queryset(user):
+    """The approval visibility filter before the UNION rewrite"""
+    return FormApproval.objects.filter(
+        Q(form_submission__submitter=user) | Q(approver=user)
+    )
+
+
+class VisibilityQuerysetTests(TestCase):
+    """
+    Plan regressions of the submission and approval visibility querysets
+
+    Both must stay single-table filters (EXISTS, UNION of ids) so no join
+    fans rows out and no DISTINCT is needed, and show the same rows as the
+    querysets they replaced.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # petition: staff signs first, then admin. withdrawal: the reverse
+        petition = FormTemplate.objects.create(
+            name="Graduate Petition Form",
+            field_schema={"fields": []},
+            latex_template_path="petition.tex",
+        )
+        withdrawal = FormTemplate.objects.create(
+            name="Term Withdrawal Form",
+            field_schema={"fields": []},
+            latex_template_path="withdrawal.tex",
+        )
+        workflows = {}
+        for template, roles in (
+            (petition, ["staff", "admin"]),
+            (withdrawal, ["admin", "staff"]),
+        ):
+            for order, role in enumerate(roles, start=1):
+                workflows[template.pk, order] = FormApprovalWorkflow.objects.create(
+                    form_template=template,
+                    approver_role=role,
+                    approval_position=f"{role} step {order}",
+                    order=order,
+                )
+
+        cls.student = User.objects.create_user("student", "student@example.edu")
+        cls.chair = User.objects.create_user("chair", "chair@example.edu", role="staff")
+        cls.dean = User.objects.create_user("dean", "dean@example.edu", role="admin")
+        # a staff member with submissions of their own
+        cls.both = User.objects.create_user("both", "both@example.edu", role="staff")
+
+        def submission(template, submitter, status, current_step, approvers=()):
+            submission = FormSubmission.objects.create(
+                form_template=template,
+                submitter=submitter,
+                form_data={},
+                status=status,
+                current_step=current_step,
+            )
+            for step, approver in enumerate(approvers, start=1):
+                FormApproval.objects.create(
+                    form_submission=submission,
+                    approver=approver,
+                    workflow=workflows[template.pk, step],
+                    step_number=step,
+                    decision="approved",
+                )
+            return submission
+
+        submission(petition, cls.student, "pending", 1)
+        submission(petition, cls.student, "pending", 2, [cls.chair])
+        submission(withdrawal, cls.student, "pending", 1)
+        submission(withdrawal, cls.student, "pending", 2, [cls.dean])
+        submission(petition, cls.student, "draft", 0)
+        submission(petition, cls.student, "approved", 2, [cls.chair, cls.dean])
+        submission(petition, cls.both, "pending", 2, [cls.chair])
+        # awaits the submitter's own role, matched by both sides of the OR
+        submission(withdrawal, cls.both, "pending", 2, [cls.dean])
+        submission(petition, cls.both, "returned", 1)
+
+        cls.users = [cls.student, cls.chair, cls.dean, cls.both]
+
+    def view_queryset(self, viewset, user):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = user
+        return viewset(action="retrieve", request=request).get_queryset()
+
+    def assertSingleTable(self, queryset):
+        """No DISTINCT, and nothing joined to the filtered table"""
+        sql = str(queryset.query).upper()
+        self.assertNotIn("DISTINCT", sql)
+        query = queryset.query
+        tables = {
+            join.table_name
+            for alias, join in query.alias_map.items()
+            if query.alias_refcount[alias]
+        }
+        self.assertEqual(tables, {queryset.model._meta.db_table})
+
+    def assertSameRows(self, queryset, old_queryset):
+        ids = list(queryset.values_list("pk", flat=True))
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(set(ids), set(old_queryset.values_list("pk", flat=True)))
+
+    def test_submission_queryset_plan(self):
+        for user in self.users:
+            with self.subTest(user=user.username):
+                queryset = self.view_queryset(FormSubmissionViewSet, user)
+                self.assertSingleTable(queryset)
+                self.assertIn("EXISTS", str(queryset.query).upper())
+
+    def test_approval_queryset_plan(self):
+        for user in self.users:
+            with self.subTest(user=user.username):
+                queryset = self.view_queryset(FormApprovalViewSet, user)
+                self.assertSingleTable(queryset)
+                self.assertIn("UNION", str(queryset.query).upper())
+
+    def test_submission_visibility_matches_old_queryset(self):
+        for user in self.users:
+            with self.subTest(user=user.username):
+                self.assertSameRows(
+                    self.view_queryset(FormSubmissionViewSet, user),
+                    old_submission_queryset(user),
+                )
+
+    def test_approval_visibility_matches_old_queryset(self):
+        for user in self.users:
+            with self.subTest(user=user.username):
+                self.assertSameRows(
+                    self.view_queryset(FormApprovalViewSet, user),
+                    old_approval_queryset(user),
+                )
+
+    def test_seed_covers_each_kind_of_user(self):
+        # guards against the comparisons above passing on empty sets
+        def visible(user):
+            return self.view_queryset(FormSubmissionViewSet, user)
+
+        self.assertTrue(visible(self.student).exists())
+        self.assertFalse(visible(self.student).exclude(submitter=self.student).exists())
+        self.assertTrue(visible(self.chair).exists())
+        self.assertTrue(visible(self.both).filter(submitter=self.both).exists())
+        self.assertTrue(visible(self.both).exclude(submitter=self.both).exists())
+        self.assertTrue(self.view_queryset(FormApprovalViewSet, self.both).exists())
+
+    def test_role_holding_later_step_sees_it(self):
+        # the old filter only matched the first step a role holds
+        template = FormTemplate.objects.create(
+            name="Graduate Posthumous Degree Petition",
+            field_schema={"fields": []},
+            latex_template_path="posthumous.tex",
+        )
+        for order in (1, 2):
+            FormApprovalWorkflow.objects.create(
+                form_template=template,
+                approver_role="staff",
+                approval_position=f"staff step {order}",
+                order=order,
+            )
+        later = FormSubmission.objects.create(
+            form_template=template,
+            submitter=self.student,
+            form_data={},
+            status="pending",
+            current_step=2,
+        )
+        self.assertIn(later, self.view_queryset(FormSubmissionViewSet, self.chair))
+        self.assertNotIn(later, old_submission_queryset(self.chair))
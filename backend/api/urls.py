@@ -14,9 +14,16 @@ from api.views import (
     CheckSignatureView,
     LogoutView,
     AuthViewSet,
+    ApiCredentialViewSet,
     OrganizationalUnitViewSet,
     UnitApproverViewSet,
     ApprovalDelegationViewSet,
+    AsyncAzureLoginView,
+    AsyncAzureRegisterView,
+    AsyncSubmissionPDFView,
+    AsyncPreviewView,
+    AsyncPendingApprovalsView,
+    AsyncEventStreamView,
 )
 
 
@@ -26,6 +33,7 @@ router = DefaultRouter()
 # Authentication endpoints
 router.register(r"azure", AzureAuthViewSet, basename="azure")
 router.register(r"auth", AuthViewSet, basename="auth")
+router.register(r"auth/api-keys", ApiCredentialViewSet, basename="api-keys")
 
 # Admin management endpoints
 router.register(r"admin", AdminDashboardViewSet, basename="admin")
@@ -55,4 +63,27 @@ urlpatterns = [
     path("", include(router.urls)),
     path("signature/check/", CheckSignatureView.as_view(), name="check-signature"),
     path("signature/upload/", SubmitSignatureView.as_view(), name="upload-signature"),
+    # Async (ASGI) endpoints
+    path("async/azure/login/", AsyncAzureLoginView.as_view(), name="async-azure-login"),
+    path(
+        "async/azure/register/",
+        AsyncAzureRegisterView.as_view(),
+        name="async-azure-register",
+    ),
+    path(
+        "async/forms/submission/<str:identifier>/pdf/",
+        AsyncSubmissionPDFView.as_view(),
+        name="async-submission-pdf",
+    ),
+    path(
+        "async/forms/submission/preview/",
+        AsyncPreviewView.as_view(),
+        name="async-preview",
+    ),
+    path(
+        "async/forms/approvals/pending/",
+        AsyncPendingApprovalsView.as_view(),
+        name="async-pending-approvals",
+    ),
+    path("async/events/", AsyncEventStreamView.as_view(), name="async-events"),
 ]
@@ -5,6 +5,7 @@ from .authentication import (
     AzureAuthViewSet,
     LogoutView,
     AuthViewSet,
+    ApiCredentialViewSet,
 )
 
 # Admin dashboard viewsets
@@ -22,6 +23,16 @@ from .organization import (
     ApprovalDelegationViewSet,
 )
 
+# Async (ASGI) variants of I/O-heavy endpoints
+from .asynchronous import (
+    AsyncAzureLoginView,
+    AsyncAzureRegisterView,
+    AsyncSubmissionPDFView,
+    AsyncPreviewView,
+    AsyncPendingApprovalsView,
+    AsyncEventStreamView,
+)
+
 
 __all__ = [
     "LoginView",
@@ -36,7 +47,14 @@ __all__ = [
     "SubmitSignatureView",
     "LogoutView",
     "AuthViewSet",
+    "ApiCredentialViewSet",
     "OrganizationalUnitViewSet",
     "UnitApproverViewSet",
     "ApprovalDelegationViewSet",
+    "AsyncAzureLoginView",
+    "AsyncAzureRegisterView",
+    "AsyncSubmissionPDFView",
+    "AsyncPreviewView",
+    "AsyncPendingApprovalsView",
+    "AsyncEventStreamView",
 ]
@@ -1,10 +1,25 @@
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Sum
+from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from utils import MethodNameMixin, pretty_print
-
-from api.models import User
+from utils.render_backends import LatexBackend
+
+from api.importers import UserImporter, detect_format, iter_rows
+from api.models import (
+    ApprovalDecisionRollup,
+    ApprovalStepFact,
+    FormApproval,
+    FormSubmission,
+    SubmissionStatusRollup,
+    User,
+)
 from api.serializers import AdminUserSerializer, UserSerializer
 
 from .common import AdminRequiredMixin
@@ -125,6 +140,273 @@ class AdminDashboardViewSet(AdminRequiredMixin, viewsets.ModelViewSet, MethodNam
             }
         )
 
+    @action(detail=False, methods=["POST"], parser_classes=[MultiPartParser])
+    def import_users(self, request):
+        """
+        Create users in bulk from an uploaded CSV or NDJSON file
+
+        Columns (CSV header or JSON keys) are the fields required by create:
+        username, email, role, first_name, last_name, plus optional password
+        and phone_number. Valid rows are created even if others fail.
+
+        Example:
+            POST /api/admin/import_users/ (multipart, file=<users.csv>)
+
+        Returns:
+            {"created": 2, "failed": 1,
+             "errors": [{"row": 3, "error": "User with this email already exists"}]}
+        """
+        uploaded_file = request.FILES.get("file")
+        if uploaded_file is None:
+            return Response(
+                {"error": "No file uploaded"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        file_format = detect_format(uploaded_file, request.data.get("file_format"))
+        if file_format is None:
+            return Response(
+                {"error": "Unsupported file format, upload a .csv or .ndjson file"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pretty_print(
+            f"Importing users from {uploaded_file.name} ({file_format})", "INFO"
+        )
+        result = UserImporter().run(iter_rows(uploaded_file, file_format))
+        pretty_print(
+            f"User import finished: {result['created']} created, "
+            f"{result['failed']} failed",
+            "INFO",
+        )
+        return Response(result)
+
+    @action(detail=False, methods=["GET"])
+    def analytics(self, request):
+        """
+        Workflow statistics read from the rollup tables
+
+        Current counts cover all submissions; daily throughput, approver
+        activity and time-to-decision cover the requested period (last 30
+        days by default). All parts can be narrowed to a unit and template.
+
+        Example:
+            GET /api/admin/analytics/?start=2025-01-01&end=2025-01-31&unit=4&template=2
+        """
+        try:
+            start, end, scope = self._analytics_params(request)
+        except ValueError:
+            return Response(
+                {"error": "start/end must be YYYY-MM-DD, unit/template ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        statuses = SubmissionStatusRollup.objects.filter(**scope)
+        in_period = {"day__gte": start, "day__lte": end}
+        decisions = ApprovalDecisionRollup.objects.filter(**scope, **in_period)
+        current = Sum(F("entered") - F("left"))
+
+        def current_counts(*fields):
+            return [
+                row
+                for row in statuses.values(*fields)
+                .annotate(count=current)
+                .order_by(*fields)
+                if row["count"]
+            ]
+
+        return Response(
+            {
+                "period": {"start": start, "end": end},
+                "status_counts": {
+                    row["status"]: row["count"] for row in current_counts("status")
+                },
+                "by_unit": current_counts("unit_id", "unit__name", "status"),
+                "by_template": current_counts(
+                    "form_template_id", "form_template__name", "status"
+                ),
+                "daily": list(
+                    statuses.filter(**in_period, entered__gt=0)
+                    .values("day", "status")
+                    .annotate(entered=Sum("entered"))
+                    .order_by("day", "status")
+                ),
+                "approvers": list(
+                    decisions.values("approver_id", "approver__username", "decision")
+                    .annotate(count=Sum("count"))
+                    .order_by("approver__username", "decision")
+                ),
+                "time_to_decision": ApprovalDecisionRollup.summarize(decisions),
+            }
+        )
+
+    @action(detail=False, methods=["GET"])
+    def turnaround(self, request):
+        """
+        Approval step turnaround percentiles from ApprovalStepFact
+
+        Groups steps decided in the period (last 30 days by default) by
+        approval position, unit or template and reports the median, p90
+        and p95 hours and how many steps exceeded their SLA.
+
+        Example:
+            GET /api/admin/turnaround/?group_by=position&start=2025-01-01&template=2
+        """
+        group_by = request.query_params.get("group_by", "position")
+        if group_by not in ApprovalStepFact.GROUPS:
+            return Response(
+                {
+                    "error": f"group_by must be one of {', '.join(ApprovalStepFact.GROUPS)}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            start, end, scope = self._analytics_params(request)
+        except ValueError:
+            return Response(
+                {"error": "start/end must be YYYY-MM-DD, unit/template ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        facts = ApprovalStepFact.objects.filter(
+            **scope,
+            decided_at__gte=self._start_of(start),
+            decided_at__lt=self._start_of(end + timedelta(days=1)),
+        )
+        if request.query_params.get("position"):
+            facts = facts.filter(position=request.query_params["position"])
+
+        return Response(
+            {
+                "period": {"start": start, "end": end},
+                "group_by": group_by,
+                "results": ApprovalStepFact.turnaround(group_by, facts),
+            }
+        )
+
+    @action(detail=False, methods=["GET"])
+    def overdue(self, request):
+        """
+        Undecided approvals waiting longer than their position's SLA
+
+        Oldest first, limited to `limit` rows (default 100, at most 500),
+        with the total number overdue per position.
+
+        Example:
+            GET /api/admin/overdue/?limit=50
+        """
+        try:
+            limit = min(int(request.query_params.get("limit", 100)), 500)
+        except ValueError:
+            return Response(
+                {"error": "limit must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        now = timezone.now()
+        overdue = FormApproval.overdue(now)
+        approvals = overdue.select_related(
+            "approver",
+            "workflow",
+            "form_submission__form_template",
+            "form_submission__unit",
+        )[:limit]
+
+        by_position = {
+            row["workflow__approval_position"] or "": row["count"]
+            for row in overdue.order_by()
+            .values("workflow__approval_position")
+            .annotate(count=Count("id"))
+        }
+
+        def hours(delta):
+            return round(delta.total_seconds() / 3600, 1)
+
+        return Response(
+            {
+                "total": sum(by_position.values()),
+                "by_position": by_position,
+                "results": [
+                    {
+                        "approval_id": approval.id,
+                        "form_submission_id": approval.form_submission_id,
+                        "form_template": approval.form_submission.form_template.name,
+                        "unit": (
+                            approval.form_submission.unit.name
+                            if approval.form_submission.unit
+                            else None
+                        ),
+                        "position": (
+                            approval.workflow.approval_position
+                            if approval.workflow
+                            else ""
+                        ),
+                        "step_number": approval.step_number,
+                        "approver": approval.approver.username,
+                        "received_at": approval.received_at,
+                        "waiting_hours": hours(now - approval.received_at),
+                        "sla_hours": hours(
+                            FormApproval.sla_for(
+                                approval.workflow.approval_position
+                                if approval.workflow
+                                else ""
+                            )
+                        ),
+                    }
+                    for approval in approvals
+                ],
+            }
+        )
+
+    @action(detail=False, methods=["GET"])
+    def rendering(self, request):
+        """
+        Health of LaTeX PDF rendering
+
+        State and metrics of the compile circuit breaker (trips, refused
+        compiles, last trip reason), how many submitted forms wait for
+        render_missing_pdfs and how many of those it gave up on.
+
+        Example:
+            GET /api/admin/rendering/
+        """
+        return Response(
+            {
+                "breaker": LatexBackend().breaker.stats(),
+                "missing_pdfs": FormSubmission.missing_pdf().count(),
+                "failed_pdfs": FormSubmission.missing_pdf()
+                .filter(pdf_render_attempts__gte=settings.PDF_RENDER_MAX_ATTEMPTS)
+                .count(),
+            }
+        )
+
+    def _analytics_params(self, request):
+        """
+        Period and scope shared by the analytics actions
+
+        Raises:
+            ValueError: On malformed dates or ids
+
+        Returns:
+            (start, end, scope) where scope filters on unit_id and
+            form_template_id when given
+        """
+        end = date.fromisoformat(
+            request.query_params.get("end", timezone.localdate().isoformat())
+        )
+        start = date.fromisoformat(
+            request.query_params.get("start", (end - timedelta(days=29)).isoformat())
+        )
+        scope = {}
+        if request.query_params.get("unit"):
+            scope["unit_id"] = int(request.query_params["unit"])
+        if request.query_params.get("template"):
+            scope["form_template_id"] = int(request.query_params["template"])
+        return start, end, scope
+
+    def _start_of(self, day):
+        """Aware datetime at the start of a day in the current time zone"""
+        return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
     def get_queryset(self):
         """Add custom filtering and ordering"""
         queryset = super().get_queryset()
@@ -0,0 +1,547 @@
+"""
+Async (ASGI) variants of the I/O-heavy endpoints
+
+These are plain Django views with async handlers so a single ASGI worker can
+keep serving other requests while one waits on the database, storage or the
+pdflatex subprocess. They mirror the behaviour of their DRF counterparts but
+answer with JsonResponse since DRF views are sync-only.
+"""
+
+import asyncio
+import base64
+import json
+import secrets
+
+import jwt
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import alogin
+from django.db.models import OuterRef
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from utils import (
+    FormPDFGenerator,
+    MethodNameMixin,
+    RenderCancelled,
+    RenderUnavailable,
+    pretty_print,
+)
+from utils.form_validator import get_form_validator
+from utils.render_backends import get_render_backend
+
+from api.core.events import bus
+from api.core.preview import PreviewCoalescer, PreviewSuperseded
+from api.models import (
+    ApprovalDelegation,
+    FormApproval,
+    FormApprovalWorkflow,
+    FormSubmission,
+    FormSubmissionIdentifier,
+    FormTemplate,
+    UnitApprover,
+    User,
+)
+from api.serializers import FormApprovalSerializer
+
+
+def _parse_json(request):
+    """Decode a JSON request body, returning an empty dict when it is blank"""
+    if not request.body:
+        return {}
+    return json.loads(request.body)
+
+
+def _read_file(field_file):
+    """Read a stored file fully, whatever the storage backend"""
+    with field_file.open("rb") as f:
+        return f.read()
+
+
+async def _active_user(request):
+    """
+    Resolve the session user without blocking the event loop
+
+    Returns:
+        The authenticated, active User or None
+    """
+    user = await request.auser()
+    if not user.is_authenticated or not user.is_active:
+        return None
+    return user
+
+
+def _decode_azure_token(token):
+    """
+    Decode an Azure AD token and check its issuer
+
+    Signature verification is disabled to match AzureAuthViewSet, so this
+    does not fetch the JWKS document.
+
+    Raises:
+        jwt.PyJWTError: If the token cannot be decoded or has the wrong issuer
+    """
+    payload = jwt.decode(
+        token, options={"verify_signature": False}, algorithms=["RS256"]
+    )
+    if not payload.get("iss", "").startswith("https://sts.windows.net"):
+        raise jwt.InvalidIssuerError("Invalid token issuer")
+    return payload
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAzureLoginView(View, MethodNameMixin):
+    """Async variant of AzureAuthViewSet.login"""
+
+    async def post(self, request):
+        pretty_print("Starting async Azure login process", "INFO")
+        try:
+            token = _parse_json(request).get("token")
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        if not token:
+            return JsonResponse({"error": "No Token Provided"}, status=400)
+
+        try:
+            payload = _decode_azure_token(token)
+        except jwt.PyJWTError as e:
+            pretty_print(f"JWT decode error: {str(e)}", "ERROR")
+            return JsonResponse({"error": "Invalid token"}, status=401)
+
+        # extract login information
+        email = (
+            payload.get("preferred_username")
+            or payload.get("upn")
+            or payload.get("email")
+            or ""
+        ).lower()
+
+        if not email:
+            return JsonResponse(
+                {"error": "No valid email found in Microsoft token"}, status=400
+            )
+
+        user = await User.objects.filter(email__iexact=email).afirst()
+        if not user:
+            return JsonResponse(
+                {"error": "No account found with this email. Please register first."},
+                status=404,
+            )
+
+        if not user.is_active:
+            return JsonResponse({"error": "User account is inactive"}, status=403)
+
+        await alogin(request, user, backend="api.core.backends.CachedModelBackend")
+        return JsonResponse(
+            {
+                "message": "Login successful",
+                "user": {
+                    "id": user.id,
+                    "email": user.email,
+                    "is_superuser": user.is_superuser,
+                    "firstName": user.first_name,
+                    "lastName": user.last_name,
+                    "role": user.role,
+                },
+            }
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAzureRegisterView(View, MethodNameMixin):
+    """Async variant of AzureAuthViewSet.register"""
+
+    async def post(self, request):
+        pretty_print("Starting async Azure registration process", "INFO")
+        try:
+            token = _parse_json(request).get("token")
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        if not token:
+            return JsonResponse({"error": "No Token Provided"}, status=400)
+
+        try:
+            payload = _decode_azure_token(token)
+        except jwt.PyJWTError as e:
+            pretty_print(f"JWT decode error: {str(e)}", "ERROR")
+            return JsonResponse({"error": "Invalid token format"}, status=401)
+
+        # extract  details from payload
+        email = (payload.get("upn") or payload.get("email") or "").lower()
+        first_name = payload.get("given_name", "")
+        last_name = payload.get("family_name", "")
+
+        if not email:
+            return JsonResponse({"error": "Email not found in token"}, status=400)
+        if await User.objects.filter(email=email).aexists():
+            return JsonResponse(
+                {"error": "User with this email already exists"}, status=400
+            )
+
+        username = email.split("@")[0]
+        # username is taken rather than giving them an error hex it
+        if await User.objects.filter(username=username).aexists():
+            username = f"{username}_{secrets.token_hex(4)}"
+
+        # create_user hashes the password, which is CPU bound so run it off the loop
+        user = await sync_to_async(User.objects.create_user)(
+            username=username,
+            email=email,
+            password=secrets.token_urlsafe(32),
+            first_name=first_name,
+            last_name=last_name,
+            role="student",
+        )
+        pretty_print(f"Azure user created successfully, user_id: {user.id}", "INFO")
+
+        return JsonResponse(
+            {
+                "message": "User Registered successfully!",
+                "user": {
+                    "id": user.id,
+                    "email": user.email,
+                    "personal_id": user.personal_id,
+                    "firstName": user.first_name,
+                    "lastName": user.last_name,
+                    "role": user.role,
+                },
+            }
+        )
+
+
+class AsyncSubmissionPDFView(View, MethodNameMixin):
+    """
+    Download the current PDF of a submission by its identifier
+
+    Returns the raw PDF rather than embedding it as base64 like
+    FormSubmissionViewSet.by_identifier does.
+    """
+
+    async def get(self, request, identifier):
+        user = await _active_user(request)
+        if not user:
+            return JsonResponse({"error": "Authentication required"}, status=401)
+
+        try:
+            identifier_obj = await FormSubmissionIdentifier.objects.select_related(
+                "form_submission"
+            ).aget(identifier=identifier)
+        except FormSubmissionIdentifier.DoesNotExist:
+            return JsonResponse(
+                {"error": "Form Submission not found with this identifier"},
+                status=404,
+            )
+
+        submission = identifier_obj.form_submission
+
+        # same rule as by_identifier: submitter, superuser or staff past step 0
+        if submission.submitter_id != user.id and not user.is_superuser:
+            if user.role != "staff" or submission.current_step == 0:
+                return JsonResponse(
+                    {"error": "You dont have permission to access this submission"},
+                    status=403,
+                )
+
+        if not submission.current_pdf:
+            return JsonResponse({"error": "No PDF for this submission"}, status=404)
+
+        try:
+            pdf_content = await sync_to_async(_read_file)(submission.current_pdf)
+        except Exception as e:
+            pretty_print(f"Error reading PDF: {str(e)}", "ERROR")
+            return JsonResponse({"error": "Error reading PDF"}, status=500)
+
+        response = HttpResponse(pdf_content, content_type="application/pdf")
+        response["Content-Disposition"] = f'inline; filename="{identifier}.pdf"'
+        return response
+
+
+class AsyncPreviewView(View, MethodNameMixin):
+    """
+    Async variant of FormSubmissionViewSet.preview
+
+    Awaits pdflatex as a subprocess so the worker can serve other requests
+    while the preview compiles. Unchanged previews are served from the draft,
+    rapid ones coalesced and an open circuit breaker answered with 503 the
+    same way as the sync view.
+    """
+
+    async def post(self, request):
+        user = await _active_user(request)
+        if not user:
+            return JsonResponse({"error": "Authentication required"}, status=401)
+
+        pretty_print(f"Generating form preview from {self._get_method_name()}", "DEBUG")
+
+        try:
+            # same nested payload as the sync preview
+            form_template = _parse_json(request).get("form_template") or {}
+            form_template_id = form_template.get("form_template")
+            form_data = form_template.get("form_data")
+        except (ValueError, AttributeError):
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        if not form_template_id or not form_data:
+            return JsonResponse(
+                {"error": "Missing form_template or form_data in request"}, status=400
+            )
+
+        try:
+            form_template = await FormTemplate.objects.aget(id=form_template_id)
+        except FormTemplate.DoesNotExist:
+            return JsonResponse({"error": "Form template not found"}, status=404)
+
+        # compiled and cached per template version, cheap to run inline
+        try:
+            errors = get_form_validator(form_template).validate(form_data)
+        except ValueError as e:
+            errors = {"form_template": [str(e)]}
+        if errors:
+            return JsonResponse(
+                {"error": "Form data is incomplete or invalid", "fields": errors},
+                status=400,
+            )
+
+        try:
+            draft_submission, changed_fields = await sync_to_async(
+                FormSubmission.stored_preview
+            )(user, form_template, form_data)
+            if draft_submission is not None:
+                pdf_content = await sync_to_async(_read_file)(
+                    draft_submission.current_pdf
+                )
+                return JsonResponse(
+                    {
+                        "pdf_content": base64.b64encode(pdf_content).decode("utf-8"),
+                        "filename": f"{form_template.name}_preview.pdf",
+                        "draft_id": draft_submission.id,
+                        "identifier": draft_submission.submission_identifier.identifier,
+                        "reused": True,
+                        "changed_fields": changed_fields,
+                    }
+                )
+
+            backend = get_render_backend(settings.PREVIEW_RENDER_BACKEND)
+            is_stale = None
+            if not backend.in_process:
+                coalescer = PreviewCoalescer(user.id)
+                ticket = await sync_to_async(coalescer.claim)()
+                await coalescer.adebounce(ticket)
+                is_stale = lambda: coalescer.ais_stale(ticket)
+
+            pdf_file = await FormPDFGenerator().agenerate_template_form(
+                form_template.name,
+                user,
+                form_data,
+                is_stale=is_stale,
+                backend=backend,
+            )
+            if pdf_file is None:
+                return JsonResponse(
+                    {"error": "Error generating preview: PDF was not generated"},
+                    status=500,
+                )
+            if is_stale and await is_stale():
+                raise PreviewSuperseded()
+
+            draft_submission, identifier = await sync_to_async(
+                FormSubmission.store_preview
+            )(
+                user,
+                form_template,
+                form_data,
+                pdf_file,
+                fingerprint=FormSubmission.preview_fingerprint_for(
+                    user, form_template, form_data
+                ),
+            )
+
+            pdf_file.seek(0)
+            pdf_base_64 = base64.b64encode(pdf_file.read()).decode("utf-8")
+
+            return JsonResponse(
+                {
+                    "pdf_content": pdf_base_64,
+                    "filename": f"{form_template.name}_preview.pdf",
+                    "draft_id": draft_submission.id,
+                    "identifier": identifier,
+                    "reused": False,
+                    "changed_fields": changed_fields,
+                }
+            )
+        except (PreviewSuperseded, RenderCancelled):
+            return JsonResponse(
+                {"error": "Superseded by a newer preview", "superseded": True},
+                status=409,
+            )
+        except RenderUnavailable as e:
+            response = JsonResponse(
+                {
+                    "error": "PDF rendering is temporarily unavailable, please try again shortly",
+                    "retry_after": e.retry_after,
+                },
+                status=503,
+            )
+            response["Retry-After"] = str(e.retry_after)
+            return response
+        except Exception as e:
+            pretty_print(f"Error generating preview: {str(e)}", "ERROR")
+            return JsonResponse(
+                {"error": f"Error generating preview: {str(e)}"}, status=500
+            )
+
+
+class AsyncPendingApprovalsView(View, MethodNameMixin):
+    """Async variant of FormApprovalViewSet.pending"""
+
+    async def get(self, request):
+        user = await _active_user(request)
+        if not user:
+            return JsonResponse({"error": "Authentication required"}, status=401)
+
+        role = user.role
+
+        # Only staff and admin can approve forms
+        if role not in ["staff", "admin"]:
+            return JsonResponse(
+                {"error": "Only staff and admin users can approve forms"}, status=403
+            )
+
+        # one query for all of this user's active approver positions
+        unit_roles = {}
+        is_org_wide_approver = False
+        async for unit_id, unit_role, org_wide in (
+            UnitApprover.objects.filter(user=user, is_active=True)
+            .order_by("id")
+            .values_list("unit_id", "role", "is_organization_wide")
+        ):
+            unit_roles.setdefault(unit_id, unit_role)
+            is_org_wide_approver = is_org_wide_approver or org_wide
+
+        # Get units delegated to this user
+        now = timezone.now()
+        delegated_units = [
+            unit_id
+            async for unit_id in ApprovalDelegation.objects.filter(
+                delegate=user, is_active=True, start_date__lte=now, end_date__gte=now
+            ).values_list("unit", flat=True)
+        ]
+        all_units = list(unit_roles) + delegated_units
+
+        # Find all form submissions that are pending and match this user's units
+        pending_submissions_query = FormSubmission.objects.filter(status="pending")
+
+        if not user.is_superuser and not is_org_wide_approver:
+            pending_submissions_query = pending_submissions_query.filter(
+                unit__in=all_units
+            )
+
+        # Match current step with workflow
+        pending_submissions = [
+            submission
+            async for submission in pending_submissions_query.filter(
+                form_template__approvals_workflows__approver_role=role,
+                current_step=FormApprovalWorkflow.objects.filter(
+                    form_template=OuterRef("form_template"), approver_role=role
+                ).values("order")[:1],
+            ).distinct()
+        ]
+
+        # create_or_reassign runs several queries per submission, so hop to a
+        # worker thread once for the whole batch
+        await sync_to_async(self._assign_approvals)(pending_submissions, user)
+
+        approvals = [
+            approval
+            async for approval in FormApproval.objects.filter(
+                form_submission__status="pending", approver=user, decision=""
+            ).select_related(
+                "approver",
+                "form_submission",
+                "form_submission__form_template",
+                "form_submission__submitter",
+                "form_submission__submission_identifier",
+                "form_submission__unit",
+                "workflow",
+            )
+        ]
+
+        response_data = await sync_to_async(self._serialize)(approvals, request)
+
+        # Add unit role information to each approval
+        for data, approval in zip(response_data, approvals):
+            unit = approval.form_submission.unit
+            if unit and unit.id in unit_roles:
+                data["unit_role"] = unit_roles[unit.id]
+                data["unit_name"] = unit.name
+
+        return JsonResponse(response_data, safe=False)
+
+    def _assign_approvals(self, submissions, user):
+        """Create or reassign the approval for each pending submission"""
+        for submission in submissions:
+            FormApproval.create_or_reassign(submission, user, submission.current_step)
+
+    def _serialize(self, approvals, request):
+        """Serialize approvals; file fields need sync storage access for URLs"""
+        serializer = FormApprovalSerializer(
+            approvals, many=True, context={"request": request}
+        )
+        return [dict(item) for item in serializer.data]
+
+
+class AsyncEventStreamView(View, MethodNameMixin):
+    """
+    Server-sent events stream of the user's inbox and submission updates
+
+    Sends "approval_assigned", "approval_removed" and "submission_status"
+    events (see api.signals) so dashboards re-fetch the pending approvals
+    only when they changed instead of polling. The stream holds no database
+    connection while idle, sends a keep-alive comment every
+    EVENT_STREAM_HEARTBEAT seconds and ends after EVENT_STREAM_MAX_SECONDS;
+    EventSource reconnects on its own. Clients should re-fetch once after
+    (re)connecting and on "resync", sent when events had to be dropped.
+
+    Example:
+        const events = new EventSource("/api/async/events/", {withCredentials: true})
+        events.addEventListener("approval_assigned", refreshInbox)
+    """
+
+    async def get(self, request):
+        user = await _active_user(request)
+        if not user:
+            return JsonResponse({"error": "Authentication required"}, status=401)
+
+        response = StreamingHttpResponse(
+            self._stream(user.id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # stop nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def _stream(self, user_id):
+        # subscribe inside the generator so the finally below always runs
+        subscription = bus.subscribe(user_id)
+        loop = asyncio.get_running_loop()
+        closes_at = loop.time() + settings.EVENT_STREAM_MAX_SECONDS
+        try:
+            yield f"retry: {int(settings.EVENT_STREAM_HEARTBEAT * 1000)}\n\n"
+            while (remaining := closes_at - loop.time()) > 0:
+                event = await subscription.get(
+                    min(settings.EVENT_STREAM_HEARTBEAT, remaining)
+                )
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(event["data"])
+                message = f"event: {event['event']}\ndata: {data}\n\n"
+                if "id" in event:
+                    message = f"id: {event['id']}\n{message}"
+                yield message
+        finally:
+            bus.unsubscribe(subscription)
@@ -11,7 +11,7 @@ from django.forms import ValidationError
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import ensure_csrf_cookie
 from jwt.algorithms import RSAAlgorithm
-from rest_framework import status, views, viewsets
+from rest_framework import mixins, status, views, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import (
     AuthenticationFailed,
@@ -27,9 +27,13 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from utils import MethodNameMixin, pretty_print
 
-from api.core import AccountInactiveError, InvalidCredentialsError
-from api.models import User
-from api.serializers import LoginSerializer
+from api.core import (
+    AccountInactiveError,
+    InvalidCredentialsError,
+    IsSessionAuthenticated,
+)
+from api.models import ApiCredential, User
+from api.serializers import ApiCredentialSerializer, LoginSerializer
 
 DEBUG = settings.DEBUG
 
@@ -293,7 +297,7 @@ class AzureAuthViewSet(viewsets.ViewSet, MethodNameMixin):
 
         # check if the user is deactivated or not
         if user.is_active:
-            login(request, user, backend="django.contrib.auth.backends.ModelBackend")
+            login(request, user, backend="api.core.backends.CachedModelBackend")
             return Response(
                 {
                     "message": "Login successful",
@@ -357,7 +361,7 @@ class AzureAuthViewSet(viewsets.ViewSet, MethodNameMixin):
 
             # new user start creating and account for them
             random_password = secrets.token_urlsafe(32)
-            username = email.split("@")
+            username = email.split("@")[0]
             # username is taken rather than giving them an error hex it
             if User.objects.filter(username=username).exists():
                 username = f"{username}_{secrets.token_hex(4)}"
@@ -510,3 +514,57 @@ class AuthViewSet(viewsets.ViewSet):
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ApiCredentialViewSet(
+    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
+    """
+    Issue and revoke API keys for integrations
+
+    Users manage keys that act as themselves, superusers can see every key.
+    The raw key is only returned once, when it is created. Keys can only be
+    issued and revoked from a login session, never with an API key or Basic
+    auth, so a leaked credential cannot be used to manage keys.
+    """
+
+    serializer_class = ApiCredentialSerializer
+    queryset = ApiCredential.objects.all()
+    permission_classes = [IsAuthenticated]
+
+    def get_permissions(self):
+        if self.action in ("create", "revoke"):
+            return [IsAuthenticated(), IsSessionAuthenticated()]
+        return super().get_permissions()
+
+    def get_queryset(self):
+        if self.request.user.is_superuser:
+            return ApiCredential.objects.select_related("user")
+        return ApiCredential.objects.filter(user=self.request.user)
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        credential, raw_key = ApiCredential.issue(
+            request.user,
+            serializer.validated_data["name"],
+            expires_at=serializer.validated_data.get("expires_at"),
+        )
+        pretty_print(
+            f"API key {credential.prefix} issued for user_id: {request.user.id}",
+            "INFO",
+        )
+
+        response_data = self.get_serializer(credential).data
+        response_data["key"] = raw_key
+        return Response(response_data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["POST"])
+    def revoke(self, request, pk=None):
+        """Revoke a key, it stops authenticating immediately"""
+        credential = self.get_object()
+        if credential.revoked_at is None:
+            credential.revoke()
+            pretty_print(f"API key {credential.prefix} revoked", "INFO")
+        return Response(self.get_serializer(credential).data)
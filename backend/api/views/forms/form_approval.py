@@ -1,4 +1,5 @@
-from django.db.models import OuterRef, Q
+from django.db import transaction
+from django.db.models import OuterRef
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
@@ -13,7 +14,6 @@ from api.models import (
     FormApproval,
     FormApprovalWorkflow,
     FormSubmission,
-    UnitApprover,
 )
 from api.serializers import FormApprovalSerializer, FormApprovalWorkflowSerializer
 
@@ -39,8 +39,14 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
         if user.is_superuser:
             return queryset
 
-        # Users see approvals for their own submissions and approvals they made
-        return queryset.filter(Q(form_submission__submitter=user) | Q(approver=user))
+        # Users see approvals for their own submissions and approvals they made.
+        # A UNION of the two id sets lets each side use its own index, where
+        # an OR across the join forced a scan of every approval
+        made_by_user = FormApproval.objects.filter(approver=user).values("pk")
+        on_own_submissions = FormApproval.objects.filter(
+            form_submission__submitter=user
+        ).values("pk")
+        return queryset.filter(pk__in=made_by_user.union(on_own_submissions))
 
     @action(detail=True, methods=["post"])
     def approve(self, request, pk=None):
@@ -103,26 +109,30 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
                 template_code = submission.form_template.get_form_type_code()
                 pdf_filename = f"forms/signed/{identifier}_{template_code}_approved.pdf"
                 approval.signed_pdf.save(pdf_filename, signed_pdf, save=False)
-                approval.signed_pdf_url = pdf_filename
+                approval.signed_pdf_url = approval.signed_pdf.name
         except Exception as e:
             pretty_print(f"Error generating signed PDF: {str(e)}", "ERROR")
 
-        approval.save()
-
-        # Move to next step
-        next_step = FormApprovalWorkflow.objects.filter(
-            form_template=submission.form_template, order=submission.current_step + 1
-        ).first()
-
-        if next_step:
-            submission.current_step += 1
-            submission.status = "pending"
-            submission.save()
-            # Create the next approval record
-            FormApproval.create_or_reassign(submission, None, submission.current_step)
-        else:
-            submission.status = "approved"
-            submission.save()
+        with transaction.atomic():
+            approval.save()
+
+            # Move to next step
+            next_step = FormApprovalWorkflow.objects.filter(
+                form_template=submission.form_template,
+                order=submission.current_step + 1,
+            ).first()
+
+            if next_step:
+                submission.current_step += 1
+                submission.status = "pending"
+                submission.save(update_fields=["current_step", "status", "updated_at"])
+                # Create the next approval record
+                FormApproval.create_or_reassign(
+                    submission, None, submission.current_step
+                )
+            else:
+                submission.status = "approved"
+                submission.save(update_fields=["status", "updated_at"])
 
         return Response({"status": submission.status})
 
@@ -173,7 +183,7 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
                 )
                 pdf_filename = f"forms/signed/{identifier}_{template_code}_rejected.pdf"
                 approval.signed_pdf.save(pdf_filename, signed_pdf, save=False)
-                approval.signed_pdf_url = pdf_filename
+                approval.signed_pdf_url = approval.signed_pdf.name
 
         except Exception as e:
             pretty_print(
@@ -181,10 +191,11 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
                 "ERROR",
             )
 
-        approval.save()
+        with transaction.atomic():
+            approval.save()
 
-        submission.status = "rejected"
-        submission.save()
+            submission.status = "rejected"
+            submission.save(update_fields=["status", "updated_at"])
 
         return Response({"status": "rejected"})
 
@@ -208,10 +219,8 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
             )
 
         # Get units where user is an approver
-        user_approver_positions = UnitApprover.objects.filter(user=user, is_active=True)
-        user_units = UnitApprover.objects.filter(user=user, is_active=True).values_list(
-            "unit", flat=True
-        )
+        approver_roles = user.get_approver_roles()
+        user_units = [position.unit_id for position in approver_roles]
 
         # Get units delegated to this user
         now = timezone.now()
@@ -223,9 +232,9 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
         all_units = list(user_units) + list(delegated_units)
 
         # Find submissions in user's units or where user is organization-wide approver
-        is_org_wide_approver = UnitApprover.objects.filter(
-            user=user, is_organization_wide=True, is_active=True
-        ).exists()
+        is_org_wide_approver = any(
+            position.is_organization_wide for position in approver_roles
+        )
 
         # Find all form submissions that are pending and match this user's units
         pending_submissions_query = FormSubmission.objects.filter(status="pending")
@@ -266,9 +275,9 @@ class FormApprovalViewSet(viewsets.ReadOnlyModelViewSet, MethodNameMixin):
             # Find the specific unit approver role for this user in this unit
             unit = approval.form_submission.unit
             if unit:
-                unit_approver = UnitApprover.objects.filter(
-                    user=user, unit=unit, is_active=True
-                ).first()
+                unit_approver = next(
+                    (p for p in approver_roles if p.unit_id == unit.id), None
+                )
 
                 if unit_approver:
                     response_data[i]["unit_role"] = unit_approver.role
@@ -1,11 +1,24 @@
-from django.db.models import OuterRef
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Window
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from utils import FormPDFGenerator, MethodNameMixin, pretty_print
+from utils import (
+    FormPDFGenerator,
+    MethodNameMixin,
+    RenderCancelled,
+    RenderUnavailable,
+    pretty_print,
+)
+from utils.form_validator import get_form_validator
+from utils.render_backends import get_render_backend
 
 from api.core import IsActiveUser
+from api.core.preview import PreviewCoalescer, PreviewSuperseded
 from api.models import (
     FormApproval,
     FormApprovalWorkflow,
@@ -84,11 +97,9 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
 
         # If user has an approver role, assign to their primary unit
         if user.role in ["staff", "admin"]:
-            user_approver = UnitApprover.objects.filter(
-                user=user, is_active=True
-            ).first()
-            if user_approver:
-                user_unit = user_approver.unit
+            approver_roles = user.get_approver_roles()
+            if approver_roles:
+                user_unit = approver_roles[0].unit
 
         # Save with user and their unit
         serializer.save(submitter=user, unit=user_unit)
@@ -100,6 +111,16 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
 
         This allows users to preview forms before submission. Creates a temporary
         draft submission that can be referenced later when the form is submitted.
+
+        Rendered with the PREVIEW_RENDER_BACKEND; submitting regenerates the
+        official PDF. When nothing the PDF depends on changed since the
+        draft's last preview the stored PDF is returned without rendering.
+        Rapid previews of one user compiled by pdflatex are coalesced: a
+        newer preview stops the compile of an earlier one, which answers 409
+        with "superseded". Unlike the async preview this one does not
+        debounce, waiting would hold the worker thread idle. While the
+        backend's circuit breaker is open the preview fails fast with 503
+        and Retry-After.
         """
         pretty_print(f"Generating form preview from {self._get_method_name()}", "DEBUG")
 
@@ -128,57 +149,70 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
             # Get the form template
             form_template = FormTemplate.objects.get(id=form_template_id)
 
-            # Generate the PDF using util class without saving it to DB
-            pdf_generator = FormPDFGenerator()
+            errors = self._validate_form_data(form_data, form_template)
+            if errors:
+                return Response(
+                    {"error": "Form data is incomplete or invalid", "fields": errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-            # pass the template name so that we know which one to generate
-            pdf_file = pdf_generator.generate_template_form(
-                form_template.name, request.user, form_data
-            )
+            # read pdf content and encode
+            import base64
 
-            draft_submission, created = FormSubmission.objects.get_or_create(
-                form_template=form_template,
-                submitter=request.user,
-                status="draft",
-                defaults={"form_data": form_data},
+            draft_submission, changed_fields = FormSubmission.stored_preview(
+                request.user, form_template, form_data
             )
+            if draft_submission is not None:
+                # nothing the PDF depends on changed, serve the stored one
+                with draft_submission.current_pdf.open("rb") as f:
+                    pdf_content = f.read()
+                return Response(
+                    {
+                        "pdf_content": base64.b64encode(pdf_content).decode("utf-8"),
+                        "filename": f"{form_template.name}_preview.pdf",
+                        "draft_id": draft_submission.id,
+                        "identifier": draft_submission.submission_identifier.identifier,
+                        "reused": True,
+                        "changed_fields": changed_fields,
+                    }
+                )
 
-            if not created:
-                if isinstance(form_data, dict):
-                    draft_submission.form_data = form_data
-                    draft_submission.save()
-                else:
-                    pretty_print(
-                        f"form_data is not a dict before saving: {type(form_data)}",
-                        "ERROR",
-                    )
+            backend = get_render_backend(settings.PREVIEW_RENDER_BACKEND)
+            is_stale = None
+            if not backend.in_process:
+                # a newer preview of the user stops this compile
+                coalescer = PreviewCoalescer(request.user.id)
+                ticket = coalescer.claim()
+                is_stale = lambda: coalescer.is_stale(ticket)
 
-            # Generate identifier for the preview/draft if it doesnt have one
-            # Store the identifier in the database
-            identifier_obj, created = FormSubmissionIdentifier.objects.get_or_create(
-                form_submission=draft_submission,
-                defaults={
-                    "identifier": draft_submission.generate_submission_identifier(),
-                    "form_type": form_template.name,
-                    "student_id": form_data.get("student_id", ""),
-                },
-            )
-            identifier = identifier_obj.identifier
+            # Generate the PDF using util class without saving it to DB
+            pdf_generator = FormPDFGenerator()
 
-            template_code = (
-                "withdrawal"
-                if form_template.name == "Term Withdrawal Form"
-                else "petition"
+            # pass the template name so that we know which one to generate
+            pdf_file = pdf_generator.generate_template_form(
+                form_template.name,
+                request.user,
+                form_data,
+                is_stale=is_stale,
+                backend=backend,
+            )
+            if pdf_file is None:
+                return Response(
+                    {"error": "Error generating preview: PDF was not generated"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+            if is_stale and is_stale():
+                raise PreviewSuperseded()
+
+            draft_submission, identifier = FormSubmission.store_preview(
+                request.user,
+                form_template,
+                form_data,
+                pdf_file,
+                fingerprint=FormSubmission.preview_fingerprint_for(
+                    request.user, form_template, form_data
+                ),
             )
-
-            pdf_filename = f"forms/{identifier}_{template_code}.pdf"
-
-            draft_submission.current_pdf.save(pdf_filename, pdf_file, save=False)
-            draft_submission.pdf_url = pdf_filename
-            draft_submission.save()
-
-            # read pdf content and encode
-            import base64
 
             pdf_file.seek(0)  # make sure we read from beginning
             pdf_content = pdf_file.read()
@@ -191,6 +225,8 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                     "filename": f"{form_template.name}_preview.pdf",
                     "draft_id": draft_submission.id,
                     "identifier": identifier,
+                    "reused": False,
+                    "changed_fields": changed_fields,
                 }
             )
 
@@ -199,6 +235,22 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                 {"error": "Form template not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        except (PreviewSuperseded, RenderCancelled):
+            return Response(
+                {"error": "Superseded by a newer preview", "superseded": True},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        except RenderUnavailable as e:
+            return Response(
+                {
+                    "error": "PDF rendering is temporarily unavailable, please try again shortly",
+                    "retry_after": e.retry_after,
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
         except Exception as e:
             pretty_print(f"Error generating preview: {str(e)}", "ERROR")
             return Response(
@@ -213,6 +265,9 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
 
         Processes a draft form submission and puts it into the approval workflow.
         Creates identifiers, sets initial approval state, and generates the final PDF.
+        When the PDF cannot be rendered (e.g. the LaTeX circuit breaker is open)
+        the form is submitted without it, "pdf_pending" is true and
+        render_missing_pdfs renders it later.
         """
         pretty_print(f"Request in submit form {request}", "INFO")
         try:
@@ -226,11 +281,12 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                 )
 
             # Validate form data against template schema before submitting
-            if not self._validate_form_data(
+            errors = self._validate_form_data(
                 form_submission.form_data, form_submission.form_template
-            ):
+            )
+            if errors:
                 return Response(
-                    {"error": "Form data is incomplete or invalid"},
+                    {"error": "Form data is incomplete or invalid", "fields": errors},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
@@ -250,100 +306,117 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                     "NO APPROVAL WORKFLOW FOUND MARKING AS APPROVED COULD BE A BUG, \n IN form_submissin.ViewSet.submit",
                     "WARNING",
                 )
-                form_submission.status = "approved"
-                form_submission.save()
-
-                # create identifer record even for auto-approved forms
-                identifier_obj, created = (
-                    FormSubmissionIdentifier.objects.get_or_create(
-                        form_submission=form_submission,
-                        defaults={
-                            "identifier": form_submission.generate_submission_identifier(),
-                            "form_type": form_submission.form_template.name,
-                            "student_id": form_submission.form_data.get(
-                                "student_id", ""
-                            ),
-                        },
+                with transaction.atomic():
+                    form_submission.status = "approved"
+                    form_submission.save(update_fields=["status", "updated_at"])
+
+                    # create identifer record even for auto-approved forms
+                    identifier_obj, created = (
+                        FormSubmissionIdentifier.objects.get_or_create(
+                            form_submission=form_submission,
+                            defaults={
+                                "identifier": form_submission.generate_submission_identifier(),
+                                "form_type": form_submission.form_template.name,
+                                "student_id": form_submission.form_data.get(
+                                    "student_id", ""
+                                ),
+                            },
+                        )
                     )
-                )
 
-                identifier = identifier_obj.identifier
+                    identifier = identifier_obj.identifier
 
                 return Response(
                     {"status": "approved", "message": "Form approved automatically"}
                 )
 
-            # Set form to pending approval and set current step to first approval step
-            form_submission.status = "pending"
-            form_submission.current_step = 1
-
-            # Set required approval count based on workflow
-            required_workflows = approval_workflows.filter(is_required=True)
-            form_submission.required_approval_count = required_workflows.count()
-            form_submission.save()
-
-            pretty_print(
-                f"Form {form_submission.id} submitted for approval, current step: {form_submission.current_step}",
-                "INFO",
-            )
-
-            # Generate final PDF with official timestamp
+            # Generate final PDF with official timestamp. Rendered before the
+            # transaction, so a slow compile holds no locks
             pdf_file = self._generate_pdf(
                 form_submission.form_template.name, form_submission
             )
 
-            # BUG: static should get template name from database
-            if pdf_file:
-                template_code = (
-                    "withdrawal"
-                    if form_submission.form_template.name == "Term Withdrawal Form"
-                    else "petition"
+            # The status change, the PDF, the identifier and the first
+            # approval (with its queued notification) are stored together or
+            # not at all
+            with transaction.atomic():
+                # another submit of the same draft may have won the race
+                if (
+                    FormSubmission.objects.select_for_update()
+                    .filter(pk=form_submission.pk, status="draft")
+                    .first()
+                    is None
+                ):
+                    return Response(
+                        {"error": "Only draft forms can be submitted for approval"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+                # Set form to pending approval and set current step to first approval step
+                form_submission.status = "pending"
+                form_submission.current_step = 1
+
+                # Set required approval count based on workflow
+                required_workflows = approval_workflows.filter(is_required=True)
+                form_submission.required_approval_count = required_workflows.count()
+
+                if pdf_file:
+                    form_submission.attach_pdf(pdf_file, identifier)
+                elif form_submission.current_pdf:
+                    # the draft's preview is not the official document, leave
+                    # the submission to render_missing_pdfs instead
+                    form_submission.current_pdf = None
+                    form_submission.pdf_url = None
+
+                # If the unit is not assigned, try to determine it from form data
+                if not form_submission.unit and form_submission.form_data.get("unit"):
+                    try:
+                        unit_id = int(form_submission.form_data.get("unit"))
+                        # Get unit from database - FIX: use the imported model, not a local import
+                        form_submission.unit = OrganizationalUnit.objects.get(
+                            id=unit_id
+                        )
+                    except (ValueError, OrganizationalUnit.DoesNotExist):
+                        pass
+
+                # If still no unit, try submitter's unit
+                if not form_submission.unit:
+                    # Try to assign unit based on submitter
+                    user = form_submission.submitter
+                    user_approver = UnitApprover.objects.filter(
+                        user=user, is_active=True
+                    ).first()
+                    if user_approver:
+                        form_submission.unit = user_approver.unit
+
+                form_submission.save()
+
+                pretty_print(
+                    f"Form {form_submission.id} submitted for approval, current step: {form_submission.current_step}",
+                    "INFO",
                 )
-                pdf_filename = f"forms/{identifier}_{template_code}.pdf"
-                form_submission.current_pdf.save(pdf_filename, pdf_file, save=True)
 
-            # Create Identifier Record
-            identifier_obj, created = FormSubmissionIdentifier.objects.get_or_create(
-                form_submission=form_submission,
-                defaults={
-                    "identifier": identifier,
-                    "form_type": form_submission.form_template.name,
-                    "student_id": form_submission.form_data.get("student_id", ""),
-                },
-            )
+                # Create Identifier Record
+                FormSubmissionIdentifier.objects.get_or_create(
+                    form_submission=form_submission,
+                    defaults={
+                        "identifier": identifier,
+                        "form_type": form_submission.form_template.name,
+                        "student_id": form_submission.form_data.get("student_id", ""),
+                    },
+                )
 
-            # If the unit is not assigned, try to determine it from form data
-            if not form_submission.unit and form_submission.form_data.get("unit"):
-                try:
-                    unit_id = int(form_submission.form_data.get("unit"))
-                    # Get unit from database - FIX: use the imported model, not a local import
-                    unit_obj = OrganizationalUnit.objects.get(id=unit_id)
-                    form_submission.unit = unit_obj
-                    form_submission.save()
-                except (ValueError, OrganizationalUnit.DoesNotExist):
-                    pass
-
-            # If still no unit, try submitter's unit
-            if not form_submission.unit:
-                # Try to assign unit based on submitter
-                user = form_submission.submitter
-                user_approver = UnitApprover.objects.filter(
-                    user=user, is_active=True
-                ).first()
-                if user_approver:
-                    form_submission.unit = user_approver.unit
-                    form_submission.save()
-
-            # Create first approval record for the appropriate approver
-            FormApproval.create_or_reassign(
-                form_submission, None, form_submission.current_step
-            )
+                # Create first approval record for the appropriate approver
+                FormApproval.create_or_reassign(
+                    form_submission, None, form_submission.current_step
+                )
 
             return Response(
                 {
                     "status": "pending",
                     "required_approvals": form_submission.required_approval_count,
                     "identifier": identifier,
+                    "pdf_pending": not form_submission.current_pdf,
                     "unit": form_submission.unit.id if form_submission.unit else None,
                     "unit_name": form_submission.unit.name
                     if form_submission.unit
@@ -383,45 +456,48 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Create approval record
-        approval = FormApproval.objects.create(
-            form_submission=form_submission,
-            approver=request.user,
-            step_number=form_submission.current_step,
-            decision="approved",
-            comments=request.data.get("comments", ""),
-        )
+        with transaction.atomic():
+            # Create approval record
+            approval = FormApproval.objects.create(
+                form_submission=form_submission,
+                approver=request.user,
+                step_number=form_submission.current_step,
+                decision="approved",
+                comments=request.data.get("comments", ""),
+            )
 
-        # Generate signed PDF for this approval
-        signed_pdf = self._generate_signed_pdf(form_submission, approval)
-        approval.signed_pdf = signed_pdf
-        approval.save()
+            # Generate signed PDF for this approval
+            signed_pdf = self._generate_signed_pdf(form_submission, approval)
+            approval.signed_pdf = signed_pdf
+            approval.save()
 
-        # Check if there are more steps in the workflow
-        next_workflow = (
-            form_submission.form_template.approvals_workflows.filter(
-                order__gt=form_submission.current_step
+            # Check if there are more steps in the workflow
+            next_workflow = (
+                form_submission.form_template.approvals_workflows.filter(
+                    order__gt=form_submission.current_step
+                )
+                .order_by("order")
+                .first()
             )
-            .order_by("order")
-            .first()
-        )
 
-        if next_workflow:
-            # Move to next step
-            form_submission.current_step = next_workflow.order
-            form_submission.save()
-            return Response(
-                {
-                    "status": "pending",
-                    "current_step": form_submission.current_step,
-                    "approver_role": next_workflow.approver_role,
-                }
-            )
-        else:
-            # Final approval
-            form_submission.status = "approved"
-            form_submission.save()
-            return Response({"status": "approved", "message": "Form fully approved"})
+            if next_workflow:
+                # Move to next step
+                form_submission.current_step = next_workflow.order
+                form_submission.save(update_fields=["current_step", "updated_at"])
+                return Response(
+                    {
+                        "status": "pending",
+                        "current_step": form_submission.current_step,
+                        "approver_role": next_workflow.approver_role,
+                    }
+                )
+            else:
+                # Final approval
+                form_submission.status = "approved"
+                form_submission.save(update_fields=["status", "updated_at"])
+                return Response(
+                    {"status": "approved", "message": "Form fully approved"}
+                )
 
     def _generate_pdf(self, template_name, form_submission):
         """
@@ -434,24 +510,23 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
             form_submission: The FormSubmission object containing the data
 
         Returns:
-            A PDF file object or None if generation fails
+            A PDF file object or None if generation fails, submissions left
+            without one are picked up by render_missing_pdfs
         """
         pretty_print(
             f"RECEIVED INSIDE _generate_pdf: {template_name} {form_submission}", "DEBUG"
         )
         try:
             pdf_generator = FormPDFGenerator()
-            pdf_file = pdf_generator.generate_template_form(
+            # not stored here, submit saves it under the submission identifier
+            return pdf_generator.generate_template_form(
                 template_name,
                 form_submission.submitter,
                 form_submission.form_data,
             )
-
-            # Update the form submission with the generated PDF
-            form_submission.current_pdf = pdf_file
-            form_submission.save()
-
-            return pdf_file
+        except RenderUnavailable as e:
+            pretty_print(f"PDF left for render_missing_pdfs: {str(e)}", "WARNING")
+            return None
         except Exception as e:
             pretty_print(f"Error generating PDF: {str(e)}", "ERROR")
             return None
@@ -489,27 +564,95 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
             - All submissions for admins
             - User's own submissions and pending approvals for staff users
             - Only user's own submissions for regular users
+
+        The list shows the user's own submissions (admins: all of them, or
+        their own with ?scope=mine), or with ?scope=awaiting the pending ones
+        whose current step belongs to the user's role. form_data filters
+        narrow either, see _filter_form_data.
         """
         user = self.request.user
         queryset = super().get_queryset()
 
+        # Pending submissions whose current step belongs to the user's role.
+        # EXISTS keeps this a single-table filter, so no join fans rows out
+        # and no DISTINCT is needed
+        awaiting_role = Q(
+            Exists(
+                FormApprovalWorkflow.objects.filter(
+                    form_template=OuterRef("form_template"),
+                    order=OuterRef("current_step"),
+                    approver_role=user.role,
+                )
+            ),
+            status="pending",
+        )
+
+        if self.action == "list":
+            queryset = self._filter_form_data(queryset)
+            scope = self.request.query_params.get("scope")
+            if scope == "awaiting":
+                return queryset.filter(awaiting_role)
+            if scope not in (None, "mine"):
+                raise ValidationError({"scope": "Must be mine or awaiting"})
+            if scope == "mine" or not user.is_superuser:
+                return queryset.filter(submitter=user)
+
         # Admins see all submissions
         if user.is_superuser:
             return queryset
 
-        # Users see submissions they created
-        if self.action == "list":
-            return queryset.filter(submitter=user)
+        # Users see submissions they created and those awaiting their role
+        return queryset.filter(Q(submitter=user) | awaiting_role)
 
-        # For approvers, include submissions they need to approve
-        role_submissions = FormSubmission.objects.filter(
-            status="pending",
-            form_template__approvals_workflows__approver_role=user.role,
-            current_step=FormApprovalWorkflow.objects.filter(
-                form_template=OuterRef("form_template"), approver_role=user.role
-            ).values_list("order", flat=True)[:1],
+    def _filter_form_data(self, queryset):
+        """
+        Apply ?form_data__<field>[__<lookup>]=<value> query parameters
+
+        Lookups are exact (default), in (comma separated values) and
+        startswith. The predicates run in SQL, see
+        FormSubmission.form_data_filter.
+
+        Example:
+            GET /api/forms/submission/?form_data__student_id=1234567
+            GET /api/forms/submission/?scope=awaiting&form_data__season__in=Fall,Spring&form_data__year=2025
+        """
+        prefix = "form_data__"
+        filters = {}
+        for param, value in self.request.query_params.items():
+            if not param.startswith(prefix):
+                continue
+            name = param[len(prefix) :]
+            filters[name] = (
+                [item for item in value.split(",") if item]
+                if name.endswith("__in")
+                else value
+            )
+
+        if not filters:
+            return queryset
+        try:
+            return queryset.filter(FormSubmission.form_data_filter(filters))
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+    @action(detail=True, methods=["GET"])
+    def history(self, request, pk=None):
+        """
+        Revision timeline of a submission
+
+        Returns every version linked through previous_version, first version
+        first, each with its approvals, read in a single query (see
+        FormSubmission.revision_history).
+        """
+        submission = self.get_object()
+        versions = submission.revision_history()
+        return Response(
+            {
+                "form_submission_id": submission.pk,
+                "version_count": len(versions),
+                "versions": versions,
+            }
         )
-        return (queryset.filter(submitter=user) | role_submissions).distinct()
 
     @action(detail=False, methods=["GET"])
     def by_identifier(self, request):
@@ -573,6 +716,76 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=False, methods=["GET"])
+    def search(self, request):
+        """
+        Full-text search over the submissions visible to the user
+
+        Matches submitter and student names, student id, identifier,
+        template name and the text answers of the form (web search syntax:
+        quoted phrases, "or", -excluded). Results are ordered by relevance.
+
+        Example:
+            GET /api/forms/submission/search/?q=leave of absence&page=1&page_size=20
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "Missing search query (q)"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+            page_size = min(max(int(request.query_params.get("page_size", 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {"error": "page and page_size must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        offset = (page - 1) * page_size
+
+        query = SearchQuery(
+            text, config=FormSubmission.SEARCH_CONFIG, search_type="websearch"
+        )
+        # visibility rules of get_queryset, matched through the GIN index.
+        # Ranking visits every match anyway, so the total is counted in the
+        # same pass with a window function, over narrow (id, rank) rows
+        matches = self.get_queryset().filter(search_vector=query)
+        page_rows = list(
+            matches.annotate(
+                rank=SearchRank(F("search_vector"), query),
+                total=Window(Count("id")),
+            )
+            .order_by("-rank", "-id")
+            .values_list("id", "rank", "total")[offset : offset + page_size]
+        )
+        # past the last page there is no row to read the total from
+        total = page_rows[0][2] if page_rows else matches.count()
+
+        submissions = (
+            FormSubmission.objects.select_related("submitter", "form_template", "unit")
+            .defer("search_vector")
+            .in_bulk([pk for pk, _, _ in page_rows])
+        )
+        results = []
+        for pk, rank, _ in page_rows:
+            submissions[pk].rank = rank
+            results.append(submissions[pk])
+
+        serialized = FormSubmissionSerializer(results, many=True).data
+        for submission, data in zip(results, serialized):
+            data["rank"] = submission.rank
+
+        return Response(
+            {
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": (total + page_size - 1) // page_size,
+                "results": serialized,
+            }
+        )
+
     @action(detail=False, methods=["GET"])
     def all_identifiers(self, request):
         """
@@ -609,38 +822,27 @@ class FormSubmissionViewSet(viewsets.ModelViewSet, MethodNameMixin):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _validate_form_data(self, form_data, form_template) -> bool:
+    def _validate_form_data(self, form_data, form_template) -> dict:
         """
         Validate form data against the template schema
 
+        Uses the template's compiled validator (see utils.form_validator),
+        built once per template version.
+
         Args:
             form_data: The user-submitted form data (dict)
             form_template: The FormTemplate containing the field schema
 
         Returns:
-            bool: True if data is valid, False otherwise
+            dict: Field name to list of errors, empty if data is valid
         """
-        pretty_print(f"[VALIDATION] form_data type: {type(form_data)}", "DEBUG")
-
-        if not isinstance(form_data, dict):
-            pretty_print("[VALIDATION] form_data is not a dict", "ERROR")
-            return False
-
-        schema = form_template.field_schema
-
-        if not schema or not isinstance(schema, dict):
-            pretty_print("NO SCHEMA FOR THIS FORM", "ERROR")
-            return False
-
-        fields = schema.get("fields", [])
-        if not isinstance(fields, list):
-            pretty_print("Schema 'fields' key is not a list", "ERROR")
-            return False
-
-        for field in fields:
-            field_name = field.get("name")
-            if field.get("required", False) and field_name not in form_data:
-                pretty_print(f"Missing required field: {field_name}", "ERROR")
-                return False
-
-        return True
+        try:
+            validator = get_form_validator(form_template)
+        except ValueError as e:
+            pretty_print(str(e), "ERROR")
+            return {"form_template": [str(e)]}
+
+        errors = validator.validate(form_data)
+        if errors:
+            pretty_print(f"[VALIDATION] invalid form_data: {errors}", "DEBUG")
+        return errors
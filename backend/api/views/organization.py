@@ -31,6 +31,26 @@ class OrganizationalUnitViewSet(viewsets.ModelViewSet, MethodNameMixin):
             self.permission_classes = [IsAuthenticated]
         return super().get_permissions()
 
+    @action(detail=False, methods=["GET"])
+    def tree(self, request):
+        """
+        Get the whole organizational hierarchy as a nested structure
+
+        Returns every active unit with its sub-units nested under "children",
+        built from a single query instead of one sub_units request per node.
+        Pass ?approver_counts=true to include the number of active approvers
+        for each unit.
+        """
+
+        include_approver_counts = request.query_params.get(
+            "approver_counts", ""
+        ).lower() in ["1", "true", "yes"]
+
+        tree = OrganizationalUnit.get_tree(
+            include_approver_counts=include_approver_counts
+        )
+        return Response(tree)
+
     @action(detail=True, methods=["GET"])
     def sub_units(self, request, pk=None):
         """
@@ -195,9 +215,10 @@ class ApprovalDelegationViewSet(viewsets.ModelViewSet, MethodNameMixin):
             )
 
         # Check if user is an approver for this unit
-        is_approver = UnitApprover.objects.filter(
-            user=request.user, unit_id=unit_id, is_active=True
-        ).exists()
+        is_approver = any(
+            str(position.unit_id) == str(unit_id)
+            for position in request.user.get_approver_roles()
+        )
 
         if not is_approver and not request.user.is_superuser:
             return Response(
@@ -3,7 +3,7 @@ from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from utils import pretty_print
+from utils import normalize_signature, pretty_print
 
 
 class CheckSignatureView(APIView):
@@ -48,6 +48,9 @@ class SubmitSignatureView(APIView):
         Allowed formats: JPEG, PNG, GIF
         Maximum size: 2MB
 
+        Alongside the original a print-ready derivative (cropped, downsampled
+        to 2in at 300 DPI, 1-bit PNG) is stored and used when rendering PDFs.
+
         Returns:
             Success response with has_signature=True if uploaded successfully
             Error response with details if validation fails
@@ -82,8 +85,19 @@ class SubmitSignatureView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            # build the print-ready copy up front so unreadable images are rejected
+            try:
+                signature_print = normalize_signature(signature_file)
+            except (OSError, ValueError) as e:
+                pretty_print(f"Could not normalize signature: {str(e)}", "ERROR")
+                return Response(
+                    {"error": "Could not read the signature image"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
             user = request.user
-            user.signature = request.FILES["signature"]
+            user.signature = signature_file
+            user.set_signature_print(signature_print)
             user.has_signature = True
             user.save()
 
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 from utils import pretty_print
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
     "corsheaders",
@@ -47,7 +49,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.core.db_router.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "api.core.sessions.SessionRenewalMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -78,9 +82,18 @@ AUTH_ADFS = {
 
 AUTHENTICATION_BACKENDS = (
     #"django_auth_adfs.backend.AdfsAuthCodeBackend",
+    "api.core.backends.CachedModelBackend",
+    # sessions logged in before CachedModelBackend name this one, listed so
+    # they stay valid; drop it once those have expired (SESSION_COOKIE_AGE)
     "django.contrib.auth.backends.ModelBackend",
 )
 
+# Session users (with their approver roles) are cached for USER_CACHE_TIMEOUT
+# seconds. Only with a shared cache (Redis): with a per-process one, changing
+# or deactivating a user would clear the cached copy of one worker only
+USER_CACHE_ENABLED = bool(os.getenv("REDIS_URL"))
+USER_CACHE_TIMEOUT = 5 * 60
+
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
@@ -138,6 +151,54 @@ DATABASES = {
     }
 }
 
+# Optional read replicas, a comma separated list of host or host:port entries
+# that stream from the default database. Reads are spread across them by
+# PrimaryReplicaRouter, writes and migrations always go to the primary
+REPLICA_DATABASES = []
+for index, replica in enumerate(
+    filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    replica_host, _, replica_port = replica.strip().partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["api.core.db_router.PrimaryReplicaRouter"]
+
+# After writing, a client keeps reading from the primary for this many
+# seconds so it sees its own changes before they reach the replicas
+REPLICA_PIN_SECONDS = 5
+REPLICA_PIN_COOKIE = "read_primary"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Shared cache so invalidations reach every worker, falls back to
+# a per-process cache for local development
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# How long the assembled organization tree is cached (seconds). Only with a
+# shared cache (Redis): with a per-process one, a change to a unit would
+# clear the cached tree of one worker only
+ORG_TREE_CACHE_ENABLED = bool(os.getenv("REDIS_URL"))
+ORG_TREE_CACHE_TIMEOUT = 60 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -172,6 +233,96 @@ STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Local cache of signature images for remote storage backends
+SIGNATURE_CACHE_DIR = os.getenv(
+    "SIGNATURE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "picton-signatures")
+)
+SIGNATURE_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+# files used this recently are not evicted, a render may still read them;
+# longer than a compile waits for a workspace and runs
+SIGNATURE_CACHE_MIN_AGE_SECONDS = 5 * 60
+
+# pdflatex runs in a pool of reusable workspaces (utils.latex_workspace), on
+# tmpfs when /dev/shm exists so compile I/O stays in RAM. At most
+# LATEX_WORKSPACE_COUNT compiles run at once per root, others wait up to
+# LATEX_WORKSPACE_WAIT_SECONDS; a compile writing more than
+# LATEX_WORKSPACE_MAX_BYTES is stopped
+LATEX_WORKSPACE_ROOT = os.getenv(
+    "LATEX_WORKSPACE_ROOT",
+    os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+        "picton-latex",
+    ),
+)
+LATEX_WORKSPACE_COUNT = int(os.getenv("LATEX_WORKSPACE_COUNT", os.cpu_count() or 1))
+LATEX_WORKSPACE_MAX_BYTES = 32 * 1024 * 1024  # 32MB
+LATEX_WORKSPACE_WAIT_SECONDS = 30
+
+# Limits of a single pdflatex run: stopped after LATEX_COMPILE_TIMEOUT_SECONDS
+# of wall time, LATEX_COMPILE_CPU_SECONDS of CPU time or when it needs more
+# than LATEX_COMPILE_MEMORY_BYTES of memory; no file it writes may grow past
+# LATEX_WORKSPACE_MAX_BYTES
+LATEX_COMPILE_TIMEOUT_SECONDS = int(os.getenv("LATEX_COMPILE_TIMEOUT_SECONDS", 60))
+LATEX_COMPILE_CPU_SECONDS = int(os.getenv("LATEX_COMPILE_CPU_SECONDS", 30))
+LATEX_COMPILE_MEMORY_BYTES = 1024 * 1024 * 1024  # 1GB
+# Circuit breaker (utils.circuit_breaker): after LATEX_BREAKER_FAILURES compiles
+# in a row failed or took longer than LATEX_BREAKER_SLOW_SECONDS, compiles are
+# refused for LATEX_BREAKER_RESET_SECONDS. Previews then answer 503, submissions
+# go through without a PDF for render_missing_pdfs to render later
+LATEX_BREAKER_FAILURES = 5
+LATEX_BREAKER_SLOW_SECONDS = 20
+LATEX_BREAKER_RESET_SECONDS = 60
+# render_missing_pdfs retries a submission whose PDF failed to render after
+# PDF_RENDER_RETRY_MINUTES, doubling the wait each time, and gives up after
+# PDF_RENDER_MAX_ATTEMPTS failures (--retry-failed tries those again)
+PDF_RENDER_RETRY_MINUTES = 15
+PDF_RENDER_MAX_ATTEMPTS = 5
+
+# Bulk user import: rows inserted per batch and threads hashing passwords.
+# The import runs inside a web request, keep it to a few cores
+USER_IMPORT_BATCH_SIZE = 1000
+USER_IMPORT_HASH_WORKERS = int(
+    os.getenv("USER_IMPORT_HASH_WORKERS", min(4, os.cpu_count() or 1))
+)
+
+# Approval turnaround targets in hours, per approval position with a default
+APPROVAL_SLA_HOURS = int(os.getenv("APPROVAL_SLA_HOURS", 72))
+APPROVAL_SLA_HOURS_BY_POSITION = {}
+
+# Notifications: written to an outbox, delivered by dispatch_notifications
+# through any Django email backend (smtp, console, locmem, ...)
+NOTIFICATION_EMAIL_BACKEND = os.getenv(
+    "NOTIFICATION_EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+NOTIFICATION_FROM_EMAIL = os.getenv("NOTIFICATION_FROM_EMAIL", "noreply@localhost")
+NOTIFICATION_BATCH_SIZE = 100  # recipients per dispatch round
+NOTIFICATION_MAX_ATTEMPTS = 5
+# claimed notifications come due again after this long (seconds) if the
+# dispatcher dies before marking them, longer than a batch takes to send
+NOTIFICATION_CLAIM_SECONDS = 10 * 60
+NOTIFICATION_DIGEST_HOUR = 8  # local hour daily digests go out
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False") == "True"
+
+# Server-sent events (api/async/events/): "local" delivers within this process,
+# "postgres" fans out to every worker through LISTEN/NOTIFY
+EVENT_BUS_BACKEND = os.getenv("EVENT_BUS_BACKEND", "local")
+EVENT_BUS_CHANNEL = "picton_events"
+EVENT_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments
+EVENT_STREAM_MAX_SECONDS = 300  # streams end after this, clients reconnect
+EVENT_STREAM_MAX_QUEUED = 100  # events buffered per stream before resync
+
+# Async previews (api/async/...): requests of one user arriving within this
+# many seconds of each other are coalesced, only the last one compiles. The
+# sync preview does not wait, it would hold a worker thread idle
+PREVIEW_DEBOUNCE_SECONDS = float(os.getenv("PREVIEW_DEBOUNCE_SECONDS", 0.3))
+# Backend rendering previews (utils.render_backends): "latex" compiles the
+# official layout, "simple" (opt in) writes a plain PDF of the fields in process
+PREVIEW_RENDER_BACKEND = os.getenv("PREVIEW_RENDER_BACKEND", "latex")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -212,21 +363,53 @@ SESSION_COOKIE_SECURE = (
 # Session Persistence
 SESSION_COOKIE_AGE = 1209600  # 2 weeks (default)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Persist across browser restarts
-SESSION_SAVE_EVERY_REQUEST = True  # Renew session on activity
+SESSION_SAVE_EVERY_REQUEST = False
+# Renew session on activity, but only save it once this fraction of
+# SESSION_COOKIE_AGE has passed since the last renewal (~1.4 days)
+SESSION_RENEWAL_FRACTION = 0.1
+# Serve session reads from the shared cache and write through to the
+# database. A per-process cache could keep serving a session that another
+# worker logged out, so without Redis sessions stay database only
+SESSION_ENGINE = (
+    "django.contrib.sessions.backends.cached_db"
+    if os.getenv("REDIS_URL")
+    else "django.contrib.sessions.backends.db"
+)
+
+# API authentication
+# Integrations should use API keys (ApiCredential). Basic auth still works
+# unless disabled, with verified credentials remembered briefly so the
+# password hash does not run on every request
+BASIC_AUTH_ENABLED = os.getenv("BASIC_AUTH_ENABLED", "True") == "True"
+BASIC_AUTH_CACHE_TIMEOUT = 60
+# API key last_used_at is written at most this often (seconds)
+API_KEY_LAST_USED_INTERVAL = 5 * 60
 
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
-    ],
+        "api.core.authentication.ApiKeyAuthentication",
+    ]
+    + (
+        ["api.core.authentication.CachedBasicAuthentication"]
+        if BASIC_AUTH_ENABLED
+        else []
+    ),
+    # Until the API key change this setting was read before it was defined,
+    # so DRF ran on its defaults. Those stay in effect below: every view sets
+    # its own permission_classes, but IsAuthenticated would close the API
+    # root, JSON-only would drop the browsable API and
+    # utils.custom_exception_handler would reshape every error body (and
+    # turn unhandled exceptions into 500 responses). Switch them separately
     "DEFAULT_PERMISSION_CLASSES": [
-        "rest_framework.permissions.IsAuthenticated",
+        "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",  # Force JSON even in DEBUG
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
-    "EXCEPTION_HANDLER": "api.utils.custom_exception_handler",
+    "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.openapi.AutoSchema",
 }
 
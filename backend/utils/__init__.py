@@ -1,13 +1,26 @@
 from .prettyPrint import pretty_print
 from .MethodNameMixin import MethodNameMixin
 from .formgenerator import FormPDFGenerator
-from .hash import signature_upload_path
+from .render_backends import RenderCancelled, RenderUnavailable
+from .hash import (
+    signature_upload_path,
+    signature_print_upload_path,
+    form_pdf_upload_path,
+    signed_pdf_upload_path,
+)
+from .signature import normalize_signature
 from .exception_handler import custom_exception_handler
 
 __all__ = [
     "pretty_print",
     "MethodNameMixin",
     "FormPDFGenerator",
+    "RenderCancelled",
+    "RenderUnavailable",
     "signature_upload_path",
+    "signature_print_upload_path",
+    "form_pdf_upload_path",
+    "signed_pdf_upload_path",
+    "normalize_signature",
     "custom_exception_handler"
 ]
@@ -0,0 +1,174 @@
+"""
+Circuit breaker for calls that can fail or slow down as a whole
+
+While closed every call goes through. After `failures` failed or slow
+calls in a row the breaker trips open and refuses calls for
+`reset_seconds`, so callers fail fast instead of piling up behind a
+broken dependency. After that a single call is let through as a probe:
+its success closes the breaker, its failure opens it again.
+
+State and metrics live in the default cache. With a shared cache (Redis)
+all workers see the same breaker, with the local memory cache each
+process keeps its own.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+from utils.prettyPrint import pretty_print
+
+
+class CircuitBreaker:
+    """
+    Breaker named `name`, see the module docstring
+
+    Args:
+        name: Name the cache keys and log lines use
+        failures: Failed or slow calls in a row that trip the breaker
+        reset_seconds: How long a tripped breaker refuses calls
+        slow_seconds: Successful calls taking longer count as failures
+        probe_seconds: How long a probe may run before another is let through
+    """
+
+    KEY = "breaker:{name}:{field}"
+
+    def __init__(self, name, failures, reset_seconds, slow_seconds, probe_seconds):
+        self.name = name
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.slow_seconds = slow_seconds
+        self.probe_seconds = probe_seconds
+
+    def _key(self, field):
+        return self.KEY.format(name=self.name, field=field)
+
+    def _incr(self, field, timeout=None):
+        key = self._key(field)
+        cache.add(key, 0, timeout)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # evicted between add and incr
+            cache.set(key, 1, timeout)
+            return 1
+
+    def allow(self):
+        """
+        Whether a call may go ahead now
+
+        Counts refused calls in the "rejected" metric. Once the breaker
+        has been open for reset_seconds the first caller gets True as the
+        probe and everyone else keeps getting False until it is settled.
+        """
+        open_until = cache.get(self._key("open_until"))
+        if open_until is None:
+            return True
+        if time.time() >= open_until and cache.add(
+            self._key("probe"), 1, self.probe_seconds
+        ):
+            return True
+        self._incr("rejected")
+        return False
+
+    def retry_after(self):
+        """Seconds until the breaker lets a call through again"""
+        open_until = cache.get(self._key("open_until"))
+        if open_until is None:
+            return 0
+        return max(1, int(open_until - time.time() + 0.5))
+
+    def record(self, succeeded, duration, key=None):
+        """
+        Settle a call that allow() let through
+
+        Args:
+            succeeded: Whether the call produced its result
+            duration: Seconds the call took
+            key: Optional name of the input the call worked on. A key that
+                already failed or was slow within reset_seconds is not
+                counted again, so one bad input retried cannot trip the
+                breaker on its own
+        """
+        if succeeded and duration <= self.slow_seconds:
+            if cache.get(self._key("open_until")) is not None:
+                pretty_print(f"Circuit breaker {self.name} closed", "INFO")
+            cache.delete_many(
+                [self._key("failures"), self._key("open_until"), self._key("probe")]
+            )
+            return
+
+        if key is not None and not cache.add(
+            self._key(f"failed:{key}"), 1, self.reset_seconds
+        ):
+            self.release()
+            return
+
+        reason = "failed" if not succeeded else f"took {duration:.1f}s"
+        open_until = cache.get(self._key("open_until"))
+        if open_until is not None:
+            # a call started before the breaker tripped is no evidence,
+            # a probe (or any call after the reset) reopens it
+            if time.time() >= open_until:
+                self._trip(f"probe {reason}")
+            return
+        if self._incr("failures") >= self.failures:
+            self._trip(
+                f"{self.failures} calls in a row failed or were slow, last {reason}"
+            )
+
+    def release(self):
+        """Let another probe through, for a call that ended without an outcome"""
+        cache.delete(self._key("probe"))
+
+    def _trip(self, reason):
+        cache.set(self._key("open_until"), time.time() + self.reset_seconds, None)
+        cache.delete_many([self._key("failures"), self._key("probe")])
+        self._incr("trips")
+        cache.set(
+            self._key("last_trip"),
+            {"at": timezone.now().isoformat(), "reason": reason},
+            None,
+        )
+        pretty_print(
+            f"Circuit breaker {self.name} opened for {self.reset_seconds}s: {reason}",
+            "WARNING",
+        )
+
+    def stats(self):
+        """
+        Current state and metrics of the breaker
+
+        Returns:
+            Dictionary with state ("closed", "open" or "half_open"), the
+            failures in a row, how often it tripped and refused calls, and
+            when and why it last tripped
+        """
+        values = cache.get_many(
+            [
+                self._key(field)
+                for field in (
+                    "open_until",
+                    "failures",
+                    "trips",
+                    "rejected",
+                    "last_trip",
+                )
+            ]
+        )
+        open_until = values.get(self._key("open_until"))
+        if open_until is None:
+            state = "closed"
+        elif time.time() < open_until:
+            state = "open"
+        else:
+            state = "half_open"
+        return {
+            "name": self.name,
+            "state": state,
+            "retry_after": self.retry_after() if state == "open" else 0,
+            "failures": values.get(self._key("failures"), 0),
+            "trips": values.get(self._key("trips"), 0),
+            "rejected": values.get(self._key("rejected"), 0),
+            "last_trip": values.get(self._key("last_trip")),
+        }
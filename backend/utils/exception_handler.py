@@ -2,12 +2,15 @@ from django.core.cache import cache
 from rest_framework import status
 from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
-from rest_framework.views import exception_handler
 
 from .prettyPrint import pretty_print
 
 
 def custom_exception_handler(exc, context):
+    # imported here because rest_framework.views reads REST_FRAMEWORK when it
+    # loads, and config.settings imports utils before defining it
+    from rest_framework.views import exception_handler
+
     # Default exception handling
     response = exception_handler(exc, context)
 
@@ -0,0 +1,339 @@
+import re
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+
+class FormDataValidator:
+    """
+    form_data validator compiled from a FormTemplate.field_schema
+
+    The schema is walked once: every field becomes a (name, checks) entry
+    with its regexes compiled and its options turned into sets, so
+    validating a submission is a loop over prepared checks. All problems are
+    collected instead of stopping at the first one.
+
+    Field keys understood on top of name, type and required:
+        options: Allowed values of radio/select fields, strings or
+            {"value", "label"} objects
+        min_length, max_length: Bounds on text length
+        pattern: Regular expression the whole value must match
+        minimum, maximum: Bounds of number fields
+        required_if: {"field": name, "equals": value} or
+            {"field": name, "in": [values]}, required when it holds
+        subfields: Boxes of a checkboxGroup, checked ones are true
+        text_field: For a checkboxGroup, the form_data object holding the
+            text typed next to each checked box (e.g. initials), which must
+            then be non-blank
+
+    Keys in form_data that are not in the schema are left alone.
+    """
+
+    TEXT_TYPES = ("text", "textarea", "email", "tel", "date")
+
+    def __init__(self, schema):
+        fields = schema.get("fields", []) if isinstance(schema, dict) else None
+        if not isinstance(fields, list):
+            raise ValueError("Schema 'fields' key is not a list")
+        self.fields = [
+            self._compile_field(field)
+            for field in fields
+            if isinstance(field, dict) and field.get("name")
+        ]
+
+    def validate(self, form_data):
+        """
+        Check form_data against the compiled schema
+
+        Args:
+            form_data: The user-submitted form data
+
+        Returns:
+            Dictionary of field name to a list of error messages, empty when
+            the data is valid
+        """
+        if not isinstance(form_data, dict):
+            return {"form_data": ["Form data must be an object"]}
+
+        errors = {}
+        for name, required, condition, checks in self.fields:
+            value = form_data.get(name)
+            if self._is_blank(value):
+                if required or (condition and condition(form_data)):
+                    errors[name] = ["This field is required"]
+                continue
+            messages = [
+                message
+                for check in checks
+                if (message := check(value, form_data)) is not None
+            ]
+            if messages:
+                errors[name] = messages
+        return errors
+
+    @staticmethod
+    def _is_blank(value):
+        if value is None or value is False:
+            return True
+        if isinstance(value, str):
+            return not value.strip()
+        if isinstance(value, dict):
+            # a checkbox group with nothing checked
+            return not any(value.values())
+        if isinstance(value, list):
+            return not value
+        return False
+
+    def _compile_field(self, field):
+        """Turn one schema field into (name, required, condition, checks)"""
+        field_type = field.get("type", "text")
+        checks = []
+
+        if field_type in self.TEXT_TYPES:
+            checks.append(self._string_check())
+            checks.extend(self._length_checks(field))
+            if field.get("pattern"):
+                checks.append(self._pattern_check(field["pattern"]))
+            if field_type == "email":
+                checks.append(self._email_check())
+            elif field_type == "date":
+                checks.append(self._date_check())
+        elif field_type in ("radio", "select"):
+            checks.append(self._option_check(field.get("options") or []))
+        elif field_type == "number":
+            checks.append(
+                self._number_check(field.get("minimum"), field.get("maximum"))
+            )
+        elif field_type == "checkbox":
+            checks.append(self._boolean_check())
+        elif field_type == "checkboxGroup":
+            checks.append(
+                self._group_check(field.get("subfields") or [], field.get("text_field"))
+            )
+        # file, hidden and unknown types are not checked beyond being required
+
+        return (
+            field["name"],
+            bool(field.get("required", False)),
+            self._compile_condition(field.get("required_if")),
+            tuple(checks),
+        )
+
+    @staticmethod
+    def _compile_condition(rule):
+        if not isinstance(rule, dict) or not rule.get("field"):
+            return None
+        other = rule["field"]
+        if "in" in rule:
+            values = frozenset(str(value) for value in rule["in"])
+            return lambda form_data: str(form_data.get(other)) in values
+        if "equals" in rule:
+            expected = rule["equals"]
+            return lambda form_data: form_data.get(other) == expected
+        # no value given, required whenever the other field is filled in
+        return lambda form_data: not FormDataValidator._is_blank(form_data.get(other))
+
+    @staticmethod
+    def _string_check():
+        def check(value, form_data):
+            if not isinstance(value, str):
+                return "Must be text"
+
+        return check
+
+    @staticmethod
+    def _length_checks(field):
+        checks = []
+        min_length = field.get("min_length")
+        max_length = field.get("max_length")
+        if min_length is not None:
+
+            def check_min(value, form_data):
+                if isinstance(value, str) and len(value.strip()) < min_length:
+                    return f"Must be at least {min_length} characters"
+
+            checks.append(check_min)
+        if max_length is not None:
+
+            def check_max(value, form_data):
+                if isinstance(value, str) and len(value) > max_length:
+                    return f"Must be at most {max_length} characters"
+
+            checks.append(check_max)
+        return checks
+
+    @staticmethod
+    def _pattern_check(pattern):
+        regex = re.compile(pattern)
+
+        def check(value, form_data):
+            if isinstance(value, str) and not regex.fullmatch(value.strip()):
+                return "Invalid format"
+
+        return check
+
+    @staticmethod
+    def _email_check():
+        def check(value, form_data):
+            if not isinstance(value, str):
+                return None
+            try:
+                validate_email(value.strip())
+            except ValidationError:
+                return "Enter a valid email address"
+
+        return check
+
+    @staticmethod
+    def _date_check():
+        def check(value, form_data):
+            if not isinstance(value, str):
+                return None
+            try:
+                date.fromisoformat(value.strip())
+            except ValueError:
+                return "Enter a valid date (YYYY-MM-DD)"
+
+        return check
+
+    @staticmethod
+    def _option_check(options):
+        allowed = frozenset(
+            str(option.get("value")) if isinstance(option, dict) else str(option)
+            for option in options
+        )
+        choices = ", ".join(sorted(allowed))
+
+        def check(value, form_data):
+            if allowed and str(value) not in allowed:
+                return f"Must be one of: {choices}"
+
+        return check
+
+    @staticmethod
+    def _number_check(minimum, maximum):
+        def check(value, form_data):
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return "Must be a number"
+            if minimum is not None and number < minimum:
+                return f"Must be at least {minimum}"
+            if maximum is not None and number > maximum:
+                return f"Must be at most {maximum}"
+
+        return check
+
+    @staticmethod
+    def _boolean_check():
+        def check(value, form_data):
+            if not isinstance(value, bool):
+                return "Must be true or false"
+
+        return check
+
+    @staticmethod
+    def _group_check(subfields, text_field):
+        boxes = {
+            subfield["name"]: subfield.get("max_length")
+            for subfield in subfields
+            if isinstance(subfield, dict) and subfield.get("name")
+        }
+
+        def check(value, form_data):
+            if not isinstance(value, dict):
+                return "Must be an object of checked options"
+            unknown = [key for key in value if key not in boxes]
+            if unknown:
+                return f"Unknown options: {', '.join(sorted(unknown))}"
+            if any(not isinstance(checked, bool) for checked in value.values()):
+                return "Options must be true or false"
+            if not text_field:
+                return None
+
+            texts = form_data.get(text_field)
+            texts = texts if isinstance(texts, dict) else {}
+            missing, too_long = [], []
+            for key, checked in value.items():
+                if not checked:
+                    continue
+                text = texts.get(key)
+                if not isinstance(text, str) or not text.strip():
+                    missing.append(key)
+                elif boxes[key] is not None and len(text.strip()) > boxes[key]:
+                    too_long.append(key)
+            if missing:
+                return f"Text required for checked options: {', '.join(missing)}"
+            if too_long:
+                return f"Text too long for: {', '.join(too_long)}"
+
+        return check
+
+
+def example_form_data(schema):
+    """
+    A form_data that fills in every field of a schema, for benchmarks
+
+    Args:
+        schema: A FormTemplate.field_schema
+
+    Returns:
+        Dictionary of form field values
+    """
+    form_data = {}
+    for field in schema["fields"]:
+        name, field_type = field.get("name"), field.get("type", "text")
+        if field_type in ("radio", "select") and field.get("options"):
+            option = field["options"][0]
+            form_data[name] = (
+                option.get("value") if isinstance(option, dict) else option
+            )
+        elif field_type == "checkboxGroup":
+            boxes = [subfield["name"] for subfield in field.get("subfields", [])]
+            form_data[name] = {box: True for box in boxes}
+            if field.get("text_field"):
+                form_data[field["text_field"]] = {box: "AB" for box in boxes}
+        elif field_type == "email":
+            form_data[name] = "student@example.edu"
+        elif field.get("pattern"):
+            # the default schemas only use patterns for years
+            form_data[name] = "2025"
+        elif field_type in ("file", "hidden"):
+            # hidden fields are filled by the field they belong to
+            continue
+        else:
+            form_data[name] = "example"
+    return form_data
+
+
+# compiled validators by template id, with the updated_at they were built from
+_validators = {}
+
+
+def get_form_validator(form_template):
+    """
+    Compiled validator of a template, rebuilt when the template changes
+
+    Cached per process on the template id and updated_at, so every save of
+    the template (which bumps updated_at) recompiles on next use.
+
+    Args:
+        form_template: The FormTemplate whose field_schema to validate against
+
+    Returns:
+        FormDataValidator
+
+    Raises:
+        ValueError: The template has no usable schema
+    """
+    cached = _validators.get(form_template.pk)
+    if cached is not None and cached[0] == form_template.updated_at:
+        return cached[1]
+    if not form_template.field_schema or not isinstance(
+        form_template.field_schema, dict
+    ):
+        raise ValueError(f"No schema for form template {form_template.name}")
+    validator = FormDataValidator(form_template.field_schema)
+    _validators[form_template.pk] = (form_template.updated_at, validator)
+    return validator
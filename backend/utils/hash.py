@@ -1,5 +1,49 @@
+import hashlib
+import posixpath
+
+
 def signature_upload_path(instance, filename):
     # get file extension
     ext = filename.split(".")[-1]
     # create deterministic filename using userID
     return f"signatures/user_{instance.id}_signature.{ext}"
+
+
+def signature_print_upload_path(instance, filename):
+    # print-ready derivative is always a PNG stored next to the original
+    return f"signatures/user_{instance.id}_signature_print.png"
+
+
+def sharded_path(prefix, key, filename):
+    """
+    Spread files over prefix/xx/yy/ directories by the hash of a key
+
+    Two levels of 256 directories keep each one small however many files
+    are stored, while every file sharing a key lands in the same directory.
+
+    Args:
+        prefix: Top directory, e.g. "forms/form_pdfs"
+        key: What to shard by, usually the submission identifier
+        filename: Name of the file, any directories in it are dropped
+    """
+    digest = hashlib.sha1(str(key).encode()).hexdigest()
+    return f"{prefix}/{digest[:2]}/{digest[2:4]}/{posixpath.basename(filename)}"
+
+
+def _submission_identifier(submission):
+    # a missing identifier raises RelatedObjectDoesNotExist, an AttributeError
+    identifier = getattr(submission, "submission_identifier", None)
+    return identifier.identifier if identifier else None
+
+
+def form_pdf_upload_path(instance, filename):
+    # PDFs of a submission, sharded by its identifier once it has one
+    key = _submission_identifier(instance) or posixpath.basename(filename)
+    return sharded_path("forms/form_pdfs", key, filename)
+
+
+def signed_pdf_upload_path(instance, filename):
+    # signed copies, sharded like the PDFs of their submission
+    submission = instance.form_submission
+    key = _submission_identifier(submission) or posixpath.basename(filename)
+    return sharded_path("forms/signed_pdfs", key, filename)
@@ -0,0 +1,177 @@
+import asyncio
+import contextlib
+import fcntl
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+
+
+class WorkspaceBusy(Exception):
+    """No compile workspace became free in time"""
+
+
+class Workspace:
+    """
+    One reusable compile directory of a WorkspacePool
+
+    Held through an exclusive flock on a lock file next to the directory,
+    so it is never shared between threads or worker processes and is freed
+    by the kernel if its holder dies.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock_file = None
+
+    def try_lock(self):
+        """Take the workspace if no one else holds it"""
+        lock_file = open(f"{self.path}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        try:
+            # the directory may have gone (tmpfs cleared) or still hold the
+            # files of a holder that died mid-compile
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            self.clean()
+        except Exception:
+            self._unlock()
+            raise
+        return True
+
+    def release(self):
+        """Clean up after a compile and let the next one in"""
+        try:
+            self.clean()
+        finally:
+            self._unlock()
+
+    def _unlock(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+        self._lock_file = None
+
+    def clean(self):
+        """Remove what the last compile left, keeping the directory itself"""
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def usage(self):
+        """Bytes currently stored in the workspace"""
+        total = 0
+        for directory, _, files in os.walk(self.path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(directory, name)).st_size
+                except FileNotFoundError:
+                    continue
+        return total
+
+    def over_cap(self):
+        """True once the files in the workspace exceed max_bytes"""
+        return self.usage() > self.max_bytes
+
+
+class WorkspacePool:
+    """
+    Fixed set of compile directories kept on a RAM-backed filesystem
+
+    pdflatex writes its .tex, .aux, .log and .pdf into a workspace taken
+    from the pool instead of a fresh temporary directory on disk. With the
+    root on tmpfs (/dev/shm by default) compile I/O never reaches the disk,
+    and reusing the directories saves creating and tearing one down per
+    compile. Worker processes configured with the same root share the
+    pool; at most `size` compiles run at once and later ones wait for a
+    free workspace. Each workspace is limited to max_bytes, see
+    Workspace.over_cap.
+    """
+
+    # seconds between attempts while every workspace is taken
+    POLL_SECONDS = 0.05
+
+    def __init__(self, root=None, size=None, max_bytes=None, wait_seconds=None):
+        self.root = root or getattr(
+            settings,
+            "LATEX_WORKSPACE_ROOT",
+            os.path.join(tempfile.gettempdir(), "picton-latex"),
+        )
+        size = size or getattr(settings, "LATEX_WORKSPACE_COUNT", os.cpu_count() or 1)
+        max_bytes = max_bytes or getattr(
+            settings, "LATEX_WORKSPACE_MAX_BYTES", 32 * 1024 * 1024
+        )
+        self.wait_seconds = wait_seconds or getattr(
+            settings, "LATEX_WORKSPACE_WAIT_SECONDS", 30
+        )
+        self.workspaces = [
+            Workspace(os.path.join(self.root, f"ws-{number}"), max_bytes)
+            for number in range(size)
+        ]
+        for workspace in self.workspaces:
+            os.makedirs(workspace.path, mode=0o700, exist_ok=True)
+
+    def _try_acquire(self):
+        # start at a random workspace so waiting workers don't all contend
+        # for the first one
+        offset = random.randrange(len(self.workspaces))
+        for index in range(len(self.workspaces)):
+            workspace = self.workspaces[(offset + index) % len(self.workspaces)]
+            if workspace.try_lock():
+                return workspace
+        return None
+
+    @contextlib.contextmanager
+    def acquire(self):
+        """
+        Hold a free workspace for the duration of the block
+
+        Raises:
+            WorkspaceBusy: None became free within wait_seconds
+        """
+        deadline = time.monotonic() + self.wait_seconds
+        while (workspace := self._try_acquire()) is None:
+            if time.monotonic() > deadline:
+                raise WorkspaceBusy(f"No free LaTeX workspace in {self.root}")
+            time.sleep(self.POLL_SECONDS)
+        try:
+            yield workspace
+        finally:
+            workspace.release()
+
+    @contextlib.asynccontextmanager
+    async def aacquire(self):
+        """Async variant of acquire, waits without blocking the event loop"""
+        deadline = time.monotonic() + self.wait_seconds
+        while (workspace := self._try_acquire()) is None:
+            if time.monotonic() > deadline:
+                raise WorkspaceBusy(f"No free LaTeX workspace in {self.root}")
+            await asyncio.sleep(self.POLL_SECONDS)
+        try:
+            yield workspace
+        finally:
+            workspace.release()
+
+
+_pool = None
+
+
+def get_workspace_pool():
+    """The process wide WorkspacePool, created on first use"""
+    global _pool
+    if _pool is None:
+        _pool = WorkspacePool()
+    return _pool
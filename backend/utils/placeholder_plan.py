@@ -0,0 +1,253 @@
+import re
+from datetime import date
+
+CHECKED = "\\checkmark"
+UNCHECKED = "\\square"
+
+# $NAME$ tokens of the LaTeX templates
+PLACEHOLDER_PATTERN = re.compile(r"\$[A-Za-z_]+\$")
+
+
+def format_phone_number(phone_number):
+    """
+    Format phone number for display
+
+    Cleans and formats a phone number to the standard (XXX) XXX-XXXX format
+    if possible, otherwise returns the original string.
+    """
+    if not phone_number:
+        return ""
+    # Remove all non-numeric characters
+    cleaned = "".join(filter(str.isdigit, str(phone_number)))
+    # Format as (XXX) XXX-XXXX
+    if len(cleaned) == 10:
+        return f"({cleaned[:3]}) {cleaned[3:6]}-{cleaned[6:]}"
+    return str(phone_number)
+
+
+def format_date(value):
+    """ISO dates as MM/DD/YYYY, anything else as is"""
+    if not value:
+        return ""
+    try:
+        return date.fromisoformat(str(value)).strftime("%m/%d/%Y")
+    except ValueError:
+        return str(value)
+
+
+def format_text(value):
+    return "" if value is None else str(value)
+
+
+def format_year(value):
+    """The year as is, the current year when missing"""
+    if value is None or value == "":
+        return str(date.today().year)
+    return str(value)
+
+
+VALUE_FORMATTERS = {
+    "text": format_text,
+    "phone": format_phone_number,
+    "date": format_date,
+    "year": format_year,
+}
+
+
+class PlaceholderPlan:
+    """
+    Placeholder values of a form template, compiled from its field_schema
+
+    Fields map themselves to placeholders of the LaTeX template (names
+    without the surrounding $). The keys are prefixed with latex_ where the
+    frontend reads the plain name (placeholder is the input hint there):
+        latex_placeholder: The placeholder receiving the field's value
+        format: text (default), phone, date, year (current year when blank)
+            or checkbox (a boolean field)
+        default: Value used when the field is missing or blank
+        fallback: Attribute of the submitting user used when it is blank
+        latex_placeholders: For radio and checkboxGroup fields, option or
+            subfield name to placeholder. Radio options render a checkbox;
+            checkbox group boxes render the text typed next to them when the
+            group has a text_field (initials), a checkbox otherwise
+
+    The schema is compiled once per template version into a flat tuple of
+    (placeholder, field, formatter) steps, so filling a document is one
+    loop over precomputed entries. Templates whose schema maps nothing fall
+    back to matching field names against the placeholders found in the
+    LaTeX source (FIELD_NAME, FIELDNAME or FieldName), also resolved once.
+    The field (and option) label of every placeholder is kept in labels for
+    renderers that lay the form out themselves.
+
+    Example:
+        {"name": "phone_number", "type": "text",
+         "latex_placeholder": "PHONE_NUMBER", "format": "phone",
+         "fallback": "phone_number"}
+        {"name": "season", "type": "radio", "options": ["Fall", "Spring"],
+         "latex_placeholders": {"Fall": "FALL_SELECTED",
+                                "Spring": "SPRING_SELECTED"}}
+    """
+
+    def __init__(self, schema, template_content=""):
+        fields = schema.get("fields", []) if isinstance(schema, dict) else []
+        fields = [
+            field for field in fields if isinstance(field, dict) and field.get("name")
+        ]
+        steps, fallbacks, labels = [], [], {}
+        if any(
+            "latex_placeholder" in field or "latex_placeholders" in field
+            for field in fields
+        ):
+            for field in fields:
+                self._compile_field(field, steps, fallbacks, labels)
+        else:
+            self._match_template(fields, template_content, steps, labels)
+        self.steps = tuple(steps)
+        self.fallbacks = tuple(fallbacks)
+        self.labels = labels
+
+    def fill(self, form_data, user, replacements):
+        """
+        Add the placeholder values of form_data to replacements
+
+        Args:
+            form_data: Dictionary containing form field values
+            user: The User submitting the form, for fallback values
+            replacements: Dictionary of "$PLACEHOLDER$" to value to add to
+        """
+        for placeholder, name, formatter in self.steps:
+            replacements[placeholder] = formatter(form_data.get(name), form_data)
+        for placeholder, attribute, formatter in self.fallbacks:
+            if not replacements[placeholder]:
+                replacements[placeholder] = formatter(
+                    getattr(user, attribute, ""), form_data
+                )
+
+    @staticmethod
+    def _compile_field(field, steps, fallbacks, labels):
+        name = field["name"]
+        label = field.get("label") or _humanize(name)
+        if field.get("latex_placeholder"):
+            placeholder = f"${field['latex_placeholder']}$"
+            labels[placeholder] = label
+            if field.get("format") == "checkbox":
+                formatter = _checkbox()
+            else:
+                formatter = _value(
+                    VALUE_FORMATTERS[field.get("format", "text")], field.get("default")
+                )
+            steps.append((placeholder, name, formatter))
+            if field.get("fallback"):
+                fallbacks.append((placeholder, field["fallback"], formatter))
+
+        text_field = field.get("text_field")
+        option_labels = {
+            str(option.get("value", option.get("name"))): option.get("label")
+            for option in (field.get("options") or []) + (field.get("subfields") or [])
+            if isinstance(option, dict)
+        }
+        for option, placeholder in (field.get("latex_placeholders") or {}).items():
+            labels[
+                f"${placeholder}$"
+            ] = f"{label}: {option_labels.get(option) or _humanize(option)}"
+            if field.get("type") == "checkboxGroup":
+                formatter = (
+                    _group_text(option, text_field)
+                    if text_field
+                    else _group_checkbox(option)
+                )
+            else:
+                formatter = _option_checkbox(option)
+            steps.append((f"${placeholder}$", name, formatter))
+
+    @staticmethod
+    def _match_template(fields, template_content, steps, labels):
+        found = {match[1:-1] for match in PLACEHOLDER_PATTERN.findall(template_content)}
+        for field in fields:
+            name = field["name"]
+            candidates = dict.fromkeys(
+                (
+                    name.upper(),
+                    name.replace("_", "").upper(),
+                    name.title().replace("_", ""),
+                )
+            )
+            for candidate in candidates:
+                if candidate in found:
+                    formatter = (
+                        _checkbox()
+                        if field.get("type") == "checkbox"
+                        else _value(format_text, None)
+                    )
+                    steps.append((f"${candidate}$", name, formatter))
+                    labels[f"${candidate}$"] = field.get("label") or _humanize(name)
+
+
+def _humanize(name):
+    """first_name or FIRST_NAME as First name"""
+    return str(name).replace("_", " ").strip().capitalize()
+
+
+def _value(format_value, default):
+    if default is None:
+        return lambda value, form_data: format_value(value)
+
+    def formatter(value, form_data):
+        if value is None or value == "":
+            value = default
+        return format_value(value)
+
+    return formatter
+
+
+def _checkbox():
+    return lambda value, form_data: CHECKED if value is True else UNCHECKED
+
+
+def _option_checkbox(option):
+    option = str(option).lower()
+    return lambda value, form_data: (
+        CHECKED if str(value).lower() == option else UNCHECKED
+    )
+
+
+def _group_checkbox(box):
+    def formatter(value, form_data):
+        return CHECKED if isinstance(value, dict) and value.get(box) else UNCHECKED
+
+    return formatter
+
+
+def _group_text(box, text_field):
+    def formatter(value, form_data):
+        texts = form_data.get(text_field)
+        if isinstance(value, dict) and value.get(box) and isinstance(texts, dict):
+            return str(texts.get(box) or " ")
+        return " "
+
+    return formatter
+
+
+# compiled plans by template id, with the updated_at and LaTeX file they
+# were built from
+_plans = {}
+
+
+def get_placeholder_plan(form_template, template_content):
+    """
+    Compiled placeholder plan of a template, rebuilt when the template changes
+
+    Args:
+        form_template: The FormTemplate to fill
+        template_content: Its LaTeX source, only read when compiling
+
+    Returns:
+        PlaceholderPlan
+    """
+    version = (form_template.updated_at, form_template.latex_template_path)
+    cached = _plans.get(form_template.pk)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    plan = PlaceholderPlan(form_template.field_schema, template_content)
+    _plans[form_template.pk] = (version, plan)
+    return plan
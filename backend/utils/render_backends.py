@@ -0,0 +1,609 @@
+import asyncio
+import hashlib
+import os
+import resource
+import signal
+import subprocess
+import textwrap
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.latex_workspace import WorkspaceBusy, get_workspace_pool
+from utils.placeholder_plan import CHECKED, PLACEHOLDER_PATTERN, UNCHECKED
+from utils.prettyPrint import pretty_print
+
+
+class RenderCancelled(Exception):
+    """A compile was stopped because its result is no longer wanted"""
+
+
+class RenderUnavailable(Exception):
+    """
+    Rendering is refused for now because recent renders failed or were slow
+
+    Attributes:
+        retry_after: Seconds until rendering is tried again
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f"PDF rendering is unavailable for {retry_after}s")
+        self.retry_after = retry_after
+
+
+class FormDocument:
+    """
+    A form filled in for rendering
+
+    Holds the LaTeX source of the template together with the value of every
+    placeholder, so each backend can lay out the same data its own way.
+
+    Attributes:
+        form_template: The FormTemplate being rendered
+        source: LaTeX source of the template, placeholders not yet replaced
+        values: Dictionary of "$PLACEHOLDER$" to its LaTeX ready value
+        labels: Dictionary of "$PLACEHOLDER$" to the form label it shows
+    """
+
+    def __init__(self, form_template, source, values, labels=None):
+        self.form_template = form_template
+        self.source = source
+        self.values = values
+        self.labels = labels or {}
+
+    def latex(self):
+        """The template source with every known placeholder replaced"""
+        return PLACEHOLDER_PATTERN.sub(
+            lambda match: str(self.values.get(match.group(0), match.group(0))),
+            self.source,
+        )
+
+    def placeholders(self):
+        """Placeholders of the template in document order, without repeats"""
+        return list(dict.fromkeys(PLACEHOLDER_PATTERN.findall(self.source)))
+
+
+class RenderBackend:
+    """
+    Turns a FormDocument into a PDF
+
+    Backends set in_process to False when they run an external program, the
+    preview views only coalesce and cancel those since in-process renders
+    finish faster than a debounce would wait.
+    """
+
+    name = None
+    in_process = True
+
+    def render(self, document, is_stale=None):
+        """
+        Render a document
+
+        Args:
+            document: The FormDocument to render
+            is_stale: Optional callable, backends that can stop a running
+                render do so once it returns True
+
+        Returns:
+            ContentFile containing the PDF or None if rendering fails
+
+        Raises:
+            RenderCancelled: is_stale returned True
+        """
+        raise NotImplementedError
+
+    async def arender(self, document, is_stale=None):
+        """
+        Async variant of render, is_stale is a coroutine function
+
+        In-process backends are quick enough to run on the event loop.
+        """
+        return self.render(document)
+
+
+class LatexBackend(RenderBackend):
+    """
+    The official rendering: the filled template compiled by pdflatex
+
+    Compiles run in a workspace of the LaTeX workspace pool (see
+    utils.latex_workspace), RAM-backed and reused between compiles. Each
+    pdflatex run is limited in wall time, CPU time, memory and file size
+    (LATEX_COMPILE_* settings), and a circuit breaker refuses compiles
+    with RenderUnavailable while they keep failing or running slow.
+
+    Only failures of the compile setup count against the breaker: no
+    pdflatex, no free workspace, an OSError. A document that does not
+    compile or breaks a limit fails on its own, and a timeout or slow
+    compile counts once per document, so only many documents running
+    slow trip it.
+    """
+
+    name = "latex"
+    in_process = False
+
+    # why a compile produced no PDF, see _settle
+    UNAVAILABLE = "unavailable"
+    DOCUMENT_FAILED = "document_failed"
+    TIMED_OUT = "timed_out"
+
+    # how often a running compile checks whether it was cancelled, outgrew
+    # its workspace or ran out of time (seconds)
+    POLL_SECONDS = 0.1
+
+    def __init__(self):
+        # saves the LaTeX source of failed compiles for debugging,
+        # set this to True in your env file in order to test
+        self.DEBUG_PDF = os.getenv("DEBUG_PDF")
+        # state is kept in the cache, so every instance shares it
+        self.breaker = CircuitBreaker(
+            "latex",
+            failures=settings.LATEX_BREAKER_FAILURES,
+            reset_seconds=settings.LATEX_BREAKER_RESET_SECONDS,
+            slow_seconds=settings.LATEX_BREAKER_SLOW_SECONDS,
+            probe_seconds=settings.LATEX_COMPILE_TIMEOUT_SECONDS
+            + settings.LATEX_WORKSPACE_WAIT_SECONDS,
+        )
+
+    def render(self, document, is_stale=None):
+        return self.compile(document.latex(), is_stale)
+
+    async def arender(self, document, is_stale=None):
+        return await self.acompile(document.latex(), is_stale)
+
+    def compile(self, content, is_stale=None):
+        """
+        Compile LaTeX content to PDF
+
+        Uses pdflatex to compile the LaTeX content into a PDF document.
+        Handles error conditions and provides debugging information when
+        compilation fails.
+
+        Args:
+            content: String containing the LaTeX content to compile
+            is_stale: Optional callable, pdflatex is killed once it returns True
+
+        Returns:
+            ContentFile containing the PDF or None if compilation fails
+
+        Raises:
+            RenderCancelled: is_stale returned True
+            RenderUnavailable: The circuit breaker is open
+        """
+        self._admit()
+        started = time.monotonic()
+        try:
+            pdf_file, failure = self._compile(content, is_stale)
+        except RenderCancelled:
+            self.breaker.release()
+            raise
+        except Exception:
+            self._settle(content, self.UNAVAILABLE, time.monotonic() - started)
+            raise
+        self._settle(content, failure, time.monotonic() - started)
+        return pdf_file
+
+    def _compile(self, content, is_stale):
+        """Run pdflatex, returns the PDF (or None) and why it failed (or None)"""
+        try:
+            with get_workspace_pool().acquire() as workspace:
+                tex_file = self._write_tex_file(workspace.path, content)
+
+                # Run pdflatex with better error handling
+                try:
+                    process = subprocess.Popen(
+                        ["pdflatex", "-interaction=nonstopmode", tex_file],
+                        cwd=workspace.path,
+                        # the transcript is in document.log, a runaway
+                        # document must not fill our memory with it
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.PIPE,
+                        text=True,  # Get output as text for easier logging
+                        # own process group, so cancelling also stops its helpers
+                        start_new_session=True,
+                    )
+                except Exception as e:
+                    pretty_print(
+                        f"Exception during LaTeX compilation: {str(e)}", "ERROR"
+                    )
+                    return None, self.UNAVAILABLE
+
+                self._limit(process.pid)
+                deadline = time.monotonic() + settings.LATEX_COMPILE_TIMEOUT_SECONDS
+                with process:
+                    while True:
+                        try:
+                            _, stderr = process.communicate(timeout=self.POLL_SECONDS)
+                            break
+                        except subprocess.TimeoutExpired:
+                            if is_stale and is_stale():
+                                self._kill(process)
+                                process.communicate()
+                                raise RenderCancelled()
+                            failure = self._stopped(workspace, deadline)
+                            if failure:
+                                self._kill(process)
+                                process.communicate()
+                                return None, failure
+
+                return self._collect_pdf(
+                    workspace.path, process.returncode, stderr, content
+                )
+        except WorkspaceBusy as e:
+            pretty_print(f"LaTeX compilation not started: {str(e)}", "ERROR")
+            return None, self.UNAVAILABLE
+
+    async def acompile(self, content, is_stale=None):
+        """
+        Async variant of compile
+
+        Awaits pdflatex as an asyncio subprocess so an ASGI worker can keep
+        serving other requests while the document compiles.
+
+        Args:
+            content: String containing the LaTeX content to compile
+            is_stale: Optional coroutine function, pdflatex is killed once it
+                returns True
+
+        Returns:
+            ContentFile containing the PDF or None if compilation fails
+
+        Raises:
+            RenderCancelled: is_stale returned True
+            RenderUnavailable: The circuit breaker is open
+        """
+        await sync_to_async(self._admit)()
+        started = time.monotonic()
+        try:
+            pdf_file, failure = await self._acompile(content, is_stale)
+        except RenderCancelled:
+            await sync_to_async(self.breaker.release)()
+            raise
+        except Exception:
+            await sync_to_async(self._settle)(
+                content, self.UNAVAILABLE, time.monotonic() - started
+            )
+            raise
+        await sync_to_async(self._settle)(content, failure, time.monotonic() - started)
+        return pdf_file
+
+    async def _acompile(self, content, is_stale):
+        try:
+            async with get_workspace_pool().aacquire() as workspace:
+                tex_file = self._write_tex_file(workspace.path, content)
+
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        "pdflatex",
+                        "-interaction=nonstopmode",
+                        tex_file,
+                        cwd=workspace.path,
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.PIPE,
+                        start_new_session=True,
+                    )
+                except Exception as e:
+                    pretty_print(
+                        f"Exception during LaTeX compilation: {str(e)}", "ERROR"
+                    )
+                    return None, self.UNAVAILABLE
+
+                self._limit(process.pid)
+                deadline = time.monotonic() + settings.LATEX_COMPILE_TIMEOUT_SECONDS
+                output = asyncio.ensure_future(process.communicate())
+                while not output.done():
+                    await asyncio.wait({output}, timeout=self.POLL_SECONDS)
+                    if output.done():
+                        break
+                    if is_stale and await is_stale():
+                        self._kill(process)
+                        await output
+                        raise RenderCancelled()
+                    failure = self._stopped(workspace, deadline)
+                    if failure:
+                        self._kill(process)
+                        await output
+                        return None, failure
+
+                _, stderr = output.result()
+                return self._collect_pdf(
+                    workspace.path,
+                    process.returncode,
+                    stderr.decode(errors="replace"),
+                    content,
+                )
+        except WorkspaceBusy as e:
+            pretty_print(f"LaTeX compilation not started: {str(e)}", "ERROR")
+            return None, self.UNAVAILABLE
+
+    def _admit(self):
+        """Raise RenderUnavailable while the circuit breaker refuses compiles"""
+        if not self.breaker.allow():
+            raise RenderUnavailable(self.breaker.retry_after())
+
+    def _settle(self, content, failure, duration):
+        """
+        Tell the circuit breaker how a compile went
+
+        Args:
+            content: The LaTeX content compiled
+            failure: None, UNAVAILABLE, DOCUMENT_FAILED or TIMED_OUT
+            duration: Seconds the compile took
+        """
+        if failure == self.DOCUMENT_FAILED:
+            # pdflatex ran, the document is at fault
+            self.breaker.release()
+        elif failure == self.UNAVAILABLE:
+            self.breaker.record(False, duration)
+        else:
+            # timeouts and slow compiles count once per document
+            self.breaker.record(
+                failure is None,
+                duration,
+                key=hashlib.sha256(content.encode()).hexdigest(),
+            )
+
+    def _write_tex_file(self, directory, content):
+        """Write the LaTeX content into the compile directory and return its path"""
+        tex_file = os.path.join(directory, "document.tex")
+        with open(tex_file, "w") as f:
+            f.write(content)
+        return tex_file
+
+    @classmethod
+    def _stopped(cls, workspace, deadline):
+        """Why a running compile has to be stopped, or None to let it run"""
+        if cls._outgrown(workspace):
+            return cls.DOCUMENT_FAILED
+        if cls._timed_out(deadline):
+            return cls.TIMED_OUT
+        return None
+
+    @staticmethod
+    def _outgrown(workspace):
+        """Whether a running compile wrote more than its workspace may hold"""
+        if not workspace.over_cap():
+            return False
+        pretty_print(
+            f"LaTeX compilation stopped: more than {workspace.max_bytes} bytes "
+            f"written in {workspace.path}",
+            "ERROR",
+        )
+        return True
+
+    @staticmethod
+    def _timed_out(deadline):
+        """Whether a running compile is past its wall time limit"""
+        if time.monotonic() < deadline:
+            return False
+        pretty_print(
+            "LaTeX compilation stopped: still running after "
+            f"{settings.LATEX_COMPILE_TIMEOUT_SECONDS}s",
+            "ERROR",
+        )
+        return True
+
+    @staticmethod
+    def _limit(pid):
+        """
+        Apply the per-compile resource limits to a started pdflatex
+
+        CPU time, address space and the size of every file it writes are
+        capped, beyond them the kernel stops it. Set from here rather than
+        in a preexec_fn, which is unsafe in threaded workers; pdflatex runs
+        unlimited for only the moment between spawning and this call.
+        """
+        limits = (
+            (resource.RLIMIT_CPU, settings.LATEX_COMPILE_CPU_SECONDS),
+            (resource.RLIMIT_AS, settings.LATEX_COMPILE_MEMORY_BYTES),
+            (resource.RLIMIT_FSIZE, settings.LATEX_WORKSPACE_MAX_BYTES),
+            # no core dumps when a limit kills it
+            (resource.RLIMIT_CORE, 0),
+        )
+        try:
+            for limit, value in limits:
+                resource.prlimit(pid, limit, (value, value))
+        except ProcessLookupError:
+            # already exited
+            pass
+
+    @staticmethod
+    def _kill(process):
+        """Kill a pdflatex run along with anything it spawned"""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def _collect_pdf(self, directory, returncode, stderr, content):
+        """
+        Read the PDF produced by a pdflatex run
+
+        Logs compile errors (and saves the LaTeX source when DEBUG_PDF is set),
+        but still returns the PDF if pdflatex produced one despite errors,
+        unless a signal killed it.
+
+        Returns:
+            ContentFile containing the PDF or None if no usable PDF was
+            generated, and DOCUMENT_FAILED if it was not (or None)
+        """
+
+        # Check if the compilation was successful
+        if returncode != 0:
+            # Log detailed error output to help with debugging
+            pretty_print(
+                f"LaTeX compile error. Return code: {returncode}",
+                "ERROR",
+            )
+            pretty_print(
+                f"LaTeX stderr: {stderr[:500]}", "ERROR"
+            )  # Log first 500 chars of error
+
+            # Save the problematic LaTeX file for debugging if DEBUG_PDF is enabled
+            if self.DEBUG_PDF:
+                debug_file = os.path.join(settings.BASE_DIR, "debug_latex.tex")
+                with open(debug_file, "w") as f:
+                    f.write(content)
+                pretty_print(f"Saved problematic LaTeX to {debug_file}", "INFO")
+
+        if returncode < 0:
+            # killed by a signal, e.g. for exceeding a resource limit, a
+            # PDF it left behind may be cut short
+            pretty_print(f"pdflatex was killed by signal {-returncode}", "ERROR")
+            return None, self.DOCUMENT_FAILED
+
+        # Read the generated PDF
+        pdf_file_path = os.path.join(directory, "document.pdf")
+        if os.path.exists(pdf_file_path):
+            with open(pdf_file_path, "rb") as f:
+                pdf_content = f.read()
+            return ContentFile(pdf_content), None
+        else:
+            pretty_print("PDF file was not generated", "ERROR")
+            return None, self.DOCUMENT_FAILED
+
+
+class SimplePdfBackend(RenderBackend):
+    """
+    Plain text PDF of the form's fields, written in process
+
+    Lists every placeholder of the template in document order as
+    "label: value" in the PDF base fonts, with checkboxes as [X] and [ ].
+    It needs no LaTeX install or font files and takes about a millisecond,
+    which makes it suited to previews; the official document still comes
+    from LatexBackend.
+    """
+
+    name = "simple"
+
+    PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US letter, in points
+    MARGIN = 54
+    FONT_SIZE = 10
+    LEADING = 14
+    # characters per line, about what fits in Helvetica at FONT_SIZE
+    WRAP_WIDTH = 95
+
+    # placeholders that are layout only
+    SKIPPED = ("$UNIVERSITY_LOGO$",)
+
+    def render(self, document, is_stale=None):
+        lines = [
+            ("F2", 14, document.form_template.name),
+            ("F1", 9, "Preview - the official form is generated on submission"),
+            ("F1", self.FONT_SIZE, ""),
+        ]
+        for placeholder in document.placeholders():
+            if placeholder in self.SKIPPED:
+                continue
+            label = document.labels.get(placeholder) or self._label(placeholder)
+            value = self._text(placeholder, document.values.get(placeholder, ""))
+            wrapped = textwrap.wrap(
+                f"{label}: {value}", self.WRAP_WIDTH, subsequent_indent="    "
+            ) or [f"{label}:"]
+            lines.extend(("F1", self.FONT_SIZE, line) for line in wrapped)
+        return ContentFile(self._pdf(lines))
+
+    @staticmethod
+    def _label(placeholder):
+        return placeholder.strip("$").replace("_", " ").capitalize()
+
+    @staticmethod
+    def _text(placeholder, value):
+        """Plain text for a LaTeX ready placeholder value"""
+        value = str(value)
+        if value == CHECKED:
+            return "[X]"
+        if value == UNCHECKED:
+            return "[ ]"
+        if placeholder.endswith("_SIGNATURE$"):
+            return "(signature on file)" if value else ""
+        return " ".join(value.split())
+
+    def _pdf(self, lines):
+        """
+        Write lines of (font, size, text) into a minimal PDF
+
+        Objects 1-4 are the catalog, page tree and the two Helvetica fonts,
+        then a page and its content stream per page of lines.
+        """
+        per_page = (self.PAGE_HEIGHT - 2 * self.MARGIN) // self.LEADING
+        pages = [lines[i : i + per_page] for i in range(0, len(lines), per_page)]
+        page_ids = [5 + 2 * i for i in range(len(pages))]
+
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(pages)),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+            b"/Encoding /WinAnsiEncoding >>",
+        ]
+        for page_id, page in zip(page_ids, pages):
+            stream = [
+                b"BT %d TL %d %d Td"
+                % (self.LEADING, self.MARGIN, self.PAGE_HEIGHT - self.MARGIN)
+            ]
+            for font, size, text in page:
+                stream.append(
+                    b"/%s %d Tf (%s) Tj T*" % (font.encode(), size, self._escape(text))
+                )
+            stream.append(b"ET")
+            content = b"\n".join(stream)
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                b"/Contents %d 0 R >>"
+                % (self.PAGE_WIDTH, self.PAGE_HEIGHT, page_id + 1)
+            )
+            objects.append(
+                b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+            )
+
+        pdf = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(pdf))
+            pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(pdf)
+        pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1,
+            xref,
+        )
+        return bytes(pdf)
+
+    @staticmethod
+    def _escape(text):
+        encoded = text.encode("cp1252", errors="replace")
+        return (
+            encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        )
+
+
+RENDER_BACKENDS = {
+    LatexBackend.name: LatexBackend,
+    SimplePdfBackend.name: SimplePdfBackend,
+}
+
+
+def get_render_backend(name):
+    """
+    Render backend by name
+
+    Args:
+        name: A key of RENDER_BACKENDS ("latex", "simple")
+
+    Returns:
+        RenderBackend instance
+
+    Raises:
+        ValueError: No backend has that name
+    """
+    try:
+        return RENDER_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown render backend: {name}")
@@ -0,0 +1,82 @@
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Signatures are placed with \includegraphics[width=2in] in every form
+# template so anything above 2in at print resolution is wasted bytes
+SIGNATURE_PRINT_WIDTH_IN = 2
+SIGNATURE_PRINT_DPI = 300
+
+# pixels lighter than this are treated as paper when cropping
+WHITESPACE_LEVEL = 245
+# grayscale level that separates ink from paper in the 1-bit output
+INK_THRESHOLD = 170
+# padding (in pixels) kept around the cropped signature
+CROP_PADDING = 8
+
+
+def normalize_signature(image_file):
+    """
+    Build the print-ready derivative of an uploaded signature
+
+    Flattens transparency onto white, crops the surrounding whitespace,
+    downsamples to the resolution the signature is printed at (2in wide)
+    and stores it as a 1-bit PNG. The result is usually a few KB and can
+    be embedded by pdflatex without any re-encoding.
+
+    Args:
+        image_file: File-like object with the uploaded JPEG, PNG or GIF
+
+    Returns:
+        ContentFile containing the normalized PNG
+    """
+
+    image_file.seek(0)
+    image = Image.open(image_file)
+    image.seek(0)  # first frame for animated GIFs
+    image = ImageOps.exif_transpose(image)
+
+    # flatten transparent backgrounds onto white paper
+    if image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        image = image.convert("RGBA")
+        background = Image.new("RGBA", image.size, "white")
+        background.alpha_composite(image)
+        image = background
+
+    gray = image.convert("L")
+
+    # crop to the bounding box of the ink
+    ink = gray.point(lambda level: 255 if level < WHITESPACE_LEVEL else 0)
+    bbox = ink.getbbox()
+    if bbox:
+        left, top, right, bottom = bbox
+        gray = gray.crop(
+            (
+                max(left - CROP_PADDING, 0),
+                max(top - CROP_PADDING, 0),
+                min(right + CROP_PADDING, gray.width),
+                min(bottom + CROP_PADDING, gray.height),
+            )
+        )
+
+    # downsample to print resolution, never upscale
+    target_width = SIGNATURE_PRINT_WIDTH_IN * SIGNATURE_PRINT_DPI
+    if gray.width > target_width:
+        target_height = max(round(gray.height * target_width / gray.width), 1)
+        gray = gray.resize((target_width, target_height), Image.LANCZOS)
+
+    bitmap = gray.point(lambda level: 255 if level > INK_THRESHOLD else 0).convert(
+        "1", dither=Image.Dither.NONE
+    )
+
+    buffer = BytesIO()
+    bitmap.save(
+        buffer,
+        format="PNG",
+        optimize=True,
+        dpi=(SIGNATURE_PRINT_DPI, SIGNATURE_PRINT_DPI),
+    )
+    return ContentFile(buffer.getvalue())
@@ -0,0 +1,154 @@
+import glob
+import hashlib
+import os
+import tempfile
+import time
+
+from django.conf import settings
+
+
+class SignatureFileCache:
+    """
+    Bounded on-disk cache of signature images
+
+    pdflatex needs signatures as local files. With remote storage backends
+    the image would otherwise be downloaded into a new temporary file on
+    every render, for every signer. Cached files are named after the user id
+    and a digest of the image content, so a file replaced in storage never
+    serves a stale image. Writes are atomic (write then rename) so several
+    workers can share the same directory, and the least recently used files
+    are evicted once the cache grows past its size cap.
+
+    Files used within the last min_age_seconds are never removed, a render
+    in another worker may still be reading them; the cache can outgrow its
+    cap until they age.
+    """
+
+    def __init__(self, directory=None, max_bytes=None, min_age_seconds=None):
+        self.directory = directory or getattr(
+            settings,
+            "SIGNATURE_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "picton-signatures"),
+        )
+        self.max_bytes = max_bytes or getattr(
+            settings, "SIGNATURE_CACHE_MAX_BYTES", 50 * 1024 * 1024
+        )
+        self.min_age_seconds = (
+            getattr(settings, "SIGNATURE_CACHE_MIN_AGE_SECONDS", 5 * 60)
+            if min_age_seconds is None
+            else min_age_seconds
+        )
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _filename(self, user, field_file, digest):
+        """Cache file name for a signature with the given content digest"""
+        ext = os.path.splitext(field_file.name)[1] or ".png"
+        return f"user{user.id}-{digest[:32]}{ext}"
+
+    @staticmethod
+    def _digest(user, field_file):
+        """
+        Content digest of the signature file
+
+        Known without a download for signature_print, whose digest is
+        stored on the user. Anything else is read and hashed.
+
+        Returns:
+            (digest, content), content is None unless it had to be read
+        """
+        if user.signature_print_digest and field_file.name == user.signature_print.name:
+            return user.signature_print_digest, None
+        with field_file.open("rb") as source:
+            content = source.read()
+        return hashlib.sha256(content).hexdigest(), content
+
+    def get_path(self, user, field_file):
+        """
+        Return a local path for the signature, downloading it on a miss
+
+        Args:
+            user: The User that owns the signature
+            field_file: The signature FieldFile to cache (original or print copy)
+
+        Returns:
+            String absolute path of the cached image
+        """
+
+        digest, content = self._digest(user, field_file)
+        path = os.path.join(self.directory, self._filename(user, field_file, digest))
+
+        if os.path.exists(path):
+            # mark as recently used for LRU eviction
+            try:
+                os.utime(path)
+                return path
+            except FileNotFoundError:
+                pass  # evicted by another process in the meantime
+
+        if content is None:
+            with field_file.open("rb") as source:
+                content = source.read()
+
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(content)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._remove_old_versions(user, keep=path)
+        self._evict(keep=path)
+        return path
+
+    def _remove_old_versions(self, user, keep):
+        """Drop cached files of the user's previous signatures"""
+        in_use_since = time.time() - self.min_age_seconds
+        for old_path in glob.glob(os.path.join(self.directory, f"user{user.id}-*")):
+            if old_path == keep or old_path.endswith(".part"):
+                continue
+            try:
+                if os.path.getmtime(old_path) > in_use_since:
+                    continue
+            except FileNotFoundError:
+                continue
+            self._remove(old_path)
+
+    def _evict(self, keep=None):
+        """Remove least recently used files until the cache fits its size cap"""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.endswith(".part"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        in_use_since = time.time() - self.min_age_seconds
+        for used_at, size, path in sorted(entries):
+            if used_at > in_use_since:
+                # this and everything after it was used too recently
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
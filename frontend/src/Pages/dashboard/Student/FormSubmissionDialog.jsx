@@ -191,6 +191,11 @@ const FormSubmissionDialog = ({ isOpen, onClose, template }) => {
 
       const response = await api.student.previewForm(requestData);
 
+      // superseded by a newer preview, which will update the view
+      if (response?.superseded) {
+        return;
+      }
+
       if (response && response.pdf_content) {
         setPreviewPdf(response.pdf_content);
 
@@ -71,6 +71,11 @@ export const student = {
         body: JSON.stringify(requestData)
       });
 
+      // a newer preview request took over, the caller ignores this one
+      if (response.status === 409) {
+        return response.json();
+      }
+
       if (!response.ok) {
         const error = await response.json();
         const errorMessage = error.error || `Failed with status: ${response.status}`;